@@ -6,6 +6,7 @@ from .models import (
     Answer,
     Assessment,
     Certification,
+    EvidenceBlob,
     Question,
     Questionnaire,
     QuestionnaireQuestion,
@@ -19,12 +20,14 @@ class AssessmentAdmin(admin.ModelAdmin):
         "get_questionnaire_name",
         "vendor_offering",
         "status",
+        "workflow_state",
         "information_value",
         "recommended_score",
         "risk_level",
         "created_at",
     )
-    list_filter = ("status", "risk_level", "information_value", "created_at")
+    list_filter = ("status", "workflow_state", "risk_level", "information_value", "created_at")
+    readonly_fields = ("workflow_state",)
     search_fields = ("vendor_offering__name", "questionnaire__name")
 
     def get_questionnaire_name(self, obj):
@@ -82,3 +85,10 @@ class CertificationAdmin(admin.ModelAdmin):
     )
     list_filter = ("type", "is_valid", "is_archived")
     search_fields = ("vendor__name", "cert_number")
+
+
+@admin.register(EvidenceBlob)
+class EvidenceBlobAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "size", "ref_count", "storage_name", "updated_at")
+    search_fields = ("sha256", "storage_name")
+    readonly_fields = ("sha256", "size", "storage_name", "ref_count", "created_at", "updated_at")
@@ -6,4 +6,5 @@ class AssessmentsConfig(AppConfig):
     name = "assessments"
 
     def ready(self):
-        pass  # 👈 Load signals
+        import assessments.evidence_signals  # noqa
+        import assessments.snapshot_signals  # noqa
@@ -84,6 +84,12 @@ class QuestionCategories(TextChoices):
     VULNERABILITY_MGMT = "vuln_mgmt", "Vulnerability Management"
 
 
+class UploadStatus(TextChoices):
+    PENDING = "pending", "Receiving chunks"
+    FINALIZED = "finalized", "Attached"
+    ABORTED = "aborted", "Aborted"
+
+
 # ------------------ File Upload Utility ------------------
 def evidence_upload_path(instance, filename):
     """Save evidence files under: /evidence/<offering_id>/<date>/<uuid>.<ext>."""
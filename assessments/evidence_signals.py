@@ -0,0 +1,54 @@
+# assessments/evidence_signals.py
+"""Release evidence blob references when their holders are deleted.
+
+Deleting an assessment cascades to every answer, one ``post_delete`` each.
+Releases are summed per blob and applied with one ``adjust_ref_counts``
+call when the transaction commits, instead of one UPDATE per row. Each
+savepoint gets its own batch, so a rolled-back savepoint drops its
+releases along with its deletes.
+"""
+
+from collections import defaultdict
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from assessments.models import Answer, Certification
+from services.evidence_store import adjust_ref_counts
+
+
+def _flush(connection, key, deltas):
+    connection.pending_blob_releases.pop(key, None)
+    adjust_ref_counts(deltas)
+
+
+def _release(blob_id):
+    if blob_id is None:
+        return
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        adjust_ref_counts({blob_id: -1})
+        return
+
+    key = tuple(connection.savepoint_ids)
+    pending = connection.__dict__.setdefault("pending_blob_releases", {})
+    batch = pending.get(key)
+    # A batch whose callback is gone belongs to a transaction that rolled back
+    if batch is None or not any(entry[1] is batch[1] for entry in connection.run_on_commit):
+        deltas = defaultdict(int)
+        callback = partial(_flush, connection, key, deltas)
+        batch = pending[key] = (deltas, callback)
+        transaction.on_commit(callback)
+    batch[0][blob_id] -= 1
+
+
+@receiver(post_delete, sender=Answer)
+def release_answer_evidence(sender, instance, **kwargs):
+    _release(instance.evidence_blob_id)
+
+
+@receiver(post_delete, sender=Certification)
+def release_certification_artifact(sender, instance, **kwargs):
+    _release(instance.artifact_blob_id)
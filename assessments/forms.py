@@ -6,7 +6,10 @@ from taggit.forms import TagWidget
 from assessments.constants import AnswerChoices, InfoValueLevels, RiskLevels
 from assessments.models import Assessment
 
-from .constants import AnswerChoices, InfoValueChoices, RiskLevels
+from services.workflow import workflow_state_names
+from vendors.models import Vendor
+
+from .constants import AnswerChoices, AssessmentStatuses, InfoValueChoices, RiskLevels
 from .models import Answer, Assessment, Question, Questionnaire
 
 
@@ -29,6 +32,22 @@ class QuestionnaireForm(forms.ModelForm):
         }
 
 
+class QuestionnaireImportForm(forms.Form):
+    file = forms.FileField(help_text="CSV, JSON or XLSX")
+    name = forms.CharField(max_length=255, required=False, help_text="Name for a new questionnaire")
+    questionnaire = forms.ModelChoiceField(
+        queryset=Questionnaire.objects.filter(is_archived=False).order_by("name"),
+        required=False,
+        help_text="Or add the questions to an existing questionnaire",
+    )
+
+    def clean(self):
+        cleaned = super().clean()
+        if not cleaned.get("name") and not cleaned.get("questionnaire"):
+            raise forms.ValidationError("Enter a name or choose a questionnaire.")
+        return cleaned
+
+
 class AssessmentForm(forms.ModelForm):
     info_value = forms.ChoiceField(
         choices=InfoValueLevels.choices,
@@ -78,3 +97,42 @@ class InlineAnswerForm(forms.ModelForm):
                 attrs={"class": "form-control", "step": 0.1}
             ),
         }
+
+
+class AssessmentFilterForm(forms.Form):
+    """GET filters for the assessment list; vendor choices are scoped to the organization."""
+
+    status = forms.ChoiceField(
+        choices=[("", "Any status")] + AssessmentStatuses.choices,
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    risk_level = forms.ChoiceField(
+        choices=[("", "Any risk")] + RiskLevels.choices,
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    vendor = forms.ModelChoiceField(
+        queryset=Vendor.objects.none(),
+        required=False,
+        empty_label="Any vendor",
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    questionnaire = forms.ModelChoiceField(
+        queryset=Questionnaire.objects.filter(is_archived=False).order_by("name"),
+        required=False,
+        empty_label="Any questionnaire",
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    workflow_state = forms.ChoiceField(
+        choices=[],
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+
+    def __init__(self, *args, organization=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["vendor"].queryset = Vendor.objects.filter(organization=organization).order_by("name")
+        self.fields["workflow_state"].choices = [("", "Any stage")] + [
+            (name, name) for name in workflow_state_names(include_initial=True)
+        ]
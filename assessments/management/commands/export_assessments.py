@@ -0,0 +1,53 @@
+# assessments/management/commands/export_assessments.py
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Organization
+from common.errors import BusinessRuleError
+from services.exports import EXPORT_COLUMNS, EXPORT_FORMATS, parse_export_options, stream_export
+
+
+class Command(BaseCommand):
+    help = "Stream every assessment answer of an organization to CSV, JSON Lines or XLSX."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", type=int, required=True, help="Organization id to export")
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--columns", help=f"Comma-separated subset of: {', '.join(EXPORT_COLUMNS)}")
+        parser.add_argument("--from", dest="date_from", help="Assessments created on or after (YYYY-MM-DD)")
+        parser.add_argument("--to", dest="date_to", help="Assessments created on or before (YYYY-MM-DD)")
+        parser.add_argument("--status", action="append", dest="statuses", help="Assessment status (repeatable)")
+        parser.add_argument("--gzip", action="store_true", help="Compress the output")
+        parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+
+    def handle(self, *args, **options):
+        organization = Organization.objects.filter(pk=options["org"]).first()
+        if organization is None:
+            raise CommandError(f"Organization {options['org']} does not exist.")
+
+        try:
+            parsed = parse_export_options(
+                columns=options.get("columns"),
+                date_from=options.get("date_from"),
+                date_to=options.get("date_to"),
+                statuses=options.get("statuses"),
+                fmt=options["format"],
+            )
+            fmt = parsed.pop("fmt")
+            chunks = stream_export(organization, parsed.pop("columns"), fmt=fmt, gzip=options["gzip"], **parsed)
+        except BusinessRuleError as e:
+            raise CommandError(str(e)) from e
+
+        output = open(options["output"], "wb") if options.get("output") else sys.stdout.buffer
+        written = 0
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+                written += len(chunk)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+        if options.get("output"):
+            self.stdout.write(self.style.SUCCESS(f"Wrote {written} bytes to {options['output']}."))
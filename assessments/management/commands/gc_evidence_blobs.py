@@ -0,0 +1,28 @@
+# assessments/management/commands/gc_evidence_blobs.py
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from services.evidence_store import adopt_legacy_evidence, collect_garbage, reconcile_ref_counts
+
+
+class Command(BaseCommand):
+    help = "Delete evidence blobs nobody references (optionally reconcile counts and adopt legacy files first)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grace-hours", type=float, default=24.0, help="Keep unreferenced blobs idle for less than this")
+        parser.add_argument("--dry-run", action="store_true", help="Report what would be deleted without deleting")
+        parser.add_argument("--reconcile", action="store_true", help="Recount references from the FK columns first")
+        parser.add_argument("--adopt-existing", action="store_true", help="Move evidence stored before the blob store into it")
+
+    def handle(self, *args, **options):
+        if options["adopt_existing"]:
+            converted = adopt_legacy_evidence()
+            self.stdout.write(f"Moved {converted} legacy evidence references into the blob store.")
+        if options["reconcile"]:
+            self.stdout.write(f"Reconciled reference counts on {reconcile_ref_counts()} blobs.")
+
+        removed, freed = collect_garbage(timedelta(hours=options["grace_hours"]), dry_run=options["dry_run"])
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {removed} blobs ({freed / 1024**2:.1f} MiB)."))
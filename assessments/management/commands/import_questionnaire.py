@@ -0,0 +1,47 @@
+# assessments/management/commands/import_questionnaire.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from assessments.models import Questionnaire
+from common.errors import BusinessRuleError
+from services.questionnaire_import import IMPORT_FORMATS, detect_format, import_questionnaire
+
+
+class Command(BaseCommand):
+    help = "Bulk-import questions from a CSV, JSON or XLSX framework file (SIG, CAIQ, NIST, ...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import")
+        parser.add_argument("--name", help="Create a new questionnaire with this name")
+        parser.add_argument("--questionnaire", type=int, help="Add to an existing questionnaire (id)")
+        parser.add_argument("--description", default="", help="Description for a new questionnaire")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Override detection from the file extension")
+
+    def handle(self, *args, **options):
+        questionnaire = None
+        if options.get("questionnaire"):
+            questionnaire = Questionnaire.objects.filter(pk=options["questionnaire"]).first()
+            if questionnaire is None:
+                raise CommandError(f"Questionnaire {options['questionnaire']} does not exist.")
+
+        started = time.perf_counter()
+        try:
+            fmt = options.get("format") or detect_format(options["path"])
+            with open(options["path"], "rb") as fh:
+                result = import_questionnaire(
+                    fh, fmt, questionnaire=questionnaire, name=options.get("name"), description=options["description"]
+                )
+        except (BusinessRuleError, OSError) as e:
+            raise CommandError(str(e)) from e
+
+        for error in result.errors:
+            self.stderr.write(str(error))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.created} questions into '{result.questionnaire.name}' "
+                f"({len(result.errors)} rows skipped) in {elapsed:.2f}s."
+            )
+        )
@@ -0,0 +1,18 @@
+# assessments/management/commands/rebuild_search_index.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.search import install_search_schema
+
+
+class Command(BaseCommand):
+    help = "Create or repair the full-text search columns, triggers and indexes, and index any missing rows."
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        if not install_search_schema():
+            raise CommandError("This database backend has no full-text search support.")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Search index ready in {elapsed:.2f}s."))
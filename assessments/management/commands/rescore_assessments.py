@@ -0,0 +1,27 @@
+# assessments/management/commands/rescore_assessments.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Organization
+from assessments.scoring import rescore_assessments
+
+
+class Command(BaseCommand):
+    help = "Recompute recommended score and risk level for every assessment (after scoring rules change)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", type=int, help="Only rescore this organization's assessments")
+
+    def handle(self, *args, **options):
+        organization = None
+        if options.get("org"):
+            organization = Organization.objects.filter(pk=options["org"]).first()
+            if organization is None:
+                raise CommandError(f"Organization {options['org']} does not exist.")
+
+        started = time.perf_counter()
+        count = rescore_assessments(organization)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Rescored {count} assessments in {elapsed:.2f}s."))
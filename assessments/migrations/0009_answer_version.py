@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0008_alter_certification_artifact'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='version',
+            field=models.PositiveIntegerField(default=0, help_text='Bumped on every save; autosave rejects stale versions'),
+        ),
+    ]
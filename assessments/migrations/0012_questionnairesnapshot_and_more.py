@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0011_evidenceblob_answer_evidence_blob_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionnaireSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField()),
+                ('content_hash', models.CharField(max_length=40)),
+                ('question_count', models.PositiveIntegerField(default=0)),
+                ('payload', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('questionnaire', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='assessments.questionnaire')),
+            ],
+            options={
+                'ordering': ['questionnaire', '-version'],
+                'unique_together': {('questionnaire', 'version')},
+            },
+        ),
+        migrations.AddField(
+            model_name='assessment',
+            name='questionnaire_snapshot',
+            field=models.ForeignKey(blank=True, help_text='Questionnaire version this assessment is answered against', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='assessments', to='assessments.questionnairesnapshot'),
+        ),
+    ]
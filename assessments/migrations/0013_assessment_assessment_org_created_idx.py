@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_authevent_emailverificationtoken_and_more'),
+        ('assessments', '0012_questionnairesnapshot_and_more'),
+        ('vendors', '0009_vendorcontact_vendordocument_vendordomain_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['organization', '-created_at', '-id'], name='assessment_org_created_idx'),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Full-text search columns, triggers and indexes (see services/search.py)
+#
+# The DDL is a frozen copy of services.search.install_search_schema as of
+# this migration, so later changes to the service cannot alter history.
+
+from django.db import migrations
+
+# table -> ((column, weight), ...)
+SOURCES = {
+    'assessments_question': (('text', 'A'), ('help_text', 'B')),
+    'assessments_answer': (('supporting_text', 'A'), ('comments', 'B')),
+    'vendors_vendor': (('name', 'A'), ('description', 'B')),
+    'vendors_vendoroffering': (('name', 'A'), ('description', 'B')),
+}
+
+
+def pg_vector_expr(columns, row):
+    return ' || '.join(
+        f"setweight(to_tsvector('pg_catalog.english', coalesce({row}.{column}, '')), '{weight}')"
+        for column, weight in columns
+    )
+
+
+def install_postgresql(cursor, table, columns):
+    names = ', '.join(c for c, _ in columns)
+    cursor.execute(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector')
+    cursor.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {pg_vector_expr(columns, 'NEW')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    cursor.execute(f'DROP TRIGGER IF EXISTS {table}_search_vector ON {table}')
+    cursor.execute(
+        f'CREATE TRIGGER {table}_search_vector BEFORE INSERT OR UPDATE OF {names} ON {table} '
+        f'FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()'
+    )
+    cursor.execute(f'UPDATE {table} SET search_vector = {pg_vector_expr(columns, table)} WHERE search_vector IS NULL')
+    cursor.execute(f'CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} USING GIN (search_vector)')
+
+
+def install_sqlite(cursor, table, columns):
+    fts = f'{table}_fts'
+    names = ', '.join(c for c, _ in columns)
+    new_values = ', '.join(f"coalesce(new.{c}, '')" for c, _ in columns)
+    old_values = ', '.join(f"coalesce({c}, '')" for c, _ in columns)
+    cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, tokenize='porter unicode61')")
+    cursor.execute(
+        f'CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN '
+        f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END'
+    )
+    cursor.execute(
+        f'CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF {names} ON {table} BEGIN '
+        f'DELETE FROM {fts} WHERE rowid = old.id; '
+        f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END'
+    )
+    cursor.execute(
+        f'CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN '
+        f'DELETE FROM {fts} WHERE rowid = old.id; END'
+    )
+    cursor.execute(f'DELETE FROM {fts}')
+    cursor.execute(f'INSERT INTO {fts}(rowid, {names}) SELECT id, {old_values} FROM {table}')
+
+
+def install(apps, schema_editor):
+    installers = {'postgresql': install_postgresql, 'sqlite': install_sqlite}
+    installer = installers.get(schema_editor.connection.vendor)
+    if installer is None:
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, columns in SOURCES.items():
+            installer(cursor, table, columns)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0013_assessment_assessment_org_created_idx'),
+        ('vendors', '0009_vendorcontact_vendordocument_vendordomain_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, migrations.RunPython.noop),
+    ]
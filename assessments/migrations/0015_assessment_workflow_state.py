@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:37
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def mirror_current_states(apps, schema_editor):
+    Assessment = apps.get_model("assessments", "Assessment")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    WorkflowObject = apps.get_model("workflow", "WorkflowObject")
+
+    content_type = ContentType.objects.filter(app_label="assessments", model="assessment").first()
+    if content_type is None:  # fresh database: nothing attached yet
+        return
+    state_name = WorkflowObject.objects.filter(content_type=content_type, object_id=OuterRef("pk")).values(
+        "current_state__name"
+    )[:1]
+    Assessment.objects.update(workflow_state=Coalesce(Subquery(state_name), Value("")))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_authevent_emailverificationtoken_and_more'),
+        ('assessments', '0014_search_index'),
+        ('vendors', '0009_vendorcontact_vendordocument_vendordomain_and_more'),
+        ('workflow', '0003_workflowobject_unique_target'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessment',
+            name='workflow_state',
+            field=models.CharField(blank=True, help_text='Current workflow state name, mirrored by services.workflow', max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['organization', 'workflow_state'], name='assessment_org_wf_state_idx'),
+        ),
+        migrations.RunPython(mirror_current_states, migrations.RunPython.noop),
+    ]
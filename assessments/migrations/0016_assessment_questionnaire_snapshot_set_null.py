@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assessments', '0015_assessment_workflow_state'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='assessment',
+            name='questionnaire_snapshot',
+            field=models.ForeignKey(blank=True, help_text='Questionnaire version this assessment is answered against', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assessments', to='assessments.questionnairesnapshot'),
+        ),
+    ]
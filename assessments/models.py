@@ -1,5 +1,7 @@
 # assessments/models.py
 
+from uuid import uuid4
+
 from django.db import models
 from taggit.managers import TaggableManager
 
@@ -16,10 +18,29 @@ from .constants import (
     QuestionCategories,
     ResponseTypes,
     RiskLevels,
+    UploadStatus,
     evidence_upload_path,
 )
 
 
+class EvidenceBlob(models.Model):
+    """A stored evidence file, keyed by its SHA-256 and shared by every reference.
+
+    ``ref_count`` counts the Answers and Certifications pointing at it;
+    blobs at zero past a grace period are removed by ``gc_evidence_blobs``.
+    """
+
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    size = models.BigIntegerField()
+    storage_name = models.CharField(max_length=500, unique=True)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.size} bytes, {self.ref_count} refs)"
+
+
 class Certification(TimeStampedModel):
 
     vendor = models.ForeignKey(
@@ -38,6 +59,13 @@ class Certification(TimeStampedModel):
         blank=True,
         help_text="Optional: Upload certification file",
     )
+    artifact_blob = models.ForeignKey(
+        EvidenceBlob,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name="certifications",
+    )
     external_url = models.URLField(blank=True)
     is_archived = models.BooleanField(default=False)  # ✅ Archive support
 
@@ -95,6 +123,31 @@ class Question(TimeStampedModel):
         return f"Q: {self.text[:50]}"
 
 
+class QuestionnaireSnapshot(models.Model):
+    """An immutable, compiled version of a questionnaire's ordered questions.
+
+    ``payload`` is zlib-compressed JSON built by ``assessments.snapshots``;
+    a new version is written only when the compiled content changes, and
+    assessments pin the version they were answered against.
+    """
+
+    questionnaire = models.ForeignKey(
+        Questionnaire, on_delete=models.CASCADE, related_name="snapshots"
+    )
+    version = models.PositiveIntegerField()
+    content_hash = models.CharField(max_length=40)
+    question_count = models.PositiveIntegerField(default=0)
+    payload = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("questionnaire", "version")
+        ordering = ["questionnaire", "-version"]
+
+    def __str__(self):
+        return f"{self.questionnaire_id} v{self.version} ({self.question_count} questions)"
+
+
 class Assessment(TimeStampedModel):
     """An instance of a questionnaire being used to assess a specific vendor
     by a specific organization. Tracks status and aggregate score.
@@ -106,6 +159,14 @@ class Assessment(TimeStampedModel):
         VendorOffering, on_delete=models.CASCADE, related_name="assessments"
     )
     questionnaire = models.ForeignKey(Questionnaire, on_delete=models.CASCADE)
+    questionnaire_snapshot = models.ForeignKey(
+        QuestionnaireSnapshot,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="assessments",
+        help_text="Questionnaire version this assessment is answered against",
+    )
 
     status = models.CharField(
         max_length=20,
@@ -139,12 +200,23 @@ class Assessment(TimeStampedModel):
     )
 
     is_archived = models.BooleanField(default=False)
+    workflow_state = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Current workflow state name, mirrored by services.workflow",
+    )
 
     def __str__(self):
         return f"{self.vendor_offering.name} Assessment ({self.status})"
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pagination of the org's assessment list
+            models.Index(fields=["organization", "-created_at", "-id"], name="assessment_org_created_idx"),
+            # Filtering / counting by workflow state without the generic relation
+            models.Index(fields=["organization", "workflow_state"], name="assessment_org_wf_state_idx"),
+        ]
 
 
 class Answer(TimeStampedModel):
@@ -163,9 +235,19 @@ class Answer(TimeStampedModel):
         blank=True, help_text="Optional justification or context"
     )
     evidence = models.FileField(upload_to=evidence_upload_path, null=True, blank=True)
+    evidence_blob = models.ForeignKey(
+        EvidenceBlob,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name="answers",
+    )
     risk_impact = models.FloatField(
         default=0.0, help_text="Custom risk value (0.0–1.0 scale)"
     )
+    version = models.PositiveIntegerField(
+        default=0, help_text="Bumped on every save; autosave rejects stale versions"
+    )
 
     class Meta:
         unique_together = ("assessment", "question")
@@ -185,3 +267,28 @@ class QuestionnaireQuestion(models.Model):
 
         def __str__(self):
             return f"{self.questionnaire.name} - {self.question.text[:50]}"
+
+
+class EvidenceUpload(TimeStampedModel):
+    """A resumable, chunked upload streamed straight to its final storage path.
+
+    Targets either an answer (``assessment`` + ``question``) or a
+    ``certification``; ``services.uploads`` attaches the file on finalize.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE)
+
+    assessment = models.ForeignKey(Assessment, null=True, blank=True, on_delete=models.CASCADE)
+    question = models.ForeignKey(Question, null=True, blank=True, on_delete=models.CASCADE)
+    certification = models.ForeignKey(Certification, null=True, blank=True, on_delete=models.CASCADE)
+
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField(help_text="Declared total size in bytes")
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Declared SHA-256 (hex), checked on finalize")
+    offset = models.BigIntegerField(default=0, help_text="Bytes received so far")
+    storage_name = models.CharField(max_length=500)
+    status = models.CharField(max_length=20, choices=UploadStatus.choices, default=UploadStatus.PENDING)
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
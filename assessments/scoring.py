@@ -0,0 +1,167 @@
+# assessments/scoring.py
+"""Weighted answer scoring for assessments.
+
+Each applicable question contributes ``weight * (1 + risk_impact)`` to the
+denominator and that times the response value to the numerator; required
+questions left unanswered count as "no", ``n/a`` answers drop out. The
+resulting compliance percentage is turned into ``recommended_score`` by
+scaling the shortfall with the assessment's information value, so the same
+gaps weigh more on critical data. Weights and required flags come from the
+pinned questionnaire snapshot.
+
+``rescore_assessments`` applies the same rules (``score_answers``) to a
+whole organization in one streamed pass over its answers, for when the
+rules themselves change.
+"""
+
+from dataclasses import dataclass, field
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import transaction
+from django.utils import timezone
+
+from assessments.constants import AnswerChoices, InfoValueChoices, RiskLevels
+from assessments.models import Answer, Assessment
+from assessments.snapshots import current_snapshot, load_snapshot
+
+UPDATE_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class ScoringRules:
+    # ``None`` = not applicable (excluded from the denominator)
+    answer_values: dict = field(
+        default_factory=lambda: {
+            AnswerChoices.YES: 1.0,
+            AnswerChoices.PARTIAL: 0.5,
+            AnswerChoices.NO: 0.0,
+            AnswerChoices.NA: None,
+        }
+    )
+    info_value_multipliers: dict = field(
+        default_factory=lambda: {
+            InfoValueChoices.LOW: 0.5,
+            InfoValueChoices.MODERATE: 1.0,
+            InfoValueChoices.HIGH: 1.5,
+            InfoValueChoices.CRITICAL: 2.0,
+        }
+    )
+    # (minimum score, level), checked top-down
+    risk_bands: tuple = ((80.0, RiskLevels.LOW), (60.0, RiskLevels.MEDIUM), (40.0, RiskLevels.HIGH), (0.0, RiskLevels.SEVERE))
+
+
+DEFAULT_RULES = ScoringRules()
+
+
+# ===========================
+# ✅ Rules
+# ===========================
+def finalize_score(earned, possible, information_value, rules=DEFAULT_RULES):
+    """``(recommended_score, recommended_risk_level)`` from weighted sums."""
+    if possible <= 0:
+        return 0.0, RiskLevels.UNDETERMINED
+    shortfall = 100.0 * (1 - earned / possible)
+    multiplier = rules.info_value_multipliers.get(information_value, 1.0)
+    score = round(max(0.0, 100.0 - shortfall * multiplier), 2)
+    level = next(level for minimum, level in rules.risk_bands if score >= minimum)
+    return score, level
+
+
+def score_answers(snapshot, answers, information_value, rules=DEFAULT_RULES):
+    """Scores ``{question_id: (response, risk_impact)}`` against a compiled questionnaire."""
+    earned = possible = 0.0
+    for question in snapshot.questions:
+        response, impact = answers.get(question.id, (None, 0.0))
+        if response is None:
+            if not question.is_required:
+                continue
+            response = AnswerChoices.NO
+        value = rules.answer_values.get(response)
+        if value is None:
+            continue
+        weight = question.weight * (1.0 + (impact or 0.0))
+        earned += weight * value
+        possible += weight
+    return finalize_score(earned, possible, information_value, rules)
+
+
+# ===========================
+# ✅ One assessment (on submit)
+# ===========================
+def score_assessment(assessment, snapshot, rules=DEFAULT_RULES):
+    """Scores and stores one assessment; returns ``(score, risk_level)``."""
+    answers = {
+        question_id: (response, impact)
+        for question_id, response, impact in Answer.objects.filter(assessment=assessment).values_list(
+            "question_id", "response", "risk_impact"
+        )
+    }
+    score, level = score_answers(snapshot, answers, assessment.information_value, rules)
+    Assessment.objects.filter(pk=assessment.pk).update(
+        recommended_score=score, recommended_risk_level=level, updated_at=timezone.now()
+    )
+    assessment.recommended_score, assessment.recommended_risk_level = score, level
+    return score, level
+
+
+# ===========================
+# ✅ Whole organization (rules changed)
+# ===========================
+def _pin_unpinned(assessments):
+    """Pins unpinned assessments to their questionnaire's current version (one UPDATE per questionnaire)."""
+    unpinned = {}
+    for assessment_id, questionnaire_id, snapshot_id, _ in assessments:
+        if snapshot_id is None:
+            unpinned.setdefault(questionnaire_id, []).append(assessment_id)
+    pinned = {}
+    for questionnaire_id, ids in unpinned.items():
+        snapshot_id = current_snapshot(questionnaire_id).snapshot_id
+        Assessment.objects.filter(pk__in=ids, questionnaire_snapshot__isnull=True).update(questionnaire_snapshot_id=snapshot_id)
+        pinned.update(dict.fromkeys(ids, snapshot_id))
+    return pinned
+
+
+def rescore_assessments(organization=None, rules=DEFAULT_RULES):
+    """Rescores every assessment of ``organization`` (all when ``None``).
+
+    Answers are streamed in one query ordered by assessment, grouped, and
+    each group is reduced by ``score_answers``, the same code that scores a
+    submit, so the two cannot drift. Results are written with
+    ``bulk_update``. Returns the number of assessments scored.
+    """
+    assessments_qs = Assessment.objects.all()
+    if organization is not None:
+        assessments_qs = assessments_qs.filter(organization=organization)
+
+    with transaction.atomic():
+        assessments = list(
+            assessments_qs.order_by("pk").values_list("pk", "questionnaire_id", "questionnaire_snapshot_id", "information_value")
+        )
+        pinned = _pin_unpinned(assessments)
+        snapshot_of = {pk: snapshot_id or pinned[pk] for pk, _, snapshot_id, _ in assessments}
+        snapshots = {snapshot_id: load_snapshot(snapshot_id) for snapshot_id in set(snapshot_of.values())}
+
+        rows = (
+            Answer.objects.filter(assessment__in=assessments_qs)
+            .order_by("assessment_id")
+            .values_list("assessment_id", "question_id", "response", "risk_impact")
+        )
+        # Both sides are in assessment order, so groups are consumed in step
+        groups = groupby(rows.iterator(chunk_size=5000), key=itemgetter(0))
+        group = next(groups, None)
+
+        now = timezone.now()
+        updates = []
+        for pk, _, _, information_value in assessments:
+            answers = {}
+            if group is not None and group[0] == pk:
+                answers = {question_id: (response, impact) for _, question_id, response, impact in group[1]}
+                group = next(groups, None)
+            score, level = score_answers(snapshots[snapshot_of[pk]], answers, information_value, rules)
+            updates.append(Assessment(pk=pk, recommended_score=score, recommended_risk_level=level, updated_at=now))
+
+        Assessment.objects.bulk_update(
+            updates, ["recommended_score", "recommended_risk_level", "updated_at"], batch_size=UPDATE_BATCH_SIZE
+        )
+    return len(updates)
@@ -0,0 +1,58 @@
+# assessments/snapshot_signals.py
+"""Recompile questionnaire snapshots when their questions change.
+
+``compile_questionnaire`` only writes a new version when the compiled
+content differs, so saves that touch nothing snapshotted cost a read.
+Bulk writes (``bulk_create``/``update``) bypass these handlers; callers
+compile explicitly afterwards.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from assessments.models import Question, Questionnaire, QuestionnaireQuestion
+from assessments.snapshots import compile_questionnaire
+from common.signals import deleted_directly
+
+
+def _recompile(questionnaire_ids):
+    for questionnaire_id in sorted(set(filter(None, questionnaire_ids))):
+        compile_questionnaire(questionnaire_id)
+
+
+def _questionnaires_using(question):
+    linked = QuestionnaireQuestion.objects.filter(question_id=question.pk).values_list("questionnaire_id", flat=True)
+    return [question.questionnaire_id, *linked]
+
+
+@receiver(pre_save, sender=Question)
+def remember_previous_questionnaire(sender, instance, **kwargs):
+    # A question moved to another questionnaire must leave the old one too
+    if instance.pk:
+        instance._previous_questionnaire_id = (
+            Question.objects.filter(pk=instance.pk).values_list("questionnaire_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Question)
+def recompile_on_question_save(sender, instance, **kwargs):
+    _recompile([*_questionnaires_using(instance), getattr(instance, "_previous_questionnaire_id", None)])
+
+
+@receiver(post_delete, sender=Question)
+def recompile_on_question_delete(sender, instance, origin=None, **kwargs):
+    if deleted_directly(origin, Question) and Questionnaire.objects.filter(pk=instance.questionnaire_id).exists():
+        _recompile([instance.questionnaire_id])
+
+
+@receiver(post_save, sender=QuestionnaireQuestion)
+def recompile_on_link_save(sender, instance, **kwargs):
+    _recompile([instance.questionnaire_id])
+
+
+@receiver(post_delete, sender=QuestionnaireQuestion)
+def recompile_on_link_delete(sender, instance, origin=None, **kwargs):
+    # Also when the linked question itself is deleted; only a deleted questionnaire has nothing left to compile
+    if deleted_directly(origin, QuestionnaireQuestion) or deleted_directly(origin, Question):
+        if Questionnaire.objects.filter(pk=instance.questionnaire_id).exists():
+            _recompile([instance.questionnaire_id])
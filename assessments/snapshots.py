@@ -0,0 +1,190 @@
+# assessments/snapshots.py
+"""Compiled, versioned questionnaire snapshots.
+
+A questionnaire compiles into an ordered tuple of ``SnapshotQuestion``s:
+questions linked through ``QuestionnaireQuestion`` by ``order`` first, then
+the ones it owns directly, by id; archived questions are left out. Each
+distinct compilation is stored once as a ``QuestionnaireSnapshot`` version.
+
+Versions never change, so they are cached without invalidation, first in
+process (``lru_cache``), then in the shared Django cache. Only the pointer to
+a questionnaire's current version moves; question edits recompile eagerly
+(``assessments.snapshot_signals``) and re-point it. Assessments pin the
+version they are answered against, so later edits do not rewrite them.
+"""
+
+import hashlib
+import json
+import zlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from assessments.models import Assessment, Question, Questionnaire, QuestionnaireQuestion, QuestionnaireSnapshot
+
+# Column order of a compiled question inside the stored payload
+SNAPSHOT_FIELDS = ("id", "text", "help_text", "category", "response_type", "weight", "is_required", "tags")
+PROCESS_CACHE_SIZE = 256
+
+
+def _pointer_timeout():
+    return getattr(settings, "QUESTIONNAIRE_SNAPSHOT_POINTER_TIMEOUT", 300)
+
+
+def _snapshot_key(snapshot_id):
+    return f"questionnaire-snapshot:{snapshot_id}"
+
+
+def _pointer_key(questionnaire_id):
+    return f"questionnaire-snapshot-current:{questionnaire_id}"
+
+
+@dataclass(frozen=True)
+class SnapshotQuestion:
+    id: int
+    text: str
+    help_text: str
+    category: str
+    response_type: str
+    weight: int
+    is_required: bool
+    tags: tuple
+
+
+@dataclass(frozen=True)
+class CompiledQuestionnaire:
+    snapshot_id: int
+    questionnaire_id: int
+    version: int
+    questions: tuple
+    by_id: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "by_id", {question.id: question for question in self.questions})
+
+    @property
+    def question_ids(self):
+        return [question.id for question in self.questions]
+
+
+# ===========================
+# ✅ Encoding
+# ===========================
+def _encode(rows):
+    """Compact JSON (one list per question) and its content hash."""
+    raw = json.dumps(rows, separators=(",", ":"), ensure_ascii=False).encode()
+    return zlib.compress(raw), hashlib.sha1(raw).hexdigest()
+
+
+def _decode(snapshot_id, questionnaire_id, version, payload):
+    rows = json.loads(zlib.decompress(bytes(payload)))
+    questions = tuple(SnapshotQuestion(*row[:-1], tags=tuple(row[-1])) for row in rows)
+    return CompiledQuestionnaire(snapshot_id, questionnaire_id, version, questions)
+
+
+def _ordered_rows(questionnaire_id):
+    order = dict(
+        QuestionnaireQuestion.objects.filter(questionnaire_id=questionnaire_id).values_list("question_id", "order")
+    )
+    questions = Question.objects.filter(
+        Q(questionnaire_id=questionnaire_id) | Q(pk__in=list(order)), is_archived=False
+    ).values_list(*SNAPSHOT_FIELDS)
+
+    def position(row):
+        question_id = row[0]
+        return (0, order[question_id], question_id) if question_id in order else (1, 0, question_id)
+
+    return [list(row[:-1]) + [list(row[-1] or [])] for row in sorted(questions, key=position)]
+
+
+def _cache_snapshot(snapshot_id, questionnaire_id, version, payload):
+    cache.set(_snapshot_key(snapshot_id), (questionnaire_id, version, bytes(payload)), None)
+    cache.set(_pointer_key(questionnaire_id), snapshot_id, _pointer_timeout())
+
+
+# ===========================
+# ✅ Compile / load
+# ===========================
+def compile_questionnaire(questionnaire_id):
+    """Compiles the questionnaire and stores a new version if its content changed."""
+    rows = _ordered_rows(questionnaire_id)
+    payload, content_hash = _encode(rows)
+
+    with transaction.atomic():
+        # Serialise version allocation per questionnaire
+        Questionnaire.objects.select_for_update().filter(pk=questionnaire_id).exists()
+        latest = (
+            QuestionnaireSnapshot.objects.filter(questionnaire_id=questionnaire_id)
+            .order_by("-version")
+            .values_list("pk", "version", "content_hash")
+            .first()
+        )
+        if latest is not None and latest[2] == content_hash:
+            snapshot_id, version = latest[0], latest[1]
+        else:
+            version = latest[1] + 1 if latest else 1
+            try:
+                with transaction.atomic():
+                    snapshot_id = QuestionnaireSnapshot.objects.create(
+                        questionnaire_id=questionnaire_id,
+                        version=version,
+                        content_hash=content_hash,
+                        question_count=len(rows),
+                        payload=payload,
+                    ).pk
+            except IntegrityError:
+                # A concurrent compile (without a lockable row, e.g. SQLite) won the version
+                return current_snapshot(questionnaire_id, refresh=True)
+
+    _cache_snapshot(snapshot_id, questionnaire_id, version, payload)
+    return load_snapshot(snapshot_id)
+
+
+@lru_cache(maxsize=PROCESS_CACHE_SIZE)
+def load_snapshot(snapshot_id):
+    """A stored version by id; immutable, so cached per process and shared."""
+    cached = cache.get(_snapshot_key(snapshot_id))
+    if cached is None:
+        row = QuestionnaireSnapshot.objects.values_list("questionnaire_id", "version", "payload").get(pk=snapshot_id)
+        cached = (row[0], row[1], bytes(row[2]))
+        cache.set(_snapshot_key(snapshot_id), cached, None)
+    return _decode(snapshot_id, *cached)
+
+
+def current_snapshot(questionnaire_id, refresh=False):
+    """The questionnaire's latest version, compiling the first one if needed."""
+    snapshot_id = None if refresh else cache.get(_pointer_key(questionnaire_id))
+    if snapshot_id is None:
+        snapshot_id = (
+            QuestionnaireSnapshot.objects.filter(questionnaire_id=questionnaire_id)
+            .order_by("-version")
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if snapshot_id is None:
+            return compile_questionnaire(questionnaire_id)
+        cache.set(_pointer_key(questionnaire_id), snapshot_id, _pointer_timeout())
+    return load_snapshot(snapshot_id)
+
+
+def snapshot_for_assessment(assessment):
+    """The version ``assessment`` is pinned to; unpinned assessments are pinned to the current one."""
+    if assessment.questionnaire_snapshot_id is None:
+        snapshot = current_snapshot(assessment.questionnaire_id)
+        pinned = Assessment.objects.filter(pk=assessment.pk, questionnaire_snapshot__isnull=True).update(
+            questionnaire_snapshot_id=snapshot.snapshot_id
+        )
+        if pinned:
+            assessment.questionnaire_snapshot_id = snapshot.snapshot_id
+            return snapshot
+        assessment.refresh_from_db(fields=["questionnaire_snapshot"])  # pinned concurrently
+    return load_snapshot(assessment.questionnaire_snapshot_id)
+
+
+def clear_snapshot_caches():
+    """Drops the per-process cache (tests, or after restoring a database)."""
+    load_snapshot.cache_clear()
@@ -1,2 +1,819 @@
+# assessments/tests.py
 
-# Create your tests here.
+import gzip
+import hashlib
+import io
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser, Membership, Organization
+from assessments.models import (
+    Answer,
+    Assessment,
+    Certification,
+    EvidenceBlob,
+    EvidenceUpload,
+    Question,
+    Questionnaire,
+    QuestionnaireQuestion,
+    QuestionnaireSnapshot,
+)
+from assessments.scoring import rescore_assessments, score_assessment
+from assessments.snapshots import clear_snapshot_caches, compile_questionnaire, snapshot_for_assessment
+from common.errors import StaleAnswerVersion, UploadOffsetMismatch
+from common.pagination import keyset_page
+from services.assessments import (
+    assessment_list_queryset,
+    autosave_answer,
+    create_assessment_from_request,
+    get_assessment_detail,
+    handle_answer_submission,
+)
+from services.evidence_store import adjust_ref_counts, collect_garbage, store_file
+from services.uploads import write_chunk
+from services.questionnaire_import import import_questionnaire
+from services.search import install_search_schema, search
+from services.workflow import attach_missing_workflows
+from vendors.models import Vendor, VendorOffering
+from workflow.models import State, Workflow, WorkflowLog, WorkflowObject
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+class AssessmentTestCase(TestCase):
+    def setUp(self):
+        clear_snapshot_caches()
+        cache.clear()  # test rollbacks reuse snapshot ids
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class AnswerSubmissionTests(AssessmentTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="AnswerOrg")
+        cls.user = CustomUser.objects.create_user(email="analyst@answer.test")
+        vendor = Vendor.objects.create(organization=cls.org, name="Answered")
+        cls.offering = VendorOffering.objects.create(vendor=vendor, name="Portal")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def make_assessment(self, question_count):
+        questionnaire = Questionnaire.objects.create(name=f"{question_count} questions")
+        questions = Question.objects.bulk_create(
+            [Question(questionnaire=questionnaire, response_type="choice", text=f"Q{i}") for i in range(question_count)]
+        )
+        assessment = Assessment.objects.create(
+            organization=self.org,
+            vendor_offering=self.offering,
+            questionnaire=questionnaire,
+            questionnaire_snapshot_id=compile_questionnaire(questionnaire.id).snapshot_id,
+        )
+        return assessment, questions
+
+    def post_data(self, questions, response="yes"):
+        return {f"q_{q.id}_response": response for q in questions}
+
+    def test_query_count_does_not_grow_with_questions(self):
+        for question_count in (3, 60):
+            assessment, questions = self.make_assessment(question_count)
+            with self.assertNumQueries(8):
+                ok, message = handle_answer_submission(self.org, assessment.id, self.post_data(questions))
+            self.assertTrue(ok, message)
+            self.assertEqual(assessment.answers.count(), question_count)
+
+    def test_resubmission_updates_answers_and_keeps_evidence(self):
+        assessment, questions = self.make_assessment(2)
+        first, second = questions
+        upload = SimpleUploadedFile("soc2.pdf", b"%PDF-1.4 evidence")
+        handle_answer_submission(self.org, assessment.id, self.post_data(questions), files={f"q_{first.id}_evidence": upload})
+
+        ok, _ = handle_answer_submission(self.org, assessment.id, self.post_data(questions, response="no"))
+
+        self.assertTrue(ok)
+        answers = {a.question_id: a for a in Answer.objects.filter(assessment=assessment)}
+        self.assertEqual({a.response for a in answers.values()}, {"no"})
+        self.assertTrue(answers[first.id].evidence.name.endswith(".pdf"))
+        self.assertFalse(answers[second.id].evidence)
+
+    def test_member_submits_through_the_view(self):
+        Membership.objects.create(user=self.user, organization=self.org, role="member")
+        foreign = Organization.objects.create(name="NotMine")
+        assessment, questions = self.make_assessment(2)
+        self.client.force_login(self.user)
+
+        response = self.client.post(reverse("assessments:answer", args=[assessment.pk]), self.post_data(questions))
+
+        self.assertRedirects(response, reverse("assessments:detail", args=[assessment.pk]), fetch_redirect_response=False)
+        self.assertEqual(assessment.answers.count(), 2)
+        ok, message = handle_answer_submission(foreign, assessment.id, self.post_data(questions, response="no"))
+        self.assertFalse(ok, message)
+
+
+class AnswerAutosaveTests(AssessmentTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="AutosaveOrg")
+        cls.user = CustomUser.objects.create_user(email="editor@autosave.test", password="Password123!")
+        Membership.objects.create(user=cls.user, organization=cls.org, role="member")
+        vendor = Vendor.objects.create(organization=cls.org, name="Autosaved")
+        offering = VendorOffering.objects.create(vendor=vendor, name="API")
+        questionnaire = Questionnaire.objects.create(name="Autosave")
+        cls.question = Question.objects.create(questionnaire=questionnaire, response_type="choice", text="MFA enforced?")
+        cls.assessment = Assessment.objects.create(organization=cls.org, vendor_offering=offering, questionnaire=questionnaire)
+
+    def save(self, version, response="yes"):
+        return autosave_answer(self.org, self.assessment.id, self.question.id, {"response": response}, version)
+
+    def test_each_save_bumps_the_version(self):
+        self.assertEqual(self.save(0).version, 1)
+        self.assertEqual(self.save(1, "no").version, 2)
+        self.assertEqual(Answer.objects.get().response, "no")
+
+    def test_stale_version_is_rejected(self):
+        self.save(0)
+        self.save(1, "partial")  # another editor
+
+        with self.assertRaises(StaleAnswerVersion) as ctx:
+            self.save(1, "no")
+
+        self.assertEqual(ctx.exception.current.response, "partial")
+        self.assertEqual(Answer.objects.get().version, 2)
+
+    def test_endpoint_returns_conflict_for_stale_edit(self):
+        self.save(0)
+        self.client.force_login(self.user)
+        url = reverse("assessments:autosave_answer", args=[self.assessment.id, self.question.id])
+        prefix = f"q_{self.question.id}_"
+
+        saved = self.client.post(url, {prefix + "response": "no", prefix + "version": "1"}, HTTP_HX_REQUEST="true")
+        stale = self.client.post(url, {prefix + "response": "yes", prefix + "version": "1"}, HTTP_HX_REQUEST="true")
+
+        self.assertEqual(saved.status_code, 200)
+        self.assertContains(saved, 'value="2"')
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual(Answer.objects.get().response, "no")
+
+    def test_answer_page_wires_autosave_for_a_member(self):
+        # ``base.html`` lives outside this tree; stand in an empty layout
+        engine = settings.TEMPLATES[0]
+        loaders = [
+            ("django.template.loaders.locmem.Loader", {"base.html": "{% block content %}{% endblock %}"}),
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ]
+        templates = [{**engine, "APP_DIRS": False, "OPTIONS": {**engine["OPTIONS"], "loaders": loaders}}]
+        self.save(0)
+        self.client.force_login(self.user)
+
+        with self.settings(TEMPLATES=templates):
+            response = self.client.get(reverse("assessments:answer", args=[self.assessment.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, reverse("assessments:autosave_answer", args=[self.assessment.id, self.question.id]))
+        self.assertContains(response, f'name="q_{self.question.id}_version" value="1"')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ChunkedEvidenceUploadTests(AssessmentTestCase):
+    payload = b"%PDF-1.7 " + bytes(range(256)) * 40
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="UploadOrg")
+        cls.user = CustomUser.objects.create_user(email="uploader@upload.test", password="Password123!")
+        Membership.objects.create(user=cls.user, organization=cls.org, role="member")
+        cls.vendor = Vendor.objects.create(organization=cls.org, name="Uploader")
+        offering = VendorOffering.objects.create(vendor=cls.vendor, name="Storage")
+        questionnaire = Questionnaire.objects.create(name="Uploads")
+        cls.question = Question.objects.create(questionnaire=questionnaire, response_type="choice", text="Pen test?")
+        cls.assessment = Assessment.objects.create(organization=cls.org, vendor_offering=offering, questionnaire=questionnaire)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def start(self, **target):
+        body = {"filename": "pentest.pdf", "size": len(self.payload), "sha256": hashlib.sha256(self.payload).hexdigest(), **target}
+        response = self.client.post(reverse("assessments:upload_start"), json.dumps(body), content_type="application/json")
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["upload_id"]
+
+    def send(self, upload_id, offset, chunk):
+        return self.client.patch(
+            reverse("assessments:upload", args=[upload_id]),
+            chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def test_resumed_upload_is_attached_to_answer_in_place(self):
+        Answer.objects.create(assessment=self.assessment, question=self.question, response="yes", version=1)
+        upload_id = self.start(assessment=self.assessment.id, question=self.question.id)
+        half = len(self.payload) // 2
+
+        self.assertEqual(self.send(upload_id, 0, self.payload[:half]).json()["offset"], half)
+        # A client that lost the response retries from 0 and is told where to resume
+        retry = self.send(upload_id, 0, self.payload[:half])
+        self.assertEqual((retry.status_code, retry.json()["offset"]), (409, half))
+        self.send(upload_id, half, self.payload[half:])
+
+        response = self.client.post(reverse("assessments:upload_finalize", args=[upload_id]))
+
+        self.assertEqual(response.status_code, 200, response.content)
+        answer = Answer.objects.get(assessment=self.assessment, question=self.question)
+        self.assertEqual(answer.evidence.name, EvidenceUpload.objects.get().storage_name)
+        self.assertEqual(answer.version, 2)
+        with answer.evidence.open("rb") as fh:
+            self.assertEqual(fh.read(), self.payload)
+
+    def test_stale_writer_cannot_overwrite_acknowledged_bytes(self):
+        upload_id = self.start(certification=Certification.objects.create(vendor=self.vendor, type="SOC2").id)
+        half = len(self.payload) // 2
+        stale = EvidenceUpload.objects.get(pk=upload_id)  # read before the first chunk landed
+        self.send(upload_id, 0, self.payload[:half])
+
+        with self.assertRaises(UploadOffsetMismatch) as ctx:
+            write_chunk(stale, 0, io.BytesIO(b"X" * half), half)
+
+        self.assertEqual(ctx.exception.offset, half)
+        with default_storage.open(stale.storage_name, "rb") as fh:
+            self.assertEqual(fh.read(), self.payload[:half])
+
+    def test_upload_targets_follow_the_pinned_questionnaire_version(self):
+        linked = Question.objects.create(questionnaire=Questionnaire.objects.create(name="Library"), response_type="choice", text="DPA?")
+        QuestionnaireQuestion.objects.create(questionnaire=self.assessment.questionnaire, question=linked, order=1)
+        self.start(assessment=self.assessment.id, question=linked.id)  # pins the assessment
+
+        added_later = Question.objects.create(questionnaire=self.assessment.questionnaire, response_type="choice", text="SBOM?")
+        body = {"filename": "sbom.pdf", "size": 10, "assessment": self.assessment.id, "question": added_later.id}
+        response = self.client.post(reverse("assessments:upload_start"), json.dumps(body), content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_hash_mismatch_blocks_finalize(self):
+        certification = Certification.objects.create(vendor=self.vendor, type="SOC2")
+        upload_id = self.start(certification=certification.id)
+        self.send(upload_id, 0, self.payload[:-1] + b"X")
+
+        response = self.client.post(reverse("assessments:upload_finalize", args=[upload_id]))
+
+        self.assertEqual(response.status_code, 400)
+        certification.refresh_from_db()
+        self.assertFalse(certification.artifact)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class EvidenceStoreTests(AssessmentTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="BlobOrg")
+        cls.user = CustomUser.objects.create_user(email="auditor@blob.test")
+        vendor = Vendor.objects.create(organization=cls.org, name="Deduped")
+        offering = VendorOffering.objects.create(vendor=vendor, name="Cloud")
+        questionnaire = Questionnaire.objects.create(name="Blobs")
+        cls.questions = Question.objects.bulk_create(
+            [Question(questionnaire=questionnaire, response_type="choice", text=f"Q{i}") for i in range(2)]
+        )
+        cls.assessment = Assessment.objects.create(organization=cls.org, vendor_offering=offering, questionnaire=questionnaire)
+
+    def submit(self, content, *questions):
+        post = {f"q_{q.id}_response": "yes" for q in self.questions}
+        files = {f"q_{q.id}_evidence": SimpleUploadedFile("soc2.pdf", content) for q in questions}
+        ok, message = handle_answer_submission(self.org, self.assessment.id, post, files=files)
+        self.assertTrue(ok, message)
+
+    def test_identical_evidence_is_stored_once(self):
+        self.submit(b"%PDF-1.4 same report", *self.questions)
+
+        blob = EvidenceBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual({a.evidence.name for a in Answer.objects.all()}, {blob.storage_name})
+
+    def test_replaced_evidence_is_collected_after_grace_period(self):
+        first, _ = self.questions
+        self.submit(b"%PDF-1.4 old report", first)
+        old = EvidenceBlob.objects.get()
+        self.submit(b"%PDF-1.4 new report", first)
+
+        old.refresh_from_db()
+        self.assertEqual(old.ref_count, 0)
+        self.assertEqual(collect_garbage(), (0, 0))  # still inside the grace period
+
+        EvidenceBlob.objects.filter(pk=old.pk).update(updated_at=timezone.now() - timedelta(days=2))
+        self.assertEqual(collect_garbage(), (1, old.size))
+        self.assertEqual(list(EvidenceBlob.objects.values_list("ref_count", flat=True)), [1])
+
+    def test_deleting_an_answer_releases_its_reference(self):
+        self.submit(b"%PDF-1.4 shared", *self.questions)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Answer.objects.filter(question=self.questions[0]).get().delete()
+
+        self.assertEqual(EvidenceBlob.objects.get().ref_count, 1)
+
+    def test_bulk_delete_releases_references_with_one_update_per_blob(self):
+        self.submit(b"%PDF-1.4 shared", *self.questions)
+
+        with mock.patch("assessments.evidence_signals.adjust_ref_counts", wraps=adjust_ref_counts) as adjust:
+            with self.captureOnCommitCallbacks(execute=True):
+                Answer.objects.filter(assessment=self.assessment).delete()
+
+        adjust.assert_called_once()
+        self.assertEqual(dict(adjust.call_args.args[0]), {EvidenceBlob.objects.get().pk: -2})
+        self.assertEqual(EvidenceBlob.objects.get().ref_count, 0)
+
+    def test_reusing_a_stale_blob_protects_it_from_collection(self):
+        first, second = self.questions
+        self.submit(b"%PDF-1.4 reused", first)
+        blob = EvidenceBlob.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            Answer.objects.filter(question=first).delete()
+        EvidenceBlob.objects.filter(pk=blob.pk).update(updated_at=timezone.now() - timedelta(days=2))
+
+        stored = store_file(SimpleUploadedFile("again.pdf", b"%PDF-1.4 reused"))
+
+        self.assertEqual(stored.pk, blob.pk)
+        self.assertEqual(stored.ref_count, 1)
+        self.assertEqual(collect_garbage(), (0, 0))
+
+
+class QuestionnaireSnapshotTests(AssessmentTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="SnapshotOrg")
+        vendor = Vendor.objects.create(organization=cls.org, name="Snapshotted")
+        cls.offering = VendorOffering.objects.create(vendor=vendor, name="Mail")
+        cls.questionnaire = Questionnaire.objects.create(name="Ordered")
+        cls.owned = Question.objects.create(questionnaire=cls.questionnaire, response_type="choice", text="Owned")
+        shared_home = Questionnaire.objects.create(name="Library")
+        cls.second = Question.objects.create(questionnaire=shared_home, response_type="choice", text="Second", weight=3)
+        cls.first = Question.objects.create(questionnaire=shared_home, response_type="choice", text="First")
+        QuestionnaireQuestion.objects.create(questionnaire=cls.questionnaire, question=cls.second, order=2)
+        QuestionnaireQuestion.objects.create(questionnaire=cls.questionnaire, question=cls.first, order=1)
+
+    def test_snapshot_follows_through_table_order(self):
+        snapshot = compile_questionnaire(self.questionnaire.id)
+
+        self.assertEqual([q.text for q in snapshot.questions], ["First", "Second", "Owned"])
+        self.assertEqual(snapshot.by_id[self.second.id].weight, 3)
+        self.assertEqual(compile_questionnaire(self.questionnaire.id).version, snapshot.version)
+
+    def test_question_edit_bumps_version_without_touching_pinned_assessments(self):
+        assessment = Assessment.objects.create(organization=self.org, vendor_offering=self.offering, questionnaire=self.questionnaire)
+        pinned = snapshot_for_assessment(assessment)
+
+        self.first.text = "First (reworded)"
+        self.first.save()
+
+        current = compile_questionnaire(self.questionnaire.id)
+        self.assertEqual(current.version, pinned.version + 1)
+        self.assertEqual(current.questions[0].text, "First (reworded)")
+        assessment.refresh_from_db()
+        clear_snapshot_caches()
+        with self.assertNumQueries(0):  # shared cache still holds the pinned version
+            self.assertEqual(snapshot_for_assessment(assessment).questions[0].text, "First")
+
+
+    def test_deleting_a_linked_question_recompiles_and_submit_skips_it(self):
+        assessment = Assessment.objects.create(organization=self.org, vendor_offering=self.offering, questionnaire=self.questionnaire)
+        pinned = snapshot_for_assessment(assessment)
+        post = {f"q_{question_id}_response": "yes" for question_id in pinned.question_ids}
+
+        deleted_id = self.second.id
+        Question.objects.get(pk=deleted_id).delete()  # linked only through QuestionnaireQuestion
+
+        current = compile_questionnaire(self.questionnaire.id)
+        self.assertEqual(current.version, pinned.version + 1)
+        self.assertNotIn(deleted_id, current.question_ids)
+        ok, message = handle_answer_submission(self.org, assessment.id, post)
+        self.assertTrue(ok, message)
+        self.assertEqual(set(assessment.answers.values_list("question_id", flat=True)), {self.first.id, self.owned.id})
+
+    def test_deleting_a_questionnaire_removes_its_pinned_assessments(self):
+        questionnaire = Questionnaire.objects.create(name="Retired")
+        Question.objects.create(questionnaire=questionnaire, response_type="choice", text="Gone?")
+        assessment = Assessment.objects.create(organization=self.org, vendor_offering=self.offering, questionnaire=questionnaire)
+        snapshot_for_assessment(assessment)
+
+        questionnaire.delete()
+
+        self.assertFalse(Assessment.objects.filter(pk=assessment.pk).exists())
+        self.assertFalse(QuestionnaireSnapshot.objects.filter(questionnaire_id=questionnaire.pk).exists())
+
+class AssessmentScoringTests(AssessmentTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="ScoreOrg")
+        cls.user = CustomUser.objects.create_user(email="scorer@score.test")
+        vendor = Vendor.objects.create(organization=cls.org, name="Scored")
+        cls.offering = VendorOffering.objects.create(vendor=vendor, name="Payroll")
+        cls.questionnaire = Questionnaire.objects.create(name="Weighted")
+        cls.heavy = Question.objects.create(questionnaire=cls.questionnaire, response_type="choice", text="Encrypt?", weight=3)
+        cls.light = Question.objects.create(questionnaire=cls.questionnaire, response_type="choice", text="Logo?", weight=1)
+        cls.required = Question.objects.create(
+            questionnaire=cls.questionnaire, response_type="choice", text="MFA?", weight=2, is_required=True
+        )
+
+    def make_assessment(self, information_value="moderate"):
+        return Assessment.objects.create(
+            organization=self.org,
+            vendor_offering=self.offering,
+            questionnaire=self.questionnaire,
+            information_value=information_value,
+        )
+
+    def test_submit_scores_with_weights_and_unanswered_required_questions(self):
+        assessment = self.make_assessment()
+        post = {f"q_{self.heavy.id}_response": "yes", f"q_{self.light.id}_response": "partial"}
+
+        handle_answer_submission(self.org, assessment.id, post)
+
+        assessment.refresh_from_db()
+        # earned 3 + 0.5 of possible 3 + 1 + 2 (required MFA unanswered counts as "no")
+        self.assertEqual(assessment.recommended_score, round(3.5 / 6 * 100, 2))
+        self.assertEqual(assessment.recommended_risk_level, "high")
+
+    def test_information_value_scales_the_shortfall(self):
+        moderate, unanswered, critical = self.make_assessment(), self.make_assessment(), self.make_assessment("critical")
+        for assessment in (moderate, critical):
+            Answer.objects.bulk_create(
+                [
+                    Answer(assessment=assessment, question=self.heavy, response="yes"),
+                    Answer(assessment=assessment, question=self.light, response="no", risk_impact=1.0),
+                    Answer(assessment=assessment, question=self.required, response="n/a"),
+                ]
+            )
+
+        self.assertEqual(rescore_assessments(self.org), 3)
+
+        for assessment in (moderate, unanswered, critical):
+            assessment.refresh_from_db()
+        self.assertEqual((moderate.recommended_score, moderate.recommended_risk_level), (60.0, "medium"))
+        self.assertEqual((critical.recommended_score, critical.recommended_risk_level), (20.0, "severe"))
+        self.assertEqual((unanswered.recommended_score, unanswered.recommended_risk_level), (0.0, "severe"))  # required "no"
+        # Same result as scoring on submit
+        self.assertEqual(score_assessment(critical, snapshot_for_assessment(critical)), (20.0, "severe"))
+
+
+class AssessmentListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="ListOrg")
+        cls.vendor = Vendor.objects.create(organization=cls.org, name="Listed")
+        other = Vendor.objects.create(organization=cls.org, name="Other")
+        cls.questionnaire = Questionnaire.objects.create(name="Listing")
+        cls.questions = Question.objects.bulk_create(
+            [Question(questionnaire=cls.questionnaire, response_type="choice", text=f"Q{i}") for i in range(4)]
+        )
+        cls.assessments = []
+        for i, vendor in enumerate([cls.vendor] * 4 + [other]):
+            offering = VendorOffering.objects.create(vendor=vendor, name=f"Offering {i}")
+            cls.assessments.append(
+                Assessment.objects.create(organization=cls.org, vendor_offering=offering, questionnaire=cls.questionnaire)
+            )
+        # The last two rows share a timestamp so the id tiebreak is exercised
+        created = timezone.now()
+        for i, assessment in enumerate(cls.assessments):
+            Assessment.objects.filter(pk=assessment.pk).update(created_at=created - timedelta(minutes=min(i, 3)))
+        Answer.objects.create(assessment=cls.assessments[0], question=cls.questions[0], response="yes")
+
+    def test_cursor_pages_visit_every_row_once(self):
+        queryset = assessment_list_queryset(self.org)
+        seen, page = [], keyset_page(queryset, page_size=2)
+        while True:
+            seen += [a.pk for a in page.items]
+            if not page.has_next:
+                break
+            page = keyset_page(queryset, after=page.next_cursor, page_size=2)
+
+        self.assertEqual(seen, [a.pk for a in self.assessments[:3]] + [self.assessments[4].pk, self.assessments[3].pk])
+        back = keyset_page(queryset, before=page.previous_cursor, page_size=2)
+        self.assertEqual([a.pk for a in back.items], seen[2:4])
+
+    def test_filtered_page_with_progress_counts_is_one_query(self):
+        queryset = assessment_list_queryset(self.org, {"vendor": self.vendor})
+
+        with self.assertNumQueries(1):
+            page = keyset_page(queryset, page_size=10)
+            rows = [(a.vendor_offering.vendor.name, a.questionnaire.name, a.answered, a.total_questions) for a in page.items]
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0], ("Listed", "Listing", 1, 4))
+
+
+class AssessmentExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="ExportOrg")
+        cls.user = CustomUser.objects.create_user(email="auditor@export.test", password="Password123!")
+        Membership.objects.create(user=cls.user, organization=cls.org, role="member")
+        vendor = Vendor.objects.create(organization=cls.org, name="Exported")
+        questionnaire = Questionnaire.objects.create(name="Export")
+        questions = Question.objects.bulk_create(
+            [Question(questionnaire=questionnaire, response_type="choice", text=f"Q{i}") for i in range(3)]
+        )
+        for status in ("draft", "submitted"):
+            offering = VendorOffering.objects.create(vendor=vendor, name=f"{status} offering")
+            assessment = Assessment.objects.create(
+                organization=cls.org, vendor_offering=offering, questionnaire=questionnaire, status=status
+            )
+            Answer.objects.bulk_create([Answer(assessment=assessment, question=q, response="yes") for q in questions])
+
+        other = Organization.objects.create(name="NotExported")
+        foreign = VendorOffering.objects.create(vendor=Vendor.objects.create(organization=other, name="Foreign"), name="X")
+        Answer.objects.create(
+            assessment=Assessment.objects.create(organization=other, vendor_offering=foreign, questionnaire=questionnaire),
+            question=questions[0],
+            response="no",
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_csv_streams_selected_columns_for_matching_assessments(self):
+        response = self.client.get(
+            reverse("assessments:export"), {"columns": "offering,question,response", "status": "submitted"}
+        )
+
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "offering,question,response")
+        self.assertEqual(lines[1:], [f"submitted offering,Q{i},yes" for i in range(3)])
+
+    def test_gzipped_json_lines(self):
+        response = self.client.get(reverse("assessments:export"), {"format": "jsonl", "gzip": "1", "columns": "vendor,response"})
+
+        rows = [json.loads(line) for line in gzip.decompress(b"".join(response.streaming_content)).splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0], {"vendor": "Exported", "response": "yes"})
+        self.assertEqual(self.client.get(reverse("assessments:export"), {"columns": "password"}).status_code, 400)
+
+    def test_status_filter_accepts_workflow_states(self):
+        workflow = Workflow.objects.create(name="Assessment Workflow")
+        State.objects.create(workflow=workflow, name="Draft", is_initial=True)
+        State.objects.create(workflow=workflow, name="Review")
+        Assessment.objects.filter(status="submitted").update(status="review")  # as mirrored by a transition
+
+        response = self.client.get(reverse("assessments:export"), {"columns": "offering", "status": "Review"})
+
+        self.assertEqual(b"".join(response.streaming_content).decode().splitlines()[1:], ["submitted offering"] * 3)
+        self.assertEqual(self.client.get(reverse("assessments:export"), {"status": "archived"}).status_code, 400)
+
+
+class QuestionnaireImportTests(AssessmentTestCase):
+    def test_csv_import_keeps_order_and_reports_bad_rows(self):
+        rows = ["text,category,response_type,weight,is_required,tags"]
+        rows += [f"Control {i},Access Control,choice,2,yes,SIG;core" for i in range(1500)]
+        rows.insert(3, "Bad category,Astrology,choice,1,no,")
+        rows.insert(5, ",access_control,choice,1,no,")
+        upload = io.BytesIO("\n".join(rows).encode())
+
+        result = import_questionnaire(upload, "csv", name="SIG Core")
+
+        self.assertEqual(result.created, 1500)
+        self.assertEqual([(e.row, e.message) for e in result.errors], [(4, "unknown category 'Astrology'."), (6, "'text' is required.")])
+        snapshot = compile_questionnaire(result.questionnaire.pk)
+        self.assertEqual(snapshot.version, 1)  # compiled once by the import, unchanged since
+        self.assertEqual(snapshot.questions[0].text, "Control 0")
+        self.assertEqual(snapshot.questions[-1].text, "Control 1499")
+        self.assertEqual(snapshot.questions[0].tags, ("SIG", "core"))
+
+    def test_json_reimport_skips_existing_questions(self):
+        first = import_questionnaire(io.BytesIO(json.dumps([{"text": "Q1"}, {"text": "Q2"}]).encode()), "json", name="CAIQ")
+        again = import_questionnaire(
+            io.BytesIO(json.dumps({"questions": [{"text": "Q2"}, {"text": "Q3", "response_type": "Text Only"}]}).encode()),
+            "json",
+            questionnaire=first.questionnaire,
+        )
+
+        self.assertEqual((again.created, [e.row for e in again.errors]), (1, [1]))
+        orders = list(QuestionnaireQuestion.objects.filter(questionnaire=first.questionnaire).values_list("question__text", "order"))
+        self.assertEqual(orders, [("Q1", 0), ("Q2", 1), ("Q3", 2)])
+        self.assertEqual(Question.objects.get(text="Q3").response_type, "text")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class CloneAssessmentTests(AssessmentTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="CloneOrg")
+        cls.user = CustomUser.objects.create_user(email="cycle@clone.test", password="Password123!")
+        Membership.objects.create(user=cls.user, organization=cls.org, role="member")
+        vendor = Vendor.objects.create(organization=cls.org, name="Recurring")
+        cls.offering = VendorOffering.objects.create(vendor=vendor, name="HR Suite")
+        cls.questionnaire = Questionnaire.objects.create(name="Annual")
+        cls.questions = [
+            Question.objects.create(questionnaire=cls.questionnaire, response_type="choice", text=f"Q{i}") for i in range(3)
+        ]
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_new_cycle_copies_surviving_answers_and_shares_evidence(self):
+        last_year = Assessment.objects.create(organization=self.org, vendor_offering=self.offering, questionnaire=self.questionnaire)
+        post = {f"q_{q.id}_response": "yes" for q in self.questions}
+        files = {f"q_{self.questions[0].id}_evidence": SimpleUploadedFile("soc2.pdf", b"%PDF-1.4 last year")}
+        handle_answer_submission(self.org, last_year.id, post, files=files)
+        self.questions[2].is_archived = True
+        self.questions[2].save()  # dropped from this year's version
+
+        response = self.client.get(
+            reverse("assessments:create"),
+            {"offering_id": self.offering.id, "questionnaire_id": self.questionnaire.id, "clone_from": "previous"},
+        )
+
+        self.assertEqual(response.status_code, 302)
+        this_year = Assessment.objects.exclude(pk=last_year.pk).get()
+        copied = {a.question_id: a for a in this_year.answers.all()}
+        self.assertEqual(set(copied), {self.questions[0].id, self.questions[1].id})
+        self.assertEqual(copied[self.questions[0].id].evidence.name, last_year.answers.get(question=self.questions[0]).evidence.name)
+        self.assertEqual(EvidenceBlob.objects.get().ref_count, 2)
+        self.assertEqual(this_year.recommended_score, 100.0)
+
+    def test_form_submission_clones_within_the_given_organization(self):
+        workflow = Workflow.objects.create(name="Assessment Workflow")
+        State.objects.create(workflow=workflow, name="Draft", is_initial=True)
+        last_year = Assessment.objects.create(organization=self.org, vendor_offering=self.offering, questionnaire=self.questionnaire)
+        handle_answer_submission(self.org, last_year.id, {f"q_{q.id}_response": "no" for q in self.questions})
+        form = {
+            "questionnaire": self.questionnaire.id,
+            "vendor_offering": self.offering.id,
+            "information_value": "moderate",
+            "risk_level": "undetermined",
+            "clone_from": "previous",
+        }
+        request = RequestFactory().post("/", form)
+        request.user = self.user
+
+        ok, this_year, message = create_assessment_from_request(request, self.org)
+
+        self.assertTrue(ok, message)
+        self.assertEqual(this_year.organization, self.org)
+        self.assertEqual(set(this_year.answers.values_list("response", flat=True)), {"no"})
+        ok, _, _ = create_assessment_from_request(request, Organization.objects.create(name="Elsewhere"))
+        self.assertFalse(ok)
+
+    def test_form_submission_works_before_a_workflow_exists(self):
+        request = RequestFactory().post(
+            "/",
+            {
+                "questionnaire": self.questionnaire.id,
+                "vendor_offering": self.offering.id,
+                "information_value": "moderate",
+                "risk_level": "undetermined",
+            },
+        )
+        request.user = self.user
+
+        ok, assessment, message = create_assessment_from_request(request, self.org)
+
+        self.assertTrue(ok, message)
+        self.assertFalse(WorkflowObject.objects.filter(object_id=assessment.pk).exists())
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        install_search_schema()  # normally done by migration 0014
+        cls.org = Organization.objects.create(name="SearchOrg")
+        other_org = Organization.objects.create(name="Elsewhere")
+        cls.vendor = Vendor.objects.create(organization=cls.org, name="Vault Co", description="Managed key storage")
+        cls.offering = VendorOffering.objects.create(
+            vendor=cls.vendor, name="Vault Cloud", description="Hosted secrets with encryption at rest"
+        )
+        questionnaire = Questionnaire.objects.create(name="Crypto")
+        cls.at_rest = Question.objects.create(
+            questionnaire=questionnaire, response_type="choice", text="Is customer data encrypted at rest?"
+        )
+        cls.mfa = Question.objects.create(questionnaire=questionnaire, response_type="choice", text="Is MFA enforced?")
+        cls.assessment = Assessment.objects.create(
+            organization=cls.org, vendor_offering=cls.offering, questionnaire=questionnaire
+        )
+        cls.said_no = Answer.objects.create(assessment=cls.assessment, question=cls.at_rest, response="no")
+        cls.explained = Answer.objects.create(
+            assessment=cls.assessment,
+            question=cls.mfa,
+            response="partial",
+            comments="Admins only; backups use encryption at rest",
+        )
+        foreign_vendor = Vendor.objects.create(organization=other_org, name="Vault Rival")
+        foreign = Assessment.objects.create(
+            organization=other_org,
+            vendor_offering=VendorOffering.objects.create(vendor=foreign_vendor, name="Rival"),
+            questionnaire=questionnaire,
+        )
+        Answer.objects.create(assessment=foreign, question=cls.at_rest, response="no")
+
+    def test_answers_are_ranked_scoped_and_filterable_by_response(self):
+        hits = search(self.org, "encryption at rest", kinds=["answer"])
+
+        # a direct hit on the answer text outranks a match through the question
+        self.assertEqual([hit.object.pk for hit in hits], [self.explained.pk, self.said_no.pk])
+        self.assertTrue(all(hit.object.assessment.organization_id == self.org.pk for hit in hits))
+
+        said_no = search(self.org, "encrypted at rest", kinds=["answer"], response="no")
+        self.assertEqual([hit.object.pk for hit in said_no], [self.said_no.pk])
+
+        kinds = {hit.kind for hit in search(self.org, "vault")}
+        self.assertEqual(kinds, {"vendor", "offering"})
+        self.assertEqual([hit.object.name for hit in search(self.org, "vault", kinds=["vendor"])], ["Vault Co"])
+
+    def test_triggers_keep_the_index_current(self):
+        self.assertEqual(search(self.org, "tokenization"), [])
+
+        self.vendor.description = "Tokenization for card data"
+        self.vendor.save()
+        self.explained.delete()
+        Answer.objects.filter(pk=self.said_no.pk).update(supporting_text="Tokenization pending")
+
+        hits = search(self.org, "tokenization")
+        self.assertEqual({(hit.kind, hit.object.pk) for hit in hits}, {("vendor", self.vendor.pk), ("answer", self.said_no.pk)})
+        self.assertEqual(search(self.org, "admins backups", kinds=["answer"]), [])
+        self.assertEqual(search(self.org, '" OR *'), [])
+
+
+class AssessmentDetailTests(AssessmentTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="DetailOrg")
+        cls.user = CustomUser.objects.create_user(email="reviewer@detail.test", password="Password123!")
+        offering = VendorOffering.objects.create(vendor=Vendor.objects.create(organization=cls.org, name="Shown"), name="CRM")
+        questionnaire = Questionnaire.objects.create(name="Detail")
+        cls.assessment = Assessment.objects.create(organization=cls.org, vendor_offering=offering, questionnaire=questionnaire)
+        workflow = Workflow.objects.create(name="Assessment Workflow")
+        cls.draft = State.objects.create(workflow=workflow, name="Draft", is_initial=True)
+        cls.review = State.objects.create(workflow=workflow, name="Review")
+
+    def setUp(self):
+        super().setUp()
+        ContentType.objects.get_for_model(Assessment)  # process-wide cache, warm after the first request
+
+    def _populate(self, assessment, answers, logs):
+        questions = Question.objects.bulk_create(
+            [Question(questionnaire=assessment.questionnaire, response_type="choice", text=f"D{i}") for i in range(answers)]
+        )
+        Answer.objects.bulk_create([Answer(assessment=assessment, question=q, response="yes") for q in questions])
+        attach_missing_workflows(Assessment.objects.filter(pk=assessment.pk))
+        wf_obj = WorkflowObject.objects.get_for_instance(assessment)
+        WorkflowLog.objects.bulk_create(
+            [WorkflowLog(workflow_object=wf_obj, from_state=self.draft, to_state=self.review, user=self.user) for _ in range(logs)]
+        )
+
+    def test_query_count_does_not_grow_with_answers_or_logs(self):
+        self._populate(self.assessment, answers=2, logs=1)
+        snapshot_for_assessment(self.assessment)  # pinned and cached, as after the first submit
+        with self.assertNumQueries(4):
+            context = get_assessment_detail(self.assessment.pk, self.org)
+            rows = [(a.question.text, a.response) for a in context["answers"]]
+            trail = [(log.from_state.name, log.to_state.name, log.user.email) for log in context["workflow_logs"]]
+            header = (context["assessment"].vendor_offering.vendor.name, context["workflow_object"].current_state.name)
+
+        self.assertEqual((len(rows), len(trail), header), (2, 1, ("Shown", "Draft")))
+
+        self._populate(self.assessment, answers=20, logs=10)
+        with self.assertNumQueries(4):
+            context = get_assessment_detail(self.assessment.pk, self.org)
+            [a.question.text for a in context["answers"]]
+            [log.user.email for log in context["workflow_logs"]]
+
+    def test_answers_follow_the_pinned_sequence(self):
+        first, second = Question.objects.bulk_create(
+            [Question(questionnaire=self.assessment.questionnaire, response_type="choice", text=t) for t in ("A", "B")]
+        )
+        QuestionnaireQuestion.objects.bulk_create(
+            [
+                QuestionnaireQuestion(questionnaire=self.assessment.questionnaire, question=second, order=1),
+                QuestionnaireQuestion(questionnaire=self.assessment.questionnaire, question=first, order=2),
+            ]
+        )
+        Answer.objects.bulk_create([Answer(assessment=self.assessment, question=q, response="yes") for q in (first, second)])
+        compile_questionnaire(self.assessment.questionnaire_id)
+
+        context = get_assessment_detail(self.assessment.pk, self.org)
+
+        self.assertEqual([a.question_id for a in context["answers"]], [second.id, first.id])
+
+    def test_reading_never_attaches_a_workflow(self):
+        with self.assertNumQueries(3):
+            context = get_assessment_detail(self.assessment.pk, self.org)
+
+        self.assertIsNone(context["workflow_object"])
+        self.assertFalse(WorkflowObject.objects.exists())
+        self.assertEqual(attach_missing_workflows(Assessment.objects.all()), 1)
+        self.assertEqual(attach_missing_workflows(Assessment.objects.all()), 0)
+        self.assertEqual(WorkflowObject.objects.get_for_instance(self.assessment).current_state, self.draft)
@@ -3,15 +3,22 @@
 from django.urls import path
 
 from .views import (
+    AnswerAutosaveView,
     AnswerQuestionnaireView,
+    AssessmentBulkTransitionView,
     AssessmentCreateView,
     AssessmentDetailView,
+    AssessmentExportView,
     AssessmentListView,
+    EvidenceUploadFinalizeView,
+    EvidenceUploadStartView,
+    EvidenceUploadView,
     QuestionArchiveView,
     QuestionCreateView,
     QuestionListView,
     QuestionnaireCreateView,
     QuestionnaireDetailView,
+    QuestionnaireImportView,
     QuestionnaireListView,
     QuestionUpdateView,
     SubmitAssessmentForReviewView,
@@ -31,6 +38,11 @@ urlpatterns = [
         QuestionnaireCreateView.as_view(),
         name="questionnaire_create",
     ),
+    path(
+        "questionnaires/import/",
+        QuestionnaireImportView.as_view(),
+        name="questionnaire_import",
+    ),
     path(
         "questionnaires/<int:pk>/",
         QuestionnaireDetailView.as_view(),
@@ -52,10 +64,24 @@ urlpatterns = [
         name="question_archive",
     ),
     path("", AssessmentListView.as_view(), name="list"),
+    path("export/", AssessmentExportView.as_view(), name="export"),
+    path("bulk-transition/", AssessmentBulkTransitionView.as_view(), name="bulk_transition"),
     path("create/", AssessmentCreateView.as_view(), name="create"),
     path("<int:pk>/", AssessmentDetailView.as_view(), name="detail"),
     path("<int:pk>/submit/", SubmitAssessmentForReviewView.as_view(), name="submit"),
     path("<int:pk>/answer/", AnswerQuestionnaireView.as_view(), name="answer"),
+    path(
+        "<int:pk>/answer/<int:question_id>/autosave/",
+        AnswerAutosaveView.as_view(),
+        name="autosave_answer",
+    ),
+    path("uploads/", EvidenceUploadStartView.as_view(), name="upload_start"),
+    path("uploads/<uuid:upload_id>/", EvidenceUploadView.as_view(), name="upload"),
+    path(
+        "uploads/<uuid:upload_id>/finalize/",
+        EvidenceUploadFinalizeView.as_view(),
+        name="upload_finalize",
+    ),
     path(
         "assessments/<int:pk>/submit/",
         SubmitAssessmentForReviewView.as_view(),
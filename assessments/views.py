@@ -1,25 +1,39 @@
 # assessments/views.py
 
+import json
+
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.contrib.contenttypes.models import ContentType
-from django.http import HttpResponseBadRequest
+from django.db import transaction
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views import View
 from django.views.generic import CreateView, DetailView, ListView, UpdateView
 
+from common.errors import BusinessRuleError, StaleAnswerVersion, TransitionConflict, UploadOffsetMismatch
+from common.pagination import DEFAULT_PAGE_SIZE, keyset_page
 from services.assessments import (
-    get_assessments_for_org,
+    assessment_list_queryset,
+    autosave_answer,
+    clone_answers,
+    find_clone_source,
+    get_assessment_detail,
     get_questionnaire_context,
     handle_answer_submission,
     submit_assessment_for_review,
 )
-from services.workflow import ensure_workflow_for_object
-from workflow.models import WorkflowLog, WorkflowObject  # Workflow import
-
-from .forms import QuestionForm, QuestionnaireForm
-from .models import Assessment, Question, Questionnaire, VendorOffering
+from services.exports import EXPORT_CONTENT_TYPES, export_filename, parse_export_options, stream_export
+from services.permissions import OrganizationRequiredMixin
+from services.questionnaire_import import detect_format, import_questionnaire
+from services.uploads import abort_upload, finalize_upload, start_upload, write_chunk
+from services.workflow import bulk_transition, ensure_workflow_for_object, prefetch_workflow, workflow_state_names
+from workflow.models import State, Workflow
+
+from .forms import AssessmentFilterForm, QuestionForm, QuestionnaireForm, QuestionnaireImportForm
+from .models import Assessment, EvidenceUpload, Question, Questionnaire, VendorOffering
+from .scoring import score_assessment
+from .snapshots import current_snapshot
 
 # ====================================================
 # ✅ List of Questionnaire Views
@@ -45,6 +59,31 @@ class QuestionnaireCreateView(CreateView):
     success_url = reverse_lazy("assessments:questionnaire_list")
 
 
+class QuestionnaireImportView(LoginRequiredMixin, View):
+    """Bulk-imports a framework file; bad rows are listed, the rest are saved."""
+
+    template_name = "assessments/questionnaire_import.html"
+
+    def get(self, request):
+        return render(request, self.template_name, {"form": QuestionnaireImportForm()})
+
+    def post(self, request):
+        form = QuestionnaireImportForm(request.POST, request.FILES)
+        context = {"form": form}
+        if form.is_valid():
+            upload = form.cleaned_data["file"]
+            try:
+                context["result"] = import_questionnaire(
+                    upload,
+                    detect_format(upload.name),
+                    questionnaire=form.cleaned_data["questionnaire"],
+                    name=form.cleaned_data["name"],
+                )
+            except BusinessRuleError as e:
+                form.add_error("file", str(e))
+        return render(request, self.template_name, context, status=400 if form.errors else 200)
+
+
 class QuestionnaireDetailView(DetailView):
     model = Questionnaire
     template_name = "assessments/questionnaire_detail.html"
@@ -54,13 +93,69 @@ class QuestionnaireDetailView(DetailView):
 # ====================================================
 # ✅ List Assessments – Org-wide for logged-in user
 # ====================================================
-class AssessmentListView(LoginRequiredMixin, ListView):
+class AssessmentListView(OrganizationRequiredMixin, ListView):
+    """Keyset-paginated on ``(created_at, id)``: every page costs one bounded query."""
+
     model = Assessment
     context_object_name = "assessments"
     template_name = "assessments/assessment_list.html"
+    page_size = DEFAULT_PAGE_SIZE
 
     def get_queryset(self):
-        return get_assessments_for_org(self.request.user.organization)
+        self.filter_form = AssessmentFilterForm(self.request.GET or None, organization=self.organization)
+        filters = self.filter_form.cleaned_data if self.filter_form.is_valid() else {}
+        return assessment_list_queryset(self.organization, filters)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = keyset_page(
+            self.object_list,
+            after=self.request.GET.get("after"),
+            before=self.request.GET.get("before"),
+            page_size=self.page_size,
+        )
+        # Cursor links keep the active filters
+        params = self.request.GET.copy()
+        for key in ("after", "before"):
+            params.pop(key, None)
+        # Workflow objects and next actions for the whole page in one query
+        prefetch_workflow(page.items, self.request.user)
+        context.update(
+            assessments=page.items,
+            page=page,
+            filter_form=self.filter_form,
+            filter_query=params.urlencode(),
+            transition_targets=workflow_state_names(),
+        )
+        return context
+
+
+# ====================================================
+# ✅ Bulk transition (list page action)
+# ====================================================
+class AssessmentBulkTransitionView(OrganizationRequiredMixin, View):
+    """POST ``assessment_ids`` (repeated), ``to_state`` and an optional ``comment``."""
+
+    def post(self, request, *args, **kwargs):
+        ids = [value for value in request.POST.getlist("assessment_ids") if value.isdigit()]
+        to_state = request.POST.get("to_state", "").strip()
+        if not ids or not to_state:
+            messages.error(request, "Select at least one assessment and a target state.")
+            return redirect("assessments:list")
+
+        assessments = Assessment.objects.filter(organization=self.organization, pk__in=ids)
+        try:
+            report = bulk_transition(request.user, assessments, to_state, comment=request.POST.get("comment", ""))
+        except TransitionConflict as exc:
+            # Nothing was moved; the page the user acted on is stale
+            messages.error(request, str(exc))
+            return redirect("assessments:list")
+
+        if report.succeeded:
+            messages.success(request, f"{len(report.succeeded)} assessment(s) moved to {to_state}.")
+        for outcome in report.failed:
+            messages.warning(request, f"Assessment {outcome.object_id}: {outcome.error}")
+        return redirect("assessments:list")
 
 
 # ====================================================
@@ -69,10 +164,13 @@ class AssessmentListView(LoginRequiredMixin, ListView):
 # assessments/views.py
 
 
-class AssessmentCreateView(LoginRequiredMixin, View):
+class AssessmentCreateView(OrganizationRequiredMixin, View):
+    """``?offering_id=…[&questionnaire_id=…][&clone_from=<id>|previous]``"""
+
     def get(self, request, *args, **kwargs):
         offering_id = request.GET.get("offering_id")
         questionnaire_id = request.GET.get("questionnaire_id")
+        clone_from = request.GET.get("clone_from")
 
         if not offering_id:
             return HttpResponseBadRequest(
@@ -80,8 +178,8 @@ class AssessmentCreateView(LoginRequiredMixin, View):
             )
 
         try:
-            vendor_offering = VendorOffering.objects.get(id=offering_id)
-        except VendorOffering.DoesNotExist:
+            vendor_offering = VendorOffering.objects.get(id=offering_id, vendor__organization=self.organization)
+        except (VendorOffering.DoesNotExist, ValueError):
             return HttpResponseBadRequest("Invalid offering.")
 
         # Default to NIST Questionnaire if none provided
@@ -93,14 +191,31 @@ class AssessmentCreateView(LoginRequiredMixin, View):
         if not questionnaire:
             return HttpResponseBadRequest("No valid questionnaire found.")
 
-        # Create the assessment
-        assessment = Assessment.objects.create(
-            organization=request.user.organization,
-            created_by=request.user,
-            vendor_offering=vendor_offering,
-            questionnaire=questionnaire,
-            status="draft",
-        )
+        source = None
+        if clone_from:
+            try:
+                source = find_clone_source(self.organization, vendor_offering, clone_from)
+            except BusinessRuleError as e:
+                return HttpResponseBadRequest(str(e))
+
+        # Create the assessment (seeded from the previous cycle if asked)
+        with transaction.atomic():
+            snapshot = current_snapshot(questionnaire.id)
+            assessment = Assessment.objects.create(
+                organization=self.organization,
+                created_by=request.user,
+                vendor_offering=vendor_offering,
+                questionnaire=questionnaire,
+                questionnaire_snapshot_id=snapshot.snapshot_id,
+                status="draft",
+            )
+            try:
+                ensure_workflow_for_object(assessment)
+            except (Workflow.DoesNotExist, State.DoesNotExist):
+                pass  # no workflow configured yet; `manage.py attach_workflows` backfills
+            if source is not None:
+                clone_answers(source, assessment, snapshot)
+                score_assessment(assessment, snapshot)
 
         return redirect("assessments:answer", pk=assessment.pk)
 
@@ -108,35 +223,10 @@ class AssessmentCreateView(LoginRequiredMixin, View):
 # ====================================================
 # ✅ View Assessment Detail
 # ====================================================
-class AssessmentDetailView(LoginRequiredMixin, DetailView):
-    model = Assessment
-    template_name = "assessments/assessment_detail.html"
-    context_object_name = "assessment"
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        assessment = self.object
-
-        try:
-            # Auto-create workflow if missing
-            ensure_workflow_for_object(assessment)
-
-            content_type = ContentType.objects.get_for_model(assessment.__class__)
-            wf_obj = WorkflowObject.objects.get(
-                content_type=content_type, object_id=assessment.pk
-            )
-            context["workflow_object"] = wf_obj
-            context["workflow_logs"] = WorkflowLog.objects.filter(
-                workflow_object=wf_obj
-            ).select_related("user", "from_state", "to_state")
-        except Exception as e:
-            context["workflow_object"] = None
-            context["workflow_logs"] = []
-            print(f"[Workflow Attach Error]: {e}")
-
-        return context
-
-
+class AssessmentDetailView(OrganizationRequiredMixin, View):
+    def get(self, request, pk):
+        context = get_assessment_detail(pk, self.organization)
+        return render(request, "assessments/assessment_detail.html", context)
 
 
 # ====================================================
@@ -156,23 +246,131 @@ class SubmitAssessmentForReviewView(LoginRequiredMixin, View):
 # ====================================================
 # ✅ Answer Questionnaire View (GET + POST)
 # ====================================================
-class AnswerQuestionnaireView(LoginRequiredMixin, View):
+class AnswerQuestionnaireView(OrganizationRequiredMixin, View):
     def get(self, request, pk):
-        context = get_questionnaire_context(pk, request.user.organization)
+        context = get_questionnaire_context(pk, self.organization)
         return render(request, "assessments/answer_questions.html", context)
 
     def post(self, request, pk):
         success, message = handle_answer_submission(
-            request.user, pk, request.POST, request.FILES
+            self.organization, pk, request.POST, request.FILES
         )
         if success:
             messages.success(request, message)
             return redirect("assessments:detail", pk=pk)
         messages.error(request, message)
-        context = get_questionnaire_context(pk, request.user.organization)
+        context = get_questionnaire_context(pk, self.organization)
         return render(request, "assessments/answer_questions.html", context)
 
 
+# ====================================================
+# ✅ Autosave one answer (HTMX POST)
+# ====================================================
+class AnswerAutosaveView(OrganizationRequiredMixin, View):
+    """Saves a single question's fields; 409 with the stored answer on version conflicts."""
+
+    template_name = "assessments/partials/autosave_status.html"
+
+    def post(self, request, pk, question_id):
+        prefix = f"q_{question_id}_"
+        data = {
+            field: request.POST.get(prefix + field, "")
+            for field in ("response", "supporting_text", "comments")
+        }
+        try:
+            expected_version = int(request.POST.get(prefix + "version") or 0)
+        except ValueError:
+            return HttpResponseBadRequest("Invalid version.")
+
+        context = {"question_id": question_id}
+        try:
+            answer = autosave_answer(self.organization, pk, question_id, data, expected_version)
+        except StaleAnswerVersion as conflict:
+            context.update(conflict=True, answer=conflict.current)
+            return render(request, self.template_name, context, status=409)
+        except BusinessRuleError as e:
+            context["error"] = str(e)
+            return render(request, self.template_name, context, status=400)
+
+        context["answer"] = answer
+        return render(request, self.template_name, context)
+
+
+# ====================================================
+# ✅ Resumable evidence uploads (JSON API)
+# ====================================================
+def _upload_state(upload):
+    return {"upload_id": str(upload.id), "offset": upload.offset, "size": upload.size, "status": upload.status}
+
+
+class EvidenceUploadStartView(OrganizationRequiredMixin, View):
+    """POST {filename, size, sha256?, assessment+question | certification} → upload id."""
+
+    def post(self, request):
+        try:
+            payload = json.loads(request.body or b"{}")
+            upload = start_upload(
+                self.organization,
+                request.user,
+                filename=str(payload.get("filename") or "evidence"),
+                size=int(payload.get("size") or 0),
+                sha256=str(payload.get("sha256") or ""),
+                assessment_id=payload.get("assessment"),
+                question_id=payload.get("question"),
+                certification_id=payload.get("certification"),
+            )
+        except (ValueError, TypeError):
+            return JsonResponse({"error": "Invalid upload request."}, status=400)
+        except BusinessRuleError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        return JsonResponse(_upload_state(upload), status=201)
+
+
+class EvidenceUploadView(OrganizationRequiredMixin, View):
+    """GET: resume offset · PATCH: append a chunk at ``Upload-Offset`` · DELETE: abort."""
+
+    def get_upload(self, upload_id):
+        return get_object_or_404(EvidenceUpload, id=upload_id, organization=self.organization)
+
+    def get(self, request, upload_id):
+        return JsonResponse(_upload_state(self.get_upload(upload_id)))
+
+    def patch(self, request, upload_id):
+        upload = self.get_upload(upload_id)
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return JsonResponse({"error": "Upload-Offset and Content-Length headers are required."}, status=400)
+
+        try:
+            # Read the body as a stream; Django never buffers it for this content type
+            write_chunk(upload, offset, request, length)
+        except UploadOffsetMismatch as e:
+            return JsonResponse({"error": str(e), "offset": e.offset}, status=409)
+        except BusinessRuleError as e:
+            return JsonResponse({"error": str(e), "offset": upload.offset}, status=400)
+        return JsonResponse(_upload_state(upload))
+
+    def delete(self, request, upload_id):
+        upload = self.get_upload(upload_id)
+        try:
+            abort_upload(upload)
+        except BusinessRuleError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        return JsonResponse(_upload_state(upload))
+
+
+class EvidenceUploadFinalizeView(OrganizationRequiredMixin, View):
+    def post(self, request, upload_id):
+        upload = get_object_or_404(EvidenceUpload, id=upload_id, organization=self.organization)
+        try:
+            target = finalize_upload(upload)
+        except BusinessRuleError as e:
+            return JsonResponse({"error": str(e), **_upload_state(upload)}, status=400)
+        return JsonResponse({**_upload_state(upload), "name": upload.storage_name, "target_id": target.pk})
+
+
 class QuestionListView(ListView):
     model = Question
     template_name = "assessments/question_list.html"
@@ -202,3 +400,29 @@ class QuestionArchiveView(View):
         question.is_archived = True
         question.save()
         return redirect("assessments:question_list")
+
+
+# ====================================================
+# ✅ Export assessments with answers (streamed)
+# ====================================================
+class AssessmentExportView(OrganizationRequiredMixin, View):
+    """``?format=csv|jsonl|xlsx&columns=a,b&from=YYYY-MM-DD&to=…&status=…&gzip=1``"""
+
+    def get(self, request):
+        try:
+            options = parse_export_options(
+                columns=request.GET.get("columns"),
+                date_from=request.GET.get("from"),
+                date_to=request.GET.get("to"),
+                statuses=request.GET.getlist("status"),
+                fmt=request.GET.get("format", "csv"),
+            )
+            gzip = request.GET.get("gzip") in ("1", "true")
+            fmt = options.pop("fmt")
+            chunks = stream_export(self.organization, options.pop("columns"), fmt=fmt, gzip=gzip, **options)
+        except BusinessRuleError as e:
+            return HttpResponseBadRequest(str(e))
+
+        response = StreamingHttpResponse(chunks, content_type=EXPORT_CONTENT_TYPES[fmt])
+        response["Content-Disposition"] = f'attachment; filename="{export_filename(fmt, gzip)}"'
+        return response
@@ -0,0 +1,4 @@
+"""Benchmark suite for the trust, assessment and workflow hot paths.
+
+Run with ``python scripts/run_benchmarks.py`` (see that script for options).
+"""
@@ -0,0 +1,94 @@
+# benchmarks/cases.py
+"""Benchmark cases for the hot paths.
+
+A case is ``prepare(dataset, i) -> callable``: ``prepare`` does the setup
+for iteration ``i`` (loading objects, building requests) outside the timed
+region, and the returned zero-argument callable is what gets timed. Every
+iteration runs inside a transaction that is rolled back, so write paths
+see the same data each time.
+"""
+
+from django.test import RequestFactory
+
+from accounts.models import CustomUser, Organization
+from assessments.models import Assessment
+from dashboard.views import DashboardStatsView
+from services.assessments import handle_answer_submission
+from services.workflow import apply_transition
+from trust.engine import calculate_vendor_trust_score
+from vendors.models import Vendor
+from vendors.views import vendor_list
+from workflow.models import Transition
+
+CASES = {}
+
+
+def benchmark(name):
+    """Registers ``prepare(dataset, i)`` as the benchmark case ``name``."""
+
+    def decorator(prepare):
+        CASES[name] = prepare
+        return prepare
+
+    return decorator
+
+
+def _pick(ids, i):
+    return ids[i % len(ids)]
+
+
+def _org_user(dataset):
+    # Views and services read ``user.organization``; the benchmark user carries it explicitly
+    user = CustomUser.objects.get(pk=dataset.owner_id)
+    user.organization = Organization.objects.get(pk=dataset.organization_id)
+    return user
+
+
+def _get(user, path="/"):
+    request = RequestFactory().get(path)
+    request.user = user
+    return request
+
+
+@benchmark("trust.calculate_vendor_trust_score")
+def bench_trust_score(dataset, i):
+    vendor = Vendor.objects.select_related("trust_profile").get(pk=_pick(dataset.vendor_ids, i))
+    return lambda: calculate_vendor_trust_score(vendor)
+
+
+@benchmark("assessments.handle_answer_submission")
+def bench_answer_submission(dataset, i):
+    organization = Organization.objects.get(pk=dataset.organization_id)
+    assessment_id = _pick(dataset.assessment_ids, i)
+    post_data = {}
+    for n, question_id in enumerate(dataset.question_ids):
+        post_data[f"q_{question_id}_response"] = ("yes", "no", "partial")[(n + i) % 3]
+        post_data[f"q_{question_id}_comments"] = f"Benchmark iteration {i}"
+
+    def run():
+        ok, message = handle_answer_submission(organization, assessment_id, post_data)
+        if not ok:
+            raise RuntimeError(message)
+
+    return run
+
+
+@benchmark("dashboard.DashboardStatsView")
+def bench_dashboard_stats(dataset, i):
+    request = _get(_org_user(dataset), "/dashboard/data/")
+    view = DashboardStatsView.as_view()
+    return lambda: view(request)
+
+
+@benchmark("vendors.vendor_list")
+def bench_vendor_list(dataset, i):
+    request = _get(_org_user(dataset), "/vendors/")
+    return lambda: vendor_list(request)
+
+
+@benchmark("workflow.apply_transition")
+def bench_apply_transition(dataset, i):
+    user = _org_user(dataset)
+    assessment = Assessment.objects.get(pk=_pick(dataset.assessment_ids, i))
+    transition = Transition.objects.select_related("from_state", "to_state").get(pk=dataset.transition_id)
+    return lambda: apply_transition(user, assessment, transition)
@@ -0,0 +1,220 @@
+# benchmarks/datagen.py
+"""Deterministic synthetic portfolio for benchmarks.
+
+The same ``(scale, seed)`` always produces the same rows in the same order,
+so timings and query counts are comparable between runs. Everything is
+written with ``bulk_create`` in per-organization batches: no model signals
+fire and memory stays bounded at the ``full`` scale.
+"""
+
+import random
+from dataclasses import dataclass, field
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+
+from accounts.models import CustomUser, Membership, Organization
+from assessments.constants import AnswerChoices, AssessmentStatuses, QuestionCategories, ResponseTypes
+from assessments.models import Answer, Assessment, Certification, Question, Questionnaire, QuestionnaireQuestion
+from assessments.snapshots import compile_questionnaire
+from trust.models import VendorTrustProfile
+from vendors.models import ServiceType, Vendor, VendorOffering
+from workflow.models import State, Transition, Workflow, WorkflowObject
+
+BATCH_SIZE = 5000
+# Organizations generated (and flushed to the DB) per batch
+ORGS_PER_BATCH = 50
+# How many ids of each kind the dataset keeps for benchmark cases to sample
+SAMPLE_SIZE = 50
+
+
+@dataclass(frozen=True)
+class Scale:
+    organizations: int
+    vendors_per_org: int
+    offerings_per_vendor: int
+    assessed_share: float  # share of offerings with an assessment
+    questions: int  # per questionnaire; every assessment answers all of them
+
+    @property
+    def vendors(self):
+        return self.organizations * self.vendors_per_org
+
+    @property
+    def offerings(self):
+        return self.vendors * self.offerings_per_vendor
+
+    @property
+    def answers(self):
+        return int(self.offerings * self.assessed_share) * self.questions
+
+
+SCALES = {
+    "tiny": Scale(organizations=2, vendors_per_org=10, offerings_per_vendor=3, assessed_share=0.5, questions=10),
+    "small": Scale(organizations=20, vendors_per_org=100, offerings_per_vendor=3, assessed_share=1 / 3, questions=20),
+    # 1k orgs, 100k vendors, 300k offerings, 50k assessments, 1M answers
+    "full": Scale(organizations=1000, vendors_per_org=100, offerings_per_vendor=3, assessed_share=1 / 6, questions=20),
+}
+
+
+@dataclass
+class Dataset:
+    """Handles on the generated data that benchmark cases sample from."""
+
+    scale: Scale
+    seed: int
+    owner_id: int = None
+    organization_id: int = None
+    questionnaire_id: int = None
+    question_ids: list = field(default_factory=list)
+    vendor_ids: list = field(default_factory=list)
+    assessment_ids: list = field(default_factory=list)
+    transition_id: int = None
+    counts: dict = field(default_factory=dict)
+
+
+def _create_workflow():
+    workflow = Workflow.objects.create(name="Assessment Workflow", description="Benchmark workflow")
+    draft = State.objects.create(workflow=workflow, name="Draft", is_initial=True)
+    review = State.objects.create(workflow=workflow, name="Review")
+    submitted = State.objects.create(workflow=workflow, name="Submitted", is_final=True)
+    first = Transition.objects.create(workflow=workflow, from_state=draft, to_state=review, name="Submit for Review")
+    Transition.objects.create(workflow=workflow, from_state=review, to_state=submitted, name="Approve and Submit")
+    return workflow, draft, first
+
+
+def _create_questionnaire(rng, scale):
+    questionnaire = Questionnaire.objects.create(name="Benchmark Baseline")
+    questions = Question.objects.bulk_create(
+        [
+            Question(
+                questionnaire=questionnaire,
+                category=rng.choice(QuestionCategories.values),
+                response_type=rng.choice(ResponseTypes.values),
+                text=f"Benchmark control {i}",
+                weight=rng.randint(1, 5),
+                is_required=rng.random() < 0.3,
+            )
+            for i in range(scale.questions)
+        ]
+    )
+    QuestionnaireQuestion.objects.bulk_create(
+        [QuestionnaireQuestion(questionnaire=questionnaire, question=q, order=i) for i, q in enumerate(questions)]
+    )
+    return questionnaire, questions
+
+
+def generate(scale="small", seed=42):
+    """Populates the current database and returns a ``Dataset``."""
+    scale = SCALES[scale] if isinstance(scale, str) else scale
+    rng = random.Random(seed)
+    dataset = Dataset(scale=scale, seed=seed)
+
+    workflow, initial_state, transition = _create_workflow()
+    questionnaire, questions = _create_questionnaire(rng, scale)
+    snapshot = compile_questionnaire(questionnaire.id)  # bulk_create skips the recompile signals
+    assessment_type = ContentType.objects.get_for_model(Assessment)
+    password = make_password(None)
+
+    dataset.questionnaire_id = questionnaire.id
+    dataset.question_ids = [q.id for q in questions]
+    dataset.transition_id = transition.id
+    counts = dict.fromkeys(["organizations", "vendors", "offerings", "assessments", "answers"], 0)
+
+    for first_org in range(0, scale.organizations, ORGS_PER_BATCH):
+        org_numbers = range(first_org, min(first_org + ORGS_PER_BATCH, scale.organizations))
+        orgs = Organization.objects.bulk_create(
+            [Organization(name=f"Bench Org {n:05d}", domain=f"org{n:05d}.bench.test") for n in org_numbers]
+        )
+        owners = CustomUser.objects.bulk_create(
+            [CustomUser(email=f"owner@org{n:05d}.bench.test", first_name="Bench", password=password) for n in org_numbers]
+        )
+        Membership.objects.bulk_create(
+            [Membership(user=user, organization=org, role="owner") for user, org in zip(owners, orgs, strict=True)]
+        )
+
+        vendors = Vendor.objects.bulk_create(
+            [
+                Vendor(
+                    organization=org,
+                    name=f"Vendor {n:05d}-{v:04d}",
+                    description="Synthetic vendor" if rng.random() < 0.7 else "",
+                    website=f"https://v{n}-{v}.bench.test" if rng.random() < 0.6 else "",
+                )
+                for n, org in zip(org_numbers, orgs, strict=True)
+                for v in range(scale.vendors_per_org)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        VendorTrustProfile.objects.bulk_create(
+            [
+                VendorTrustProfile(
+                    vendor=vendor,
+                    has_cyber_insurance=rng.random() < 0.5,
+                    has_data_breach=rng.random() < 0.15,
+                    trust_score=rng.randint(0, 1000),
+                )
+                for vendor in vendors
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        Certification.objects.bulk_create(
+            [Certification(vendor=vendor, type="SOC2", is_valid=True) for vendor in vendors if rng.random() < 0.4],
+            batch_size=BATCH_SIZE,
+        )
+        offerings = VendorOffering.objects.bulk_create(
+            [
+                VendorOffering(vendor=vendor, name=f"Offering {o}", service_type=rng.choice(ServiceType.values))
+                for vendor in vendors
+                for o in range(scale.offerings_per_vendor)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+        org_by_vendor = {vendor.id: vendor.organization_id for vendor in vendors}
+        assessments = Assessment.objects.bulk_create(
+            [
+                Assessment(
+                    organization_id=org_by_vendor[offering.vendor_id],
+                    vendor_offering=offering,
+                    questionnaire=questionnaire,
+                    questionnaire_snapshot_id=snapshot.snapshot_id,
+                    status=rng.choice(AssessmentStatuses.values),
+                    workflow_state=initial_state.name,
+                )
+                for offering in offerings
+                if rng.random() < scale.assessed_share
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        WorkflowObject.objects.bulk_create(
+            [
+                WorkflowObject(content_type=assessment_type, object_id=a.id, workflow=workflow, current_state=initial_state)
+                for a in assessments
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        # Answers dominate the row count, so they are built and flushed a chunk of assessments at a time
+        per_chunk = max(BATCH_SIZE // max(len(questions), 1), 1)
+        for start in range(0, len(assessments), per_chunk):
+            answers = []
+            for assessment in assessments[start : start + per_chunk]:
+                for question in questions:
+                    choice = rng.choice(AnswerChoices.values)
+                    answers.append(Answer(assessment=assessment, question=question, response=choice, answer=choice))
+            Answer.objects.bulk_create(answers)
+            counts["answers"] += len(answers)
+
+        if dataset.owner_id is None:
+            dataset.owner_id = owners[0].id
+            dataset.organization_id = orgs[0].id
+            dataset.vendor_ids = [v.id for v in vendors if v.organization_id == orgs[0].id][:SAMPLE_SIZE]
+            dataset.assessment_ids = [a.id for a in assessments if a.organization_id == orgs[0].id][:SAMPLE_SIZE]
+
+        counts["organizations"] += len(orgs)
+        counts["vendors"] += len(vendors)
+        counts["offerings"] += len(offerings)
+        counts["assessments"] += len(assessments)
+
+    dataset.counts = counts
+    return dataset
@@ -0,0 +1,105 @@
+# benchmarks/runner.py
+"""Runs benchmark cases and diffs results against a JSON baseline."""
+
+import platform
+import time
+from dataclasses import dataclass
+from statistics import median
+
+import django
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from benchmarks.cases import CASES
+
+# Wall-time changes below this many milliseconds are treated as noise
+NOISE_FLOOR_MS = 1.0
+ERROR_MAX_CHARS = 120
+
+
+class _Rollback(Exception):
+    pass
+
+
+def measure(prepare, dataset, iterations):
+    """Times ``iterations`` runs of one case; returns its result dict (or ``{"error": ...}``)."""
+    timings, queries = [], []
+    for i in range(iterations):
+        try:
+            with transaction.atomic():
+                run = prepare(dataset, i)
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    run()
+                    elapsed = time.perf_counter() - started
+                raise _Rollback
+        except _Rollback:
+            pass
+        except Exception as exc:
+            return {"error": f"{type(exc).__name__}: {str(exc)[:ERROR_MAX_CHARS]}"}
+        timings.append(elapsed * 1000)
+        queries.append(len(captured))
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "wall_ms": {
+            "median": round(median(timings), 3),
+            "min": round(timings[0], 3),
+            "max": round(timings[-1], 3),
+        },
+        "queries": max(queries),
+    }
+
+
+def run_benchmarks(dataset, iterations=20, only=None):
+    """Runs every registered case (or those named in ``only``) and returns a results document."""
+    cases = {name: prepare for name, prepare in CASES.items() if not only or name in only}
+    return {
+        "meta": {
+            "created": timezone.now().isoformat(timespec="seconds"),
+            "scale": dataset.scale.__dict__,
+            "seed": dataset.seed,
+            "counts": dataset.counts,
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+        },
+        "cases": {name: measure(prepare, dataset, iterations) for name, prepare in cases.items()},
+    }
+
+
+@dataclass
+class Diff:
+    case: str
+    metric: str
+    baseline: object
+    current: object
+    regression: bool
+
+    def __str__(self):
+        flag = "REGRESSION" if self.regression else "ok"
+        return f"{flag:>10}  {self.case:<40} {self.metric:<12} {self.baseline} -> {self.current}"
+
+
+def compare(baseline, current, tolerance=0.25):
+    """Per-case diffs of query counts and median wall time.
+
+    Any extra query is a regression; wall time regresses when it grows by
+    more than ``tolerance`` (a fraction) and by more than the noise floor.
+    """
+    diffs = []
+    for name, result in current["cases"].items():
+        before = baseline.get("cases", {}).get(name)
+        if before is None:
+            continue
+        if "error" in result or "error" in before:
+            diffs.append(Diff(name, "error", before.get("error", "-"), result.get("error", "-"), "error" in result and "error" not in before))
+            continue
+
+        diffs.append(Diff(name, "queries", before["queries"], result["queries"], result["queries"] > before["queries"]))
+        old_ms, new_ms = before["wall_ms"]["median"], result["wall_ms"]["median"]
+        slower = new_ms > old_ms * (1 + tolerance) and new_ms - old_ms > NOISE_FLOOR_MS
+        diffs.append(Diff(name, "median_ms", old_ms, new_ms, slower))
+    return diffs
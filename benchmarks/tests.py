@@ -0,0 +1,41 @@
+# benchmarks/tests.py
+
+from django.db import transaction
+from django.test import TestCase
+
+from benchmarks.cases import CASES
+from benchmarks.datagen import generate
+from benchmarks.runner import compare, measure
+from vendors.models import Vendor
+from workflow.models import WorkflowLog
+
+
+class BenchmarkSuiteTests(TestCase):
+    def test_generator_is_deterministic(self):
+        with transaction.atomic():
+            first = generate("tiny", seed=7)
+            snapshot = list(Vendor.objects.order_by("id").values_list("name", "description", "website"))
+            transaction.set_rollback(True)
+
+        second = generate("tiny", seed=7)
+
+        self.assertEqual(first.counts, second.counts)
+        self.assertEqual(first.counts["vendors"], 20)
+        self.assertEqual(snapshot, list(Vendor.objects.order_by("id").values_list("name", "description", "website")))
+
+    def test_cases_run_and_roll_back(self):
+        dataset = generate("tiny", seed=7)
+
+        result = measure(CASES["workflow.apply_transition"], dataset, iterations=2)
+
+        self.assertNotIn("error", result)
+        self.assertGreater(result["queries"], 0)
+        self.assertFalse(WorkflowLog.objects.exists())
+
+    def test_compare_flags_extra_queries_and_slowdowns(self):
+        baseline = {"cases": {"case": {"queries": 5, "wall_ms": {"median": 10.0}}}}
+        current = {"cases": {"case": {"queries": 6, "wall_ms": {"median": 20.0}}}}
+
+        diffs = {diff.metric: diff.regression for diff in compare(baseline, current)}
+
+        self.assertEqual(diffs, {"queries": True, "median_ms": True})
@@ -40,3 +40,30 @@ class MFARequired(BusinessRuleError):
 
 class IPAccessDenied(BusinessRuleError):
     """Login IP not allowed by org access rules."""
+
+
+class StaleAnswerVersion(BusinessRuleError):
+    """Answer was saved by someone else since the client loaded it.
+
+    ``current`` holds the stored answer so the client can show what changed.
+    """
+
+    def __init__(self, current):
+        super().__init__("This answer was changed by someone else.")
+        self.current = current
+
+
+class UploadOffsetMismatch(BusinessRuleError):
+    """Upload chunk does not start at the server-side offset.
+
+    ``offset`` is where the client should resume.
+    """
+
+    def __init__(self, offset):
+        super().__init__(f"Upload is at offset {offset}.")
+        self.offset = offset
+
+
+class TransitionConflict(BusinessRuleError):
+    """The object is no longer in the transition's source state (another
+    reviewer moved it first); nothing was written."""
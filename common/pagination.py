@@ -0,0 +1,87 @@
+# common/pagination.py
+"""Keyset (cursor) pagination on ``(created_at, id)``, newest first.
+
+Unlike ``?page=N`` with OFFSET, a page is located with an indexed range
+condition, so page 1000 costs the same as page 1 and rows inserted while
+paging do not shift or duplicate results. Cursors are opaque tokens that
+encode the boundary row's ``(created_at, id)``.
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 50
+
+
+@dataclass
+class KeysetPage:
+    items: list = field(default_factory=list)
+    next_cursor: str = None  # older rows
+    previous_cursor: str = None  # newer rows
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+def encode_cursor(obj):
+    raw = json.dumps([obj.created_at.isoformat(), obj.pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """``(created_at, id)`` from a token; ``None`` for missing or malformed tokens."""
+    if not token:
+        return None
+    try:
+        created_at, pk = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        created_at = parse_datetime(created_at)
+        if created_at is None:
+            return None
+        return created_at, int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_page(queryset, after=None, before=None, page_size=DEFAULT_PAGE_SIZE):
+    """One page of ``queryset`` ordered ``-created_at, -id``.
+
+    ``after`` continues with older rows, ``before`` goes back to newer ones;
+    both are cursor tokens from a previous page. Reads ``page_size + 1`` rows
+    to learn whether another page exists, without counting.
+    """
+    after, before = decode_cursor(after), decode_cursor(before)
+
+    if before is not None:
+        created_at, pk = before
+        rows = list(
+            queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)).order_by(
+                "created_at", "pk"
+            )[: page_size + 1]
+        )
+        more_newer = len(rows) > page_size
+        items = list(reversed(rows[:page_size]))
+        return KeysetPage(
+            items=items,
+            next_cursor=encode_cursor(items[-1]) if items else None,
+            previous_cursor=encode_cursor(items[0]) if items and more_newer else None,
+        )
+
+    if after is not None:
+        created_at, pk = after
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    rows = list(queryset.order_by("-created_at", "-pk")[: page_size + 1])
+    items = rows[:page_size]
+    return KeysetPage(
+        items=items,
+        next_cursor=encode_cursor(items[-1]) if len(rows) > page_size else None,
+        previous_cursor=encode_cursor(items[0]) if items and after is not None else None,
+    )
@@ -0,0 +1,11 @@
+# common/signals.py
+"""Helpers shared by the apps' signal handlers."""
+
+
+def deleted_directly(origin, model):
+    """True when the delete started at ``model`` rather than cascading from a parent.
+
+    ``origin`` is the ``post_delete`` argument: the instance or queryset
+    whose ``delete()`` started the collection.
+    """
+    return getattr(origin, "model", type(origin)) is model
@@ -2,12 +2,21 @@
 
 from django import template
 
+from trust.engine import trust_band
+
 register = template.Library()
 
 
 # ==============================================
 # 🔖 TRUST BADGE CSS CLASS FILTER
 # ==============================================
+TRUST_BADGE_CLASSES = {
+    "high": "badge bg-success text-white",
+    "medium": "badge bg-warning text-dark",
+    "low": "badge bg-danger text-white",
+}
+
+
 @register.filter
 def trust_badge_class(score):
     """Returns badge color class based on trust score. | Usage in template: "<span class="{{ score|trust_badge_class }}">{{ score }}</span>" ."""
@@ -16,9 +25,4 @@ def trust_badge_class(score):
     except (ValueError, TypeError):
         return "badge bg-secondary text-white"  # fallback
 
-    if score >= 800:
-        return "badge bg-success text-white"
-    elif score >= 500:
-        return "badge bg-warning text-dark"
-    else:
-        return "badge bg-danger text-white"
+    return TRUST_BADGE_CLASSES[trust_band(score)]
@@ -47,6 +47,7 @@ INSTALLED_APPS = [
     "vendors",
     "assessments",
     "workflow",
+    "trust",
     "common",
 ]
 
@@ -175,6 +176,26 @@ SESSION_SAVE_EVERY_REQUEST = True  # sliding sessions: refresh expiry on activit
 # Optional: cached DB sessions in prod (configure CACHES first)
 # SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
 
+# --- Trust score recompute queue (see trust/queue.py) ---------------------------------
+TRUST_RECOMPUTE_DEBOUNCE_SECONDS = 5  # quiet period before a dirty vendor is rescored
+TRUST_RECOMPUTE_MAX_DELAY_SECONDS = 60  # upper bound on debouncing under a steady stream of edits
+TRUST_RECOMPUTE_CHUNK_SIZE = 200  # vendors claimed per worker transaction
+TRUST_RECOMPUTE_EAGER = False  # True: rescore inline instead of queueing (no worker needed)
+
+# --- Evidence uploads (resumable chunked API, see services/uploads.py) ----------------
+EVIDENCE_UPLOAD_MAX_SIZE = 2 * 1024**3  # 2 GiB per file
+EVIDENCE_UPLOAD_MAX_CHUNK_SIZE = 16 * 1024**2  # 16 MiB per chunk request
+
+# --- Questionnaire snapshots (see assessments/snapshots.py) ----------------------------
+# Versions are cached forever; only the "current version" pointer expires. Without a
+# shared CACHES backend, other processes see a recompiled version after this many seconds.
+QUESTIONNAIRE_SNAPSHOT_POINTER_TIMEOUT = 300
+
+# --- Workflow graphs (see workflow/graph.py) ------------------------------------------
+# Edits invalidate other processes' compiled graphs through the cache, which needs a
+# shared CACHES backend; without one, other processes recompile after this many seconds.
+WORKFLOW_GRAPH_TIMEOUT = 300
+
 # --- Security (tighten in prod) -------------------------------------------------------
 # SESSION_COOKIE_SECURE = True
 # CSRF_COOKIE_SECURE = True
@@ -1,11 +1,14 @@
 # dashboard/urls.py
 from django.urls import path
 
-from .views import DashboardStatsView, UserDashboardView
+from .views import DashboardStatsView, DashboardTrustTrendView, SearchView, TrustSimulationView, UserDashboardView
 
 app_name = "dashboard"
 
 urlpatterns = [
     path("", UserDashboardView.as_view(), name="dashboard"),
     path("data/", DashboardStatsView.as_view(), name="dashboard_data"),
+    path("trend/", DashboardTrustTrendView.as_view(), name="trust_trend"),
+    path("simulate/", TrustSimulationView.as_view(), name="trust_simulate"),
+    path("search/", SearchView.as_view(), name="search"),
 ]
@@ -1,13 +1,27 @@
 # dashboard/views.py
 
+import json
+from datetime import timedelta
+
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Avg
+from django.db.models import Avg, Count, Q
 from django.http import JsonResponse
+from django.utils import timezone
 from django.views.generic import TemplateView, View
 
 from assessments.models import Assessment
+from common.errors import BusinessRuleError
+from services.permissions import OrganizationRequiredMixin
+from services.search import DEFAULT_LIMIT, search
+from trust.engine import DEFAULT_WEIGHTS, HIGH_TRUST_THRESHOLD, MEDIUM_TRUST_THRESHOLD
+from trust.history import TREND_MAX_DAYS, organization_score_trend
+from trust.models import RollupGranularity
+from trust.simulator import simulate_weight_sets
 from vendors.models import Vendor
 
+# Default window for the trust trend chart
+TREND_DEFAULT_DAYS = 3 * 365
+
 
 # Main dashboard page view – loads the HTML template
 class UserDashboardView(LoginRequiredMixin, TemplateView):
@@ -26,8 +40,18 @@ class DashboardStatsView(LoginRequiredMixin, View):
         total_vendors = vendors.count()
         total_offerings = sum(v.offerings.count() for v in vendors)
 
-        assessments = Assessment.objects.filter(status="completed", organization=org)
-        total_assessments = assessments.count()
+        # Completed count and per-stage counts (mirrored workflow state) in one grouped query
+        stages = (
+            Assessment.objects.filter(organization=org)
+            .values_list("workflow_state")
+            .annotate(n=Count("pk"), completed=Count("pk", filter=Q(status="completed")))
+            .order_by()
+        )
+        total_assessments, by_stage = 0, {}
+        for stage, n, completed in stages:
+            total_assessments += completed
+            if stage:
+                by_stage[stage] = n
 
         avg_score = vendors.aggregate(avg=Avg("trust_profile__trust_score"))["avg"] or 0
         high_risk = vendors.filter(trust_profile__trust_score__lt=400).count()
@@ -39,5 +63,94 @@ class DashboardStatsView(LoginRequiredMixin, View):
                 "total_assessments": total_assessments,
                 "average_score": round(avg_score, 1),
                 "high_risk_vendors": high_risk,
+                "assessments_by_stage": by_stage,
             }
         )
+
+
+# JSON API view for the org-wide trust score trend chart (precomputed rollups)
+class DashboardTrustTrendView(OrganizationRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        try:
+            days = int(request.GET.get("days", TREND_DEFAULT_DAYS))
+        except ValueError:
+            return JsonResponse({"error": "days must be an integer."}, status=400)
+
+        granularity = request.GET.get("granularity") or None
+        if granularity and granularity not in RollupGranularity.values:
+            return JsonResponse({"error": "Unknown granularity."}, status=400)
+
+        start = timezone.localdate() - timedelta(days=min(max(days, 1), TREND_MAX_DAYS))
+        points = organization_score_trend(self.organization, start, granularity=granularity)
+        return JsonResponse({"points": points})
+
+
+# JSON API for the what-if trust simulator: POST {"weight_sets": {"label": {"weight": points}}}
+class TrustSimulationView(OrganizationRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(
+            {
+                "default_weights": DEFAULT_WEIGHTS,
+                "bands": {"medium": MEDIUM_TRUST_THRESHOLD, "high": HIGH_TRUST_THRESHOLD},
+            }
+        )
+
+    def post(self, request, *args, **kwargs):
+        try:
+            payload = json.loads(request.body or b"{}")
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON body."}, status=400)
+
+        weight_sets = payload.get("weight_sets") if isinstance(payload, dict) else None
+        if not isinstance(weight_sets, dict) or not weight_sets:
+            return JsonResponse({"error": "weight_sets must be a non-empty object."}, status=400)
+
+        try:
+            result = simulate_weight_sets(weight_sets, organization=self.organization)
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        return JsonResponse(result)
+
+
+def _search_hit(hit):
+    obj = hit.object
+    row = {"kind": hit.kind, "id": obj.pk, "rank": round(hit.rank, 4)}
+    if hit.kind == "question":
+        row.update(text=obj.text, questionnaire=obj.questionnaire.name)
+    elif hit.kind == "answer":
+        offering = obj.assessment.vendor_offering
+        row.update(
+            assessment_id=obj.assessment_id,
+            question=obj.question.text,
+            response=obj.response,
+            supporting_text=obj.supporting_text or "",
+            comments=obj.comments,
+            vendor=offering.vendor.name,
+            offering=offering.name,
+        )
+    elif hit.kind == "vendor":
+        row.update(name=obj.name, description=obj.description)
+    else:
+        row.update(name=obj.name, vendor=obj.vendor.name, description=obj.description)
+    return row
+
+
+# JSON API for full-text search: ?q=encryption at rest&kind=answer&response=no
+class SearchView(OrganizationRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            return JsonResponse({"error": "limit must be an integer."}, status=400)
+
+        try:
+            hits = search(
+                self.organization,
+                request.GET.get("q", ""),
+                kinds=request.GET.getlist("kind") or None,
+                limit=limit,
+                response=request.GET.get("response") or None,
+            )
+        except BusinessRuleError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        return JsonResponse({"results": [_search_hit(hit) for hit in hits]})
@@ -0,0 +1,96 @@
+# scripts/run_benchmarks.py
+"""Benchmark the hot paths against a synthetic portfolio.
+
+Builds a throwaway test database, fills it with the deterministic dataset
+from ``benchmarks.datagen``, times every case in ``benchmarks.cases`` and
+compares the results with the JSON baseline.
+
+    python scripts/run_benchmarks.py --scale small            # compare against baseline
+    python scripts/run_benchmarks.py --scale small --save     # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Fix path issues so we can import project settings
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from benchmarks.cases import CASES
+from benchmarks.datagen import SCALES, generate
+from benchmarks.runner import compare, run_benchmarks
+
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "benchmarks", "baseline.json")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="Only run this case (repeatable)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON path")
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed wall-time growth (fraction)")
+    return parser.parse_args()
+
+
+def run():
+    args = parse_args()
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        print(f"🏗️  Generating '{args.scale}' dataset (seed {args.seed})...")
+        dataset = generate(args.scale, args.seed)
+        print("   " + ", ".join(f"{count} {name}" for name, count in dataset.counts.items()))
+
+        print(f"⏱️  Running {args.iterations} iterations per case...")
+        results = run_benchmarks(dataset, iterations=args.iterations, only=args.case)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    for name, result in results["cases"].items():
+        if "error" in result:
+            print(f"   ❌ {name}: {result['error']}")
+        else:
+            print(f"   {name:<40} {result['wall_ms']['median']:>9.2f} ms  {result['queries']:>5} queries")
+
+    if args.save:
+        with open(args.baseline, "w") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+        print(f"✅ Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("⚠️ No baseline yet; rerun with --save to record one.")
+        return 0
+
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    if baseline["meta"]["scale"] != results["meta"]["scale"] or baseline["meta"]["database"] != results["meta"]["database"]:
+        print("⚠️ Baseline was recorded at a different scale or on another database; timings are not comparable.")
+
+    diffs = compare(baseline, results, tolerance=args.tolerance)
+    for diff in diffs:
+        print(diff)
+    regressions = [diff for diff in diffs if diff.regression]
+    print(f"{'❌' if regressions else '✅'} {len(regressions)} regressions.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -1,16 +1,31 @@
 # services/assessments.py
 
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
-from assessments.constants import AnswerChoices
-from assessments.models import Answer, Assessment, Questionnaire
+from assessments.constants import AnswerChoices, AssessmentStatuses
+from assessments.models import Answer, Assessment, EvidenceBlob, Question, Questionnaire
+from assessments.scoring import score_assessment
+from assessments.snapshots import current_snapshot, load_snapshot, snapshot_for_assessment
+from common.errors import BusinessRuleError, StaleAnswerVersion
+from services.evidence_store import adjust_ref_counts, store_file
 from services.workflow import (
     apply_transition,
     ensure_workflow_for_object,
     get_available_transitions,
 )
 from vendors.models import VendorOffering
-from workflow.models import Workflow, WorkflowObject
+from workflow.models import State, Workflow, WorkflowLog, WorkflowObject
+
+# Answer columns rewritten when a submission hits an existing answer
+ANSWER_UPSERT_FIELDS = ["response", "supporting_text", "comments", "updated_at"]
+ANSWER_BATCH_SIZE = 500
+# Question ids per INSERT … SELECT when cloning answers
+CLONE_BATCH_SIZE = 900
 
 
 # ===========================
@@ -23,18 +38,70 @@ def get_assessments_for_org(org):
     )
 
 
+def assessment_list_queryset(org, filters=None):
+    """Assessments for the list page, with ``answered``/``total_questions`` in the same query.
+
+    ``filters`` is the cleaned data of ``AssessmentFilterForm``. Totals come
+    from the pinned snapshot, falling back to the live question count for
+    assessments not pinned yet.
+    """
+    filters = filters or {}
+    answered = (
+        Answer.objects.filter(assessment=OuterRef("pk"))
+        .order_by()
+        .values("assessment")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    live_total = (
+        Question.objects.filter(questionnaire=OuterRef("questionnaire"), is_archived=False)
+        .order_by()
+        .values("questionnaire")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+
+    queryset = (
+        Assessment.objects.filter(organization=org)
+        .select_related("questionnaire", "vendor_offering__vendor")
+        .annotate(
+            answered=Coalesce(Subquery(answered, output_field=IntegerField()), Value(0)),
+            total_questions=Coalesce(
+                "questionnaire_snapshot__question_count",
+                Subquery(live_total, output_field=IntegerField()),
+                Value(0),
+            ),
+        )
+    )
+    if filters.get("status"):
+        queryset = queryset.filter(status=filters["status"])
+    if filters.get("risk_level"):
+        queryset = queryset.filter(risk_level=filters["risk_level"])
+    if filters.get("vendor"):
+        queryset = queryset.filter(vendor_offering__vendor=filters["vendor"])
+    if filters.get("questionnaire"):
+        queryset = queryset.filter(questionnaire=filters["questionnaire"])
+    if filters.get("workflow_state"):
+        queryset = queryset.filter(workflow_state=filters["workflow_state"])
+    return queryset
+
+
 # ===========================
 # ✅ Create new assessment
 # ===========================
-def create_assessment_from_request(request):
-    """Handles form submission for assessment creation.
+def create_assessment_from_request(request, organization):
+    """Handles form submission for assessment creation in ``organization``
+    (the view's ``OrganizationRequiredMixin`` organization).
     Expects POST data: questionnaire, vendor_offering.
+    Optional ``clone_from``: an assessment id, or ``previous`` for the
+    offering's latest assessment, whose answers seed the new one.
     """
     try:
         info_value = request.POST.get("information_value")
         risk_level = request.POST.get("risk_level")
         questionnaire_id = request.POST.get("questionnaire")
         offering_id = request.POST.get("vendor_offering")
+        clone_from = request.POST.get("clone_from")
 
         if not questionnaire_id or not offering_id:
             return False, None, "Both Questionnaire and Offering are required."
@@ -43,34 +110,45 @@ def create_assessment_from_request(request):
         offering = get_object_or_404(
             VendorOffering,
             id=offering_id,
-            vendor__organization=request.user.organization,
+            vendor__organization=organization,
         )
 
-        # Prevent duplicates (optional)
+        source = None
+        if clone_from:
+            source = find_clone_source(organization, offering, clone_from)
+
+        # Prevent duplicates (optional); a new cycle only collides with an open draft
         existing = Assessment.objects.filter(
-            organization=request.user.organization,
+            organization=organization,
             questionnaire=questionnaire,
             vendor_offering=offering,
-        ).first()
+        )
+        if source is not None:
+            existing = existing.filter(status=AssessmentStatuses.DRAFT).exclude(pk=source.pk)
+        existing = existing.first()
         if existing:
             return True, existing, "Assessment already exists. Redirecting..."
 
-        assessment = Assessment.objects.create(
-            questionnaire=questionnaire,
-            vendor_offering=offering,
-            organization=request.user.organization,
-            information_value=info_value,
-            risk_level=risk_level,
-        )
+        with transaction.atomic():
+            snapshot = current_snapshot(questionnaire.id)
+            assessment = Assessment.objects.create(
+                questionnaire=questionnaire,
+                questionnaire_snapshot_id=snapshot.snapshot_id,
+                vendor_offering=offering,
+                organization=organization,
+                information_value=info_value,
+                risk_level=risk_level,
+            )
 
-        # Automatically create workflow object
-        workflow = Workflow.objects.get(name="Assessment Workflow")
-        initial_state = workflow.states.filter(is_initial=True).first()
-        WorkflowObject.objects.create(
-            content_object=assessment,
-            workflow=workflow,
-            current_state=initial_state,
-        )
+            # Attach the workflow (initial state, mirrored onto the row)
+            try:
+                ensure_workflow_for_object(assessment)
+            except (Workflow.DoesNotExist, State.DoesNotExist):
+                pass  # no workflow configured yet; `manage.py attach_workflows` backfills
+
+            if source is not None:
+                clone_answers(source, assessment, snapshot)
+                score_assessment(assessment, snapshot)
 
         return True, assessment, None
 
@@ -78,21 +156,119 @@ def create_assessment_from_request(request):
         return False, None, f"Error creating assessment: {str(e)}"
 
 
+# ===========================
+# ✅ Clone answers from a previous cycle
+# ===========================
+def find_clone_source(organization, offering, clone_from):
+    """The assessment to copy answers from: an explicit id, or ``"previous"``
+    for the offering's most recent one. Raises ``BusinessRuleError`` if none.
+    """
+    candidates = Assessment.objects.filter(organization=organization, vendor_offering=offering)
+    if clone_from == "previous":
+        source = candidates.order_by("-created_at", "-id").first()
+    else:
+        try:
+            source = candidates.filter(pk=int(clone_from)).first()
+        except (TypeError, ValueError):
+            source = None
+    if source is None:
+        raise BusinessRuleError("No previous assessment of this offering to start from.")
+    return source
+
+
+def clone_answers(source, target, snapshot):
+    """Copies ``source``'s answers into the empty ``target`` with INSERT … SELECT.
+
+    Only questions present in ``snapshot`` (the target's pinned version) are
+    copied. Evidence is shared by reference: the file name and blob FK are
+    copied and the blobs' ``ref_count`` is raised, no bytes move. Question
+    ids are sent in batches to stay under SQLite's parameter limit, so a
+    typical questionnaire is one statement. Returns the number of answers copied.
+    """
+    question_ids = snapshot.question_ids
+    if not question_ids:
+        return 0
+
+    quote = connection.ops.quote_name
+    table = quote(Answer._meta.db_table)
+    copied = ["question_id", "response", "supporting_text", "answer", "comments", "evidence", "evidence_blob_id", "risk_impact"]
+    columns = ", ".join(quote(c) for c in copied)
+    now = timezone.now()
+
+    inserted = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(question_ids), CLONE_BATCH_SIZE):
+            batch = question_ids[start : start + CLONE_BATCH_SIZE]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(
+                f"INSERT INTO {table} ({quote('assessment_id')}, {quote('created_at')}, {quote('updated_at')}, "
+                f"{quote('version')}, {columns}) "
+                f"SELECT %s, %s, %s, 1, {columns} FROM {table} "
+                f"WHERE {quote('assessment_id')} = %s AND {quote('question_id')} IN ({placeholders})",
+                [target.pk, now, now, source.pk, *batch],
+            )
+            inserted += cursor.rowcount
+
+        # One UPDATE raises every shared blob by the number of new references to it
+        new_refs = (
+            Answer.objects.filter(assessment=target, evidence_blob=OuterRef("pk"))
+            .order_by()
+            .values("evidence_blob")
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        shared = Answer.objects.filter(assessment=target, evidence_blob__isnull=False).values("evidence_blob")
+        EvidenceBlob.objects.filter(pk__in=shared).update(
+            ref_count=F("ref_count") + Subquery(new_refs, output_field=IntegerField()),
+            updated_at=now,
+        )
+    return inserted
+
+
 # ===========================
 # ✅ Get context for detail view
 # ===========================
 def get_assessment_detail(assessment_id, org):
-    """Fetch assessment, questions, and answers for detail view.
-    Now includes recommended risk level and information value.
+    """Everything the detail page shows, in a fixed number of queries.
+
+    One query each for the assessment (with offering, vendor and
+    questionnaire), its workflow object (with workflow and current state),
+    the transition log and the answers, however many rows there are, plus
+    the questionnaire snapshot on a cold cache. Answers follow the snapshot's
+    question order. This is a pure read: assessments without a workflow object show as unattached
+    instead of being attached on the fly (see ``attach_missing_workflows``).
     """
-    assessment = get_object_or_404(Assessment, id=assessment_id, organization=org)
-    answers = Answer.objects.filter(assessment=assessment).select_related("question")
-    questions = assessment.questionnaire.questions.all()
+    assessment = get_object_or_404(
+        Assessment.objects.select_related("vendor_offering__vendor", "questionnaire"),
+        id=assessment_id,
+        organization=org,
+    )
+    workflow_object = (
+        WorkflowObject.objects.filter(content_type=ContentType.objects.get_for_model(Assessment), object_id=assessment.pk)
+        .select_related("workflow", "current_state")
+        .prefetch_related(
+            Prefetch(
+                "logs",
+                queryset=WorkflowLog.objects.select_related("user", "from_state", "to_state").order_by("timestamp", "id"),
+            )
+        )
+        .first()
+    )
+    answers = list(Answer.objects.filter(assessment=assessment).select_related("question"))
+    if answers:
+        # Same order as the form: the pinned version's sequence (not pinned here, so unpinned ones use the current version)
+        if assessment.questionnaire_snapshot_id:
+            snapshot = load_snapshot(assessment.questionnaire_snapshot_id)
+        else:
+            snapshot = current_snapshot(assessment.questionnaire_id)
+        position = {question_id: i for i, question_id in enumerate(snapshot.question_ids)}
+        answers.sort(key=lambda answer: (position.get(answer.question_id, len(position)), answer.question_id))
 
     return {
         "assessment": assessment,
+        "workflow_object": workflow_object,
+        "workflow_logs": list(workflow_object.logs.all()) if workflow_object else [],
         "answers": answers,
-        "questions": questions,
         "recommended_risk": assessment.recommended_risk_level,  # ⬅️ from model
         "info_value": assessment.information_value,  # ⬅️ from model
     }
@@ -108,10 +284,10 @@ def submit_assessment_for_review(user, pk):
         assessment = Assessment.objects.get(pk=pk)
 
         # Ensure workflow exists
-        ensure_workflow_for_object(assessment)
+        wf_obj = ensure_workflow_for_object(assessment)
 
-        # Check transitions
-        transitions = get_available_transitions(user, assessment)
+        # Check transitions (compiled graph: no queries)
+        transitions = get_available_transitions(user, assessment, wf_obj=wf_obj)
         transition = next(
             (t for t in transitions if t.to_state.name.lower() == "review"),
             None,
@@ -120,7 +296,7 @@ def submit_assessment_for_review(user, pk):
         if not transition:
             return False, "No valid transition to 'Review' available."
 
-        apply_transition(user, assessment, transition, comment="Submitted for review.")
+        apply_transition(user, assessment, transition, comment="Submitted for review.", wf_obj=wf_obj)
         return True, "Assessment submitted for review."
     except Assessment.DoesNotExist:
         return False, "Assessment not found."
@@ -131,48 +307,138 @@ def submit_assessment_for_review(user, pk):
 # ===========================
 # ✅ Submit answers (POST)
 # ===========================
-def handle_answer_submission(user, assessment_id, post_data, files=None):
+def handle_answer_submission(organization, assessment_id, post_data, files=None):
+    """Saves every answered question of ``organization``'s assessment in one transaction.
+
+    Answers are upserted in bulk on the ``(assessment, question)`` key, so
+    the query count does not grow with the questionnaire. Evidence is only
+    written for questions that uploaded a file; existing evidence on other
+    answers is left untouched. Uploaded files go through the blob store, so
+    content already on disk is linked rather than written again. The
+    assessment's recommended score and risk level are refreshed on the way out.
+    """
     try:
-        assessment = Assessment.objects.get(
-            id=assessment_id, organization=user.organization
+        assessment = Assessment.objects.select_related("vendor_offering").get(
+            id=assessment_id, organization=organization
         )
-        questionnaire = assessment.questionnaire
-        questions = questionnaire.questions.filter(is_archived=False)
+        snapshot = snapshot_for_assessment(assessment)
+        answered = [q for q in snapshot.question_ids if post_data.get(f"q_{q}_response")]
+        # A pinned version outlives its deleted questions; skip those instead of failing the FK
+        existing = set(Question.objects.filter(pk__in=answered).values_list("pk", flat=True)) if answered else set()
 
-        for question in questions:
-            prefix = f"q_{question.id}"
+        answers, answers_with_evidence = [], []
+        for question_id in answered:
+            if question_id not in existing:
+                continue
+            prefix = f"q_{question_id}"
             response = post_data.get(f"{prefix}_response")
-            supporting_text = post_data.get(f"{prefix}_supporting_text", "")
-            comments = post_data.get(f"{prefix}_comments", "")
+
+            answer = Answer(
+                assessment=assessment,
+                question_id=question_id,
+                response=response,
+                supporting_text=post_data.get(f"{prefix}_supporting_text", ""),
+                comments=post_data.get(f"{prefix}_comments", ""),
+            )
             evidence = files.get(f"{prefix}_evidence") if files else None
+            if evidence:
+                blob = store_file(evidence)
+                answer.evidence = blob.storage_name
+                answer.evidence_blob = blob
+                answers_with_evidence.append(answer)
+            else:
+                answers.append(answer)
 
-            if response:
-                Answer.objects.update_or_create(
+        with transaction.atomic():
+            _upsert_answers(answers, ANSWER_UPSERT_FIELDS)
+            if answers_with_evidence:
+                replaced = Answer.objects.filter(
                     assessment=assessment,
-                    question=question,
-                    defaults={
-                        "response": response,
-                        "supporting_text": supporting_text,
-                        "comments": comments,
-                        "evidence": evidence,
-                    },
-                )
+                    question_id__in=[answer.question_id for answer in answers_with_evidence],
+                    evidence_blob__isnull=False,
+                ).values_list("evidence_blob_id", flat=True)
+                deltas = {}
+                # store_file already took the new references
+                for blob_id in replaced:
+                    deltas[blob_id] = deltas.get(blob_id, 0) - 1
+                _upsert_answers(answers_with_evidence, ANSWER_UPSERT_FIELDS + ["evidence", "evidence_blob"])
+                adjust_ref_counts(deltas)
+            # Invalidate versions held by open autosave editors
+            saved = [answer.question_id for answer in answers + answers_with_evidence]
+            if saved:
+                Answer.objects.filter(assessment=assessment, question_id__in=saved).update(version=F("version") + 1)
+            score_assessment(assessment, snapshot)
         return True, "Answers submitted successfully."
     except Exception as e:
         return False, str(e)
 
 
+def _upsert_answers(answers, update_fields):
+    if answers:
+        Answer.objects.bulk_create(
+            answers,
+            batch_size=ANSWER_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["assessment", "question"],
+            update_fields=update_fields,
+        )
+
+
+# ===========================
+# ✅ Autosave a single answer
+# ===========================
+def autosave_answer(organization, assessment_id, question_id, data, expected_version):
+    """Saves one answer if it is still at ``expected_version`` (0 = not answered yet).
+
+    ``data`` holds ``response`` and optionally ``supporting_text``/``comments``.
+    Returns the saved ``Answer``; raises ``StaleAnswerVersion`` when another
+    editor saved first and ``BusinessRuleError`` for invalid input.
+    """
+    response = data.get("response")
+    if response not in AnswerChoices.values:
+        raise BusinessRuleError("Choose a response before saving.")
+
+    assessment = get_object_or_404(Assessment, id=assessment_id, organization=organization)
+    if question_id not in snapshot_for_assessment(assessment).by_id:
+        raise BusinessRuleError("Question is not part of this assessment.")
+
+    fields = {
+        "response": response,
+        "supporting_text": data.get("supporting_text", ""),
+        "comments": data.get("comments", ""),
+    }
+    # Compare-and-swap on the version column: only one concurrent editor can win
+    updated = Answer.objects.filter(
+        assessment=assessment, question_id=question_id, version=expected_version
+    ).update(version=F("version") + 1, updated_at=timezone.now(), **fields)
+
+    if not updated and expected_version == 0:
+        try:
+            with transaction.atomic():
+                return Answer.objects.create(assessment=assessment, question_id=question_id, version=1, **fields)
+        except IntegrityError:
+            pass  # Someone answered it first; report the conflict below
+
+    answer = Answer.objects.filter(assessment=assessment, question_id=question_id).first()
+    if not updated:
+        raise StaleAnswerVersion(answer)
+    return answer
+
+
 # ===========================
 # ✅ Build context for Q&A form
 # ===========================
 def get_questionnaire_context(assessment_id, organization):
-    assessment = Assessment.objects.get(id=assessment_id, organization=organization)
-    questionnaire = assessment.questionnaire
-    questions = questionnaire.questions.filter(is_archived=False)
+    assessment = Assessment.objects.select_related("questionnaire").get(id=assessment_id, organization=organization)
+    snapshot = snapshot_for_assessment(assessment)
+
+    # Prefill saved answers (and their versions, for autosave)
+    saved = {answer.question_id: answer for answer in assessment.answers.all()}
 
     context = {
         "assessment": assessment,
-        "questions": questions,
+        "snapshot": snapshot,
+        "question_rows": [(question, saved.get(question.id)) for question in snapshot.questions],
         "answer_choices": AnswerChoices.choices,
     }
     return context
@@ -0,0 +1,222 @@
+# services/evidence_store.py
+"""Content-addressable evidence storage.
+
+Evidence bytes are stored once per distinct content under
+``evidence/blobs/<aa>/<sha256><ext>`` as an ``EvidenceBlob``. Answers and
+Certifications point their file field at the blob's name and hold an FK to
+it, so the same SOC 2 report linked from every offering and every annual
+cycle occupies disk (and backups) once. ``ref_count`` moves whenever a
+reference is attached, replaced or deleted; ``collect_garbage`` removes
+blobs nobody references any more.
+"""
+
+import hashlib
+import os
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from assessments.models import Answer, Certification, EvidenceBlob
+
+BLOB_PREFIX = "evidence/blobs"
+HASH_BLOCK_SIZE = 1024 * 1024
+# Unreferenced blobs younger than this are kept (an upload may be about to link them)
+DEFAULT_GC_GRACE = timedelta(hours=24)
+
+
+# ===========================
+# ✅ Helpers
+# ===========================
+def blob_name(sha256, filename=""):
+    ext = os.path.splitext(filename)[1].lower()[:16]
+    return f"{BLOB_PREFIX}/{sha256[:2]}/{sha256}{ext}"
+
+
+def hash_file(file):
+    """``(sha256, size)`` of a Django ``File``/``UploadedFile``, read in chunks."""
+    digest, size = hashlib.sha256(), 0
+    file.seek(0)
+    for chunk in file.chunks(HASH_BLOCK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    file.seek(0)
+    return digest.hexdigest(), size
+
+
+def hash_path(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while block := fh.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def adjust_ref_counts(deltas):
+    """Applies ``{sha256: delta}``; one UPDATE per distinct delta."""
+    by_delta = defaultdict(list)
+    for sha256, delta in deltas.items():
+        if sha256 and delta:
+            by_delta[delta].append(sha256)
+    now = timezone.now()
+    for delta, shas in by_delta.items():
+        EvidenceBlob.objects.filter(pk__in=shas).update(ref_count=F("ref_count") + delta, updated_at=now)
+
+
+def _take_reference(sha256):
+    """Adds one reference and refreshes ``updated_at`` in a single UPDATE; False if there is no such blob."""
+    return bool(EvidenceBlob.objects.filter(pk=sha256).update(ref_count=F("ref_count") + 1, updated_at=timezone.now()))
+
+
+def _register_blob(sha256, size, name, ref_count=0):
+    """Creates the blob row, or returns the existing one and drops our duplicate file."""
+    try:
+        with transaction.atomic():
+            return EvidenceBlob.objects.create(sha256=sha256, size=size, storage_name=name, ref_count=ref_count)
+    except IntegrityError:
+        if ref_count:
+            _take_reference(sha256)
+        blob = EvidenceBlob.objects.get(pk=sha256)
+        if blob.storage_name != name:
+            default_storage.delete(name)
+        return blob
+
+
+# ===========================
+# ✅ Storing
+# ===========================
+def store_file(file, filename=None):
+    """Stores an uploaded file once per distinct content and returns its ``EvidenceBlob``.
+
+    The returned blob already counts one reference for the caller: it is
+    taken in the same UPDATE that finds an existing blob (which also resets
+    its GC grace period), so ``collect_garbage`` cannot delete the blob
+    between this call and the caller linking it.
+    """
+    sha256, size = hash_file(file)
+    if _take_reference(sha256):
+        return EvidenceBlob.objects.get(pk=sha256)
+
+    name = blob_name(sha256, filename or file.name or "")
+    if not default_storage.exists(name):
+        name = default_storage.save(name, file)
+    return _register_blob(sha256, size, name, ref_count=1)
+
+
+def adopt_stored_file(name, sha256=None):
+    """Moves an already-stored file into the blob store without copying it.
+
+    Used for finished chunked uploads and for legacy per-upload evidence.
+    If the content is already stored, the file at ``name`` is deleted and
+    the existing row is locked until the caller's transaction ends, so
+    ``collect_garbage`` waits for the reference ``attach_blob`` adds.
+    """
+    path = default_storage.path(name)
+    sha256 = sha256 or hash_path(path)
+    blob = EvidenceBlob.objects.select_for_update().filter(pk=sha256).first()
+    if blob is not None:
+        if blob.storage_name != name:
+            default_storage.delete(name)
+        return blob
+
+    size = os.path.getsize(path)
+    target = blob_name(sha256, name)
+    if target != name:
+        target_path = default_storage.path(target)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        os.replace(path, target_path)  # a rename on the same volume, not a copy
+    return _register_blob(sha256, size, target)
+
+
+# ===========================
+# ✅ References
+# ===========================
+def _reference_fields(target):
+    if isinstance(target, Answer):
+        return "evidence", "evidence_blob"
+    if isinstance(target, Certification):
+        return "artifact", "artifact_blob"
+    raise TypeError(f"{type(target).__name__} does not hold evidence.")
+
+
+def attach_blob(target, blob):
+    """Points an Answer's evidence or a Certification's artifact at ``blob``, moving the ref counts."""
+    file_field, blob_field = _reference_fields(target)
+    model = type(target)
+
+    with transaction.atomic():
+        previous = model.objects.select_for_update().filter(pk=target.pk).values_list(f"{blob_field}_id", flat=True).first()
+        if previous != blob.pk:
+            changes = {file_field: blob.storage_name, blob_field: blob, "updated_at": timezone.now()}
+            if model is Answer:
+                changes["version"] = F("version") + 1
+            model.objects.filter(pk=target.pk).update(**changes)
+            adjust_ref_counts({blob.pk: 1, previous: -1})
+
+    target.refresh_from_db()
+    return target
+
+
+# ===========================
+# ✅ Maintenance
+# ===========================
+def reconcile_ref_counts():
+    """Recomputes every ``ref_count`` from the FK columns (one UPDATE)."""
+
+    def refs(model, field):
+        counts = (
+            model.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+    return EvidenceBlob.objects.update(ref_count=refs(Answer, "evidence_blob") + refs(Certification, "artifact_blob"))
+
+
+def adopt_legacy_evidence():
+    """Moves evidence stored before the blob store into it, deduplicating as it goes.
+
+    Returns the number of references converted.
+    """
+    converted = 0
+    for model, file_field, blob_field in ((Answer, "evidence", "evidence_blob"), (Certification, "artifact", "artifact_blob")):
+        legacy = model.objects.filter(**{f"{blob_field}__isnull": True}).exclude(**{file_field: ""}).exclude(**{f"{file_field}__isnull": True})
+        for obj in legacy.iterator(chunk_size=500):
+            name = getattr(obj, file_field).name
+            if not default_storage.exists(name):
+                continue
+            with transaction.atomic():
+                attach_blob(obj, adopt_stored_file(name))
+            converted += 1
+    return converted
+
+
+def collect_garbage(grace=DEFAULT_GC_GRACE, dry_run=False):
+    """Deletes blobs with no references that have been idle for ``grace``.
+
+    Returns ``(blobs, bytes)`` removed (or that would be, with ``dry_run``).
+    """
+    cutoff = timezone.now() - grace
+    candidates = EvidenceBlob.objects.filter(ref_count__lte=0, updated_at__lt=cutoff)
+    removed, freed = 0, 0
+    for sha256 in candidates.values_list("sha256", flat=True).iterator():
+        with transaction.atomic():
+            # Re-checked under the lock: a blob referenced since the scan has a count again and a fresh timestamp
+            blob = EvidenceBlob.objects.select_for_update().filter(pk=sha256, ref_count__lte=0, updated_at__lt=cutoff).first()
+            # The FK check guards against a drifted count; PROTECT would refuse the delete anyway
+            if blob is None or blob.answers.exists() or blob.certifications.exists():
+                continue
+            removed, freed = removed + 1, freed + blob.size
+            if dry_run:
+                continue
+            name = blob.storage_name
+            blob.delete()
+            transaction.on_commit(lambda name=name: default_storage.delete(name))
+    return removed, freed
@@ -0,0 +1,184 @@
+# services/exports.py
+"""Streaming exports of assessments with their answers (one row per answer).
+
+Rows are driven by answers, so assessments without any answer yet do not
+appear in an export.
+
+Rows are read with ``.iterator(chunk_size=...)``, which uses a server-side
+cursor on PostgreSQL, and encoded into bounded byte chunks as they arrive,
+so memory stays flat however many rows match. CSV and JSON Lines stream
+end to end and can be gzip-compressed on the fly; XLSX needs ``openpyxl``
+and is spooled to a temporary file first (the format is a zip archive).
+"""
+
+import csv
+import io
+import tempfile
+import zlib
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from assessments.constants import AssessmentStatuses
+from assessments.models import Answer
+from common.errors import BusinessRuleError
+from services.workflow import workflow_state_names
+
+# column name -> ORM path from Answer
+EXPORT_COLUMNS = {
+    "assessment_id": "assessment_id",
+    "assessment_created": "assessment__created_at",
+    "status": "assessment__status",
+    "information_value": "assessment__information_value",
+    "risk_level": "assessment__risk_level",
+    "recommended_score": "assessment__recommended_score",
+    "recommended_risk_level": "assessment__recommended_risk_level",
+    "vendor": "assessment__vendor_offering__vendor__name",
+    "offering": "assessment__vendor_offering__name",
+    "questionnaire": "assessment__questionnaire__name",
+    "question_id": "question_id",
+    "question": "question__text",
+    "category": "question__category",
+    "weight": "question__weight",
+    "response": "response",
+    "supporting_text": "supporting_text",
+    "comments": "comments",
+    "risk_impact": "risk_impact",
+    "evidence": "evidence",
+    "answered_at": "updated_at",
+}
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+EXPORT_FORMATS = tuple(EXPORT_CONTENT_TYPES)
+EXPORT_CHUNK_SIZE = 2000  # rows per cursor fetch
+FLUSH_BYTES = 64 * 1024  # encoded bytes buffered before yielding
+
+
+# ===========================
+# ✅ Options
+# ===========================
+def parse_export_options(columns=None, date_from=None, date_to=None, statuses=None, fmt="csv"):
+    """Validates raw (query string / CLI) options; raises ``BusinessRuleError``."""
+    if fmt not in EXPORT_FORMATS:
+        raise BusinessRuleError(f"Unknown format '{fmt}'. Choose one of: {', '.join(EXPORT_FORMATS)}.")
+
+    if isinstance(columns, str):
+        columns = [c.strip() for c in columns.split(",") if c.strip()]
+    columns = list(columns or EXPORT_COLUMNS)
+    unknown = [c for c in columns if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise BusinessRuleError(f"Unknown columns: {', '.join(unknown)}.")
+
+    dates = []
+    for label, raw in (("from", date_from), ("to", date_to)):
+        value = parse_date(raw) if isinstance(raw, str) and raw else raw or None
+        if raw and value is None:
+            raise BusinessRuleError(f"Invalid '{label}' date; use YYYY-MM-DD.")
+        dates.append(value)
+
+    # ``status`` holds a legacy choice or the lowercased workflow state name (see services.workflow)
+    statuses = [s.lower() for s in (statuses or []) if s]
+    known = {*AssessmentStatuses.values, *(name.lower() for name in workflow_state_names(include_initial=True))}
+    bad = [s for s in statuses if s not in known]
+    if bad:
+        raise BusinessRuleError(f"Unknown status: {', '.join(bad)}.")
+
+    return {"columns": columns, "date_from": dates[0], "date_to": dates[1], "statuses": statuses, "fmt": fmt}
+
+
+def export_rows(organization, columns, date_from=None, date_to=None, statuses=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yields value tuples for ``columns``, ordered by assessment then question."""
+    answers = Answer.objects.filter(assessment__organization=organization)
+    # Day bounds in the current timezone keep the created_at index usable
+    if date_from:
+        answers = answers.filter(assessment__created_at__gte=timezone.make_aware(datetime.combine(date_from, time.min)))
+    if date_to:
+        answers = answers.filter(assessment__created_at__lte=timezone.make_aware(datetime.combine(date_to, time.max)))
+    if statuses:
+        answers = answers.filter(assessment__status__in=statuses)
+
+    paths = [EXPORT_COLUMNS[c] for c in columns]
+    yield from answers.order_by("assessment_id", "question_id").values_list(*paths).iterator(chunk_size=chunk_size)
+
+
+# ===========================
+# ✅ Encoders
+# ===========================
+def _csv_lines(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _jsonl_lines(columns, rows):
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    parts, size = [], 0
+    for row in rows:
+        line = encoder.encode(dict(zip(columns, row, strict=True))) + "\n"
+        parts.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(parts).encode()
+            parts, size = [], 0
+    yield "".join(parts).encode()
+
+
+def _xlsx_file(columns, rows):
+    try:
+        from openpyxl import Workbook
+    except ImportError as e:
+        raise BusinessRuleError("XLSX export needs the 'openpyxl' package; use CSV or JSON Lines instead.") from e
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Answers")
+    sheet.append(columns)
+    for row in rows:
+        # Excel cannot store timezone-aware datetimes
+        sheet.append([value.replace(tzinfo=None) if isinstance(value, datetime) else value for value in row])
+    spool = tempfile.TemporaryFile()
+    workbook.save(spool)
+    spool.seek(0)
+    return spool
+
+
+def _file_chunks(spool):
+    with spool:
+        while block := spool.read(FLUSH_BYTES):
+            yield block
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(organization, columns, fmt="csv", gzip=False, **filters):
+    """Byte chunks of the encoded export; pass to ``StreamingHttpResponse`` or write to a file."""
+    rows = export_rows(organization, columns, **filters)
+    if fmt == "xlsx":
+        chunks = _file_chunks(_xlsx_file(columns, rows))
+    elif fmt == "jsonl":
+        chunks = _jsonl_lines(columns, rows)
+    else:
+        chunks = _csv_lines(columns, rows)
+    return _gzipped(chunks) if gzip else chunks
+
+
+def export_filename(fmt, gzip=False):
+    stamp = timezone.localdate().isoformat()
+    return f"assessments-{stamp}.{fmt}" + (".gz" if gzip else "")
@@ -0,0 +1,211 @@
+# services/questionnaire_import.py
+"""Bulk import of questionnaires (SIG, CAIQ, NIST, ...) from CSV, JSON or XLSX.
+
+Every row is validated first; bad rows are reported with their row number
+and skipped, the rest are written with one ``bulk_create`` per table (in
+batches) and the questionnaire snapshot is compiled once at the end.
+
+Columns / keys: ``text`` (required), ``category``, ``response_type``,
+``help_text``, ``weight``, ``is_required``, ``tags`` and ``order``.
+Categories and response types accept either the stored value or the label
+(``access_control`` or ``Access Control``), case-insensitively.
+"""
+
+import csv
+import io
+import json
+import os
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Max
+
+from assessments.constants import QuestionCategories, ResponseTypes
+from assessments.models import Question, Questionnaire, QuestionnaireQuestion
+from assessments.snapshots import compile_questionnaire
+from common.errors import BusinessRuleError
+
+IMPORT_FORMATS = ("csv", "json", "xlsx")
+IMPORT_BATCH_SIZE = 1000
+TRUE_VALUES = {"1", "true", "yes", "y", "x"}
+
+
+@dataclass
+class RowError:
+    row: int
+    message: str
+
+    def __str__(self):
+        return f"Row {self.row}: {self.message}"
+
+
+@dataclass
+class ImportResult:
+    questionnaire: Questionnaire = None
+    created: int = 0
+    errors: list = field(default_factory=list)
+
+
+def _lookup(choices):
+    """``{lowercased value or label: value}`` for a TextChoices class."""
+    table = {}
+    for value, label in choices.choices:
+        table[str(value).lower()] = value
+        table[str(label).lower()] = value
+    return table
+
+
+CATEGORY_LOOKUP = _lookup(QuestionCategories)
+RESPONSE_TYPE_LOOKUP = _lookup(ResponseTypes)
+
+
+# ===========================
+# ✅ Readers
+# ===========================
+def detect_format(filename):
+    ext = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if ext not in IMPORT_FORMATS:
+        raise BusinessRuleError(f"Unsupported file type '.{ext}'. Use CSV, JSON or XLSX.")
+    return ext
+
+
+def read_rows(file, fmt):
+    """Yields ``(row_number, {column: value})``; row numbers match what a user sees in the file."""
+    if fmt == "csv":
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        for number, row in enumerate(csv.DictReader(text), start=2):  # row 1 is the header
+            yield number, {(k or "").strip().lower(): v for k, v in row.items()}
+    elif fmt == "json":
+        try:
+            data = json.load(file)
+        except ValueError as e:
+            raise BusinessRuleError(f"Invalid JSON: {e}") from e
+        items = data.get("questions", []) if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            raise BusinessRuleError('JSON must be a list of questions or {"questions": [...]}.')
+        for number, item in enumerate(items, start=1):
+            yield number, {str(k).lower(): v for k, v in item.items()} if isinstance(item, dict) else {}
+    elif fmt == "xlsx":
+        try:
+            from openpyxl import load_workbook
+        except ImportError as e:
+            raise BusinessRuleError("XLSX import needs the 'openpyxl' package; use CSV or JSON instead.") from e
+        sheet = load_workbook(file, read_only=True, data_only=True).active
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(h or "").strip().lower() for h in next(rows, [])]
+        for number, values in enumerate(rows, start=2):
+            if any(v not in (None, "") for v in values):
+                yield number, dict(zip(header, values, strict=False))
+    else:
+        raise BusinessRuleError(f"Unsupported format '{fmt}'.")
+
+
+# ===========================
+# ✅ Validation
+# ===========================
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+def clean_row(raw):
+    """``(Question kwargs, order or None)`` for a raw row; raises ``ValueError`` with the reason."""
+    text = _text(raw.get("text") or raw.get("question"))
+    if not text:
+        raise ValueError("'text' is required.")
+
+    category_raw = _text(raw.get("category"))
+    category = CATEGORY_LOOKUP.get(category_raw.lower()) if category_raw else QuestionCategories.DATA_PROTECTION
+    if category is None:
+        raise ValueError(f"unknown category '{category_raw}'.")
+
+    type_raw = _text(raw.get("response_type"))
+    response_type = RESPONSE_TYPE_LOOKUP.get(type_raw.lower()) if type_raw else ResponseTypes.CHOICE
+    if response_type is None:
+        raise ValueError(f"unknown response type '{type_raw}'.")
+
+    try:
+        weight = int(float(_text(raw.get("weight")) or 1))
+        order = raw.get("order")
+        order = int(float(order)) if _text(order) else None
+    except ValueError:
+        raise ValueError("'weight' and 'order' must be numbers.") from None
+    if weight < 0 or (order is not None and order < 0):
+        raise ValueError("'weight' and 'order' cannot be negative.")
+
+    help_text = _text(raw.get("help_text"))
+    if len(help_text) > Question._meta.get_field("help_text").max_length:
+        raise ValueError("'help_text' is longer than 255 characters.")
+
+    tags = raw.get("tags") or []
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.replace(";", ",").split(",") if t.strip()]
+
+    required = raw.get("is_required")
+    is_required = required if isinstance(required, bool) else _text(required).lower() in TRUE_VALUES
+
+    return {
+        "text": text,
+        "category": category,
+        "response_type": response_type,
+        "help_text": help_text,
+        "weight": weight,
+        "is_required": is_required,
+        "tags": list(tags),
+    }, order
+
+
+# ===========================
+# ✅ Import
+# ===========================
+def import_questionnaire(file, fmt, questionnaire=None, name=None, description=""):
+    """Imports questions into ``questionnaire`` (or a new one called ``name``).
+
+    Rows already in the questionnaire (same text) and invalid rows are
+    reported in ``result.errors`` without stopping the import. Questions are
+    appended after the existing order unless rows give an explicit ``order``.
+    """
+    if questionnaire is None and not name:
+        raise BusinessRuleError("Give the new questionnaire a name or choose one to import into.")
+
+    result = ImportResult()
+    existing = set()
+    next_order = 0
+    if questionnaire is not None:
+        existing = set(Question.objects.filter(questionnaire=questionnaire).values_list("text", flat=True))
+        current_max = QuestionnaireQuestion.objects.filter(questionnaire=questionnaire).aggregate(m=Max("order"))["m"]
+        next_order = 0 if current_max is None else current_max + 1
+
+    accepted = []
+    for number, raw in read_rows(file, fmt):
+        try:
+            fields, order = clean_row(raw)
+        except ValueError as e:
+            result.errors.append(RowError(number, str(e)))
+            continue
+        if fields["text"] in existing:
+            result.errors.append(RowError(number, "question is already in this questionnaire."))
+            continue
+        existing.add(fields["text"])
+        accepted.append((fields, next_order if order is None else order))
+        next_order = max(next_order, accepted[-1][1]) + 1
+
+    with transaction.atomic():
+        if questionnaire is None:
+            questionnaire = Questionnaire.objects.create(name=name, description=description)
+        questions = Question.objects.bulk_create(
+            [Question(questionnaire=questionnaire, **fields) for fields, _ in accepted],
+            batch_size=IMPORT_BATCH_SIZE,
+        )
+        QuestionnaireQuestion.objects.bulk_create(
+            [
+                QuestionnaireQuestion(questionnaire=questionnaire, question=question, order=order)
+                for question, (_, order) in zip(questions, accepted, strict=True)
+            ],
+            batch_size=IMPORT_BATCH_SIZE,
+        )
+        # bulk_create skips the recompile signals
+        compile_questionnaire(questionnaire.pk)
+
+    result.questionnaire = questionnaire
+    result.created = len(questions)
+    return result
@@ -0,0 +1,263 @@
+# services/search.py
+"""Full-text search over questions, answers and vendor descriptions.
+
+The index lives in the database, next to the rows it describes:
+
+* PostgreSQL: a ``search_vector tsvector`` column on each searched table,
+  kept current by a ``BEFORE INSERT OR UPDATE`` trigger and served by a GIN
+  index, so a query is an index scan plus ``ts_rank`` over the hits.
+* SQLite: one FTS5 table per searched table (``<table>_fts``, rowid = the
+  row's id) kept in sync by triggers and ranked with ``bm25``.
+
+The columns are deliberately not model fields: triggers fill them for every
+write path (``save``, ``bulk_create``, raw ``INSERT ... SELECT``), and the ORM
+never has to read them. ``install_search_schema`` creates everything
+idempotently; it runs from the ``rebuild_search_index`` command (needed on
+SQLite after a table rebuild drops its triggers). Migration
+``assessments/0014`` installs a frozen copy of the same DDL.
+
+Results are scoped to an organization: answers through their assessment,
+offerings through their vendor. Questions are shared templates and are
+searched globally; an answer also matches when its question's text does.
+"""
+
+import re
+from dataclasses import dataclass
+
+from django.db import connection as default_connection
+
+from assessments.models import Answer, Question
+from common.errors import BusinessRuleError
+from vendors.models import Vendor, VendorOffering
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+QUESTION_MATCH_WEIGHT = 0.5  # an answer found through its question ranks below a direct hit
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    kind: str
+    table: str
+    columns: tuple  # (column, weight) with weight A (highest) to D
+
+
+SEARCH_SOURCES = {
+    "question": SearchSource("question", Question._meta.db_table, (("text", "A"), ("help_text", "B"))),
+    "answer": SearchSource("answer", Answer._meta.db_table, (("supporting_text", "A"), ("comments", "B"))),
+    "vendor": SearchSource("vendor", Vendor._meta.db_table, (("name", "A"), ("description", "B"))),
+    "offering": SearchSource("offering", VendorOffering._meta.db_table, (("name", "A"), ("description", "B"))),
+}
+SEARCH_KINDS = tuple(SEARCH_SOURCES)
+
+# FTS5 has no A-D labels; bm25 takes one weight per column instead
+BM25_WEIGHTS = {"A": 10.0, "B": 4.0, "C": 2.0, "D": 1.0}
+
+
+@dataclass
+class SearchHit:
+    kind: str
+    object: object
+    rank: float
+
+
+# ===========================
+# ✅ Schema
+# ===========================
+def _pg_vector_expr(source, row):
+    parts = [
+        f"setweight(to_tsvector('pg_catalog.english', coalesce({row}.{column}, '')), '{weight}')"
+        for column, weight in source.columns
+    ]
+    return " || ".join(parts)
+
+
+def _install_postgresql(cursor, source):
+    table, columns = source.table, ", ".join(c for c, _ in source.columns)
+    cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    cursor.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {_pg_vector_expr(source, "NEW")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    cursor.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector ON {table}")
+    cursor.execute(
+        f"CREATE TRIGGER {table}_search_vector BEFORE INSERT OR UPDATE OF {columns} ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()"
+    )
+    cursor.execute(f"UPDATE {table} SET search_vector = {_pg_vector_expr(source, table)} WHERE search_vector IS NULL")
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} USING GIN (search_vector)")
+
+
+def _install_sqlite(cursor, source):
+    table, fts = source.table, f"{source.table}_fts"
+    columns = [c for c, _ in source.columns]
+    names = ", ".join(columns)
+    new_values = ", ".join(f"coalesce(new.{c}, '')" for c in columns)
+    old_values = ", ".join(f"coalesce({c}, '')" for c in columns)
+    cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, tokenize='porter unicode61')")
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF {names} ON {table} BEGIN "
+        f"DELETE FROM {fts} WHERE rowid = old.id; "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN "
+        f"DELETE FROM {fts} WHERE rowid = old.id; END"
+    )
+    # Rows written while the triggers were missing (fresh install, table rebuilt by a migration)
+    cursor.execute(f"DELETE FROM {fts}")
+    cursor.execute(f"INSERT INTO {fts}(rowid, {names}) SELECT id, {old_values} FROM {table}")
+
+
+def install_search_schema(connection=None):
+    """Creates (or repairs) the search columns, triggers and indexes; safe to re-run.
+
+    Returns ``False`` on backends without full-text support, where ``search``
+    raises ``BusinessRuleError``.
+    """
+    connection = connection or default_connection
+    installers = {"postgresql": _install_postgresql, "sqlite": _install_sqlite}
+    install = installers.get(connection.vendor)
+    if install is None:
+        return False
+    with connection.cursor() as cursor:
+        for source in SEARCH_SOURCES.values():
+            install(cursor, source)
+    return True
+
+
+# ===========================
+# ✅ Matching
+# ===========================
+def _sqlite_match(query):
+    """FTS5 query string: every word must appear (quoted, so user input cannot inject syntax)."""
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"' for word in words)
+
+
+def _matches(source):
+    """SQL yielding ``(id, r)`` for rows of ``source`` matching the query parameter, best first."""
+    if default_connection.vendor == "postgresql":
+        return (
+            f"SELECT t.id, ts_rank(t.search_vector, q.query) AS r "
+            f"FROM {source.table} t, websearch_to_tsquery('pg_catalog.english', %s) AS q(query) "
+            f"WHERE t.search_vector @@ q.query"
+        )
+    fts = f"{source.table}_fts"
+    weights = ", ".join(str(BM25_WEIGHTS[w]) for _, w in source.columns)
+    # bm25 is lower-is-better; negate so every backend ranks descending
+    return f"SELECT rowid AS id, -bm25({fts}, {weights}) AS r FROM {fts} WHERE {fts} MATCH %s"
+
+
+def _ranked_ids(kind, organization, query, limit, response=None):
+    """``[(id, rank)]`` for one kind, best first."""
+    sources = SEARCH_SOURCES
+    params = []
+    if kind == "question":
+        sql = (
+            f"WITH m AS ({_matches(sources['question'])}) "
+            f"SELECT m.id, m.r FROM m JOIN {sources['question'].table} t ON t.id = m.id "
+            f"WHERE NOT t.is_archived ORDER BY m.r DESC LIMIT %s"
+        )
+        params = [query, limit]
+    elif kind == "answer":
+        answer_table = sources["answer"].table
+        assessment_table = Answer._meta.get_field("assessment").related_model._meta.db_table
+        # Direct hits start from the answer index. A question hit fans out to
+        # every answer of that question across all tenants, so that branch
+        # starts from the organization's assessments instead and only then
+        # joins the (small) set of matching questions
+        sql = (
+            f"WITH am AS ({_matches(sources['answer'])}), qm AS ({_matches(sources['question'])}), "
+            f"hits AS ("
+            f"SELECT a.id, a.response, am.r FROM am JOIN {answer_table} a ON a.id = am.id "
+            f"JOIN {assessment_table} s ON s.id = a.assessment_id WHERE s.organization_id = %s "
+            f"UNION ALL "
+            f"SELECT a.id, a.response, {QUESTION_MATCH_WEIGHT} * qm.r "
+            f"FROM {assessment_table} s JOIN {answer_table} a ON a.assessment_id = s.id "
+            f"JOIN qm ON qm.id = a.question_id WHERE s.organization_id = %s"
+            f") "
+            f"SELECT h.id, SUM(h.r) AS rank FROM hits h"
+        )
+        params = [query, query, organization.pk, organization.pk]
+        if response:
+            sql += " WHERE h.response = %s"
+            params.append(response)
+        sql += " GROUP BY h.id ORDER BY rank DESC LIMIT %s"
+        params.append(limit)
+    elif kind == "vendor":
+        sql = (
+            f"WITH m AS ({_matches(sources['vendor'])}) "
+            f"SELECT m.id, m.r FROM m JOIN {sources['vendor'].table} v ON v.id = m.id "
+            f"WHERE v.organization_id = %s ORDER BY m.r DESC LIMIT %s"
+        )
+        params = [query, organization.pk, limit]
+    else:
+        sql = (
+            f"WITH m AS ({_matches(sources['offering'])}) "
+            f"SELECT m.id, m.r FROM m JOIN {sources['offering'].table} o ON o.id = m.id "
+            f"JOIN {sources['vendor'].table} v ON v.id = o.vendor_id "
+            f"WHERE v.organization_id = %s ORDER BY m.r DESC LIMIT %s"
+        )
+        params = [query, organization.pk, limit]
+
+    with default_connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+# ===========================
+# ✅ Search
+# ===========================
+HYDRATE = {
+    "question": lambda ids: Question.objects.filter(pk__in=ids).select_related("questionnaire"),
+    "answer": lambda ids: Answer.objects.filter(pk__in=ids).select_related(
+        "question", "assessment__vendor_offering__vendor"
+    ),
+    "vendor": lambda ids: Vendor.objects.filter(pk__in=ids),
+    "offering": lambda ids: VendorOffering.objects.filter(pk__in=ids).select_related("vendor"),
+}
+
+
+def search(organization, query, kinds=None, limit=DEFAULT_LIMIT, response=None):
+    """Ranked ``SearchHit`` list for ``query`` across ``kinds`` (all by default).
+
+    ``response`` narrows answers to one choice, e.g. ``"no"`` to find vendors
+    that answered no to an encryption question. Each kind is ranked in the
+    database and only the top ``limit`` ids are loaded, so the cost tracks the
+    number of matches rather than the size of the tables.
+    """
+    if default_connection.vendor not in ("postgresql", "sqlite"):
+        raise BusinessRuleError("Full-text search is not available on this database.")
+    kinds = list(kinds or SEARCH_KINDS)
+    unknown = [k for k in kinds if k not in SEARCH_SOURCES]
+    if unknown:
+        raise BusinessRuleError(f"Unknown search kinds: {', '.join(unknown)}.")
+
+    query = (query or "").strip()
+    if default_connection.vendor == "sqlite":
+        query = _sqlite_match(query)
+    if not query:
+        return []
+    limit = max(1, min(int(limit), MAX_LIMIT))
+
+    hits = []
+    for kind in kinds:
+        ranked = _ranked_ids(kind, organization, query, limit, response=response)
+        if not ranked:
+            continue
+        objects = HYDRATE[kind]([pk for pk, _ in ranked]).in_bulk()
+        hits.extend(SearchHit(kind, objects[pk], float(rank)) for pk, rank in ranked if pk in objects)
+
+    hits.sort(key=lambda hit: hit.rank, reverse=True)
+    return hits[:limit]
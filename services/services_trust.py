@@ -1,7 +1,28 @@
-from trust.engine import calculate_vti
+# services/services_trust.py
+
+from trust.batch import recompute_trust_scores
+from trust.incremental import refresh_trust_components
+from trust.parallel import DEFAULT_CHUNK_SIZE, DEFAULT_RETRIES, recompute_all_organizations
 
 
 def update_vendor_trust_score(vendor):
-    if hasattr(vendor, "trust_profile"):
-        vendor.trust_profile.trust_score = calculate_vti(vendor)
-        vendor.trust_profile.save()
+    """Recalculates a single vendor's trust components and total."""
+    return refresh_trust_components(vendor)
+
+
+def recompute_org_trust_scores(organization=None, vendor_ids=None):
+    """Batch-rescores every vendor in an org (or the given vendor ids).
+
+    Returns the number of vendors scored.
+    """
+    if organization is None and vendor_ids is None:
+        raise ValueError("Pass an organization or a list of vendor ids.")
+    return len(recompute_trust_scores(organization=organization, vendor_ids=vendor_ids))
+
+
+def recompute_all_trust_scores(workers=None, chunk_size=DEFAULT_CHUNK_SIZE, retries=DEFAULT_RETRIES):
+    """Nightly full refresh: every organization, chunked across a process pool.
+
+    Returns a ``trust.parallel.RecomputeSummary``.
+    """
+    return recompute_all_organizations(workers=workers, chunk_size=chunk_size, retries=retries)
@@ -1,6 +1,6 @@
 # services/services_vendors.py
 
-from trust.engine import calculate_vendor_trust_score
+from trust.incremental import refresh_trust_components
 
 # ─────────────────────────────────────────────
 # 🔹 Vendor + Trust Logic
@@ -8,7 +8,9 @@ from trust.engine import calculate_vendor_trust_score
 
 
 def create_vendor_with_trust(user, vendor_form, trust_form):
-    """Creates a vendor trust profile, assigns org and creator, calculates initial trust score."""
+    """Creates a vendor trust profile, assigns org and creator.
+    Trust components are scored by trust.signals as the rows are saved.
+    """
     vendor = vendor_form.save(commit=False)
     vendor.organization = user.organization
     vendor.created_by = user
@@ -16,29 +18,19 @@ def create_vendor_with_trust(user, vendor_form, trust_form):
 
     trust = trust_form.save(commit=False)
     trust.vendor = vendor
-
-    try:
-        score = calculate_vendor_trust_score(vendor)
-        trust.trust_score = score if score is not None else 0
-    except Exception as e:
-        trust.trust_score = 0  # Or log error
-
     trust.save()
     return vendor
 
 
 def update_vendor_with_trust(vendor, vendor_form, trust_form):
-    """Updates vendor and trust profile and recalculates trust score."""
+    """Updates vendor and trust profile.
+    Only the components touched by the edit are rescored (see trust.signals).
+    """
     vendor = vendor_form.save(commit=False)
     vendor.save()
 
     trust = trust_form.save(commit=False)
     trust.vendor = vendor  # Ensure link is consistent
-
-    # Always recalculate score
-    score = calculate_vendor_trust_score(vendor)
-    trust.trust_score = score if score is not None else 0
-
     trust.save()
     return vendor
 
@@ -80,13 +72,5 @@ def archive_vendor_offering(offering):
 
 
 def update_vendor_score(vendor):
-    """Recalculates and updates the vendor's trust score based on all assessed offerings."""
-    trust_profile = vendor.trust_profile
-    new_score = calculate_vendor_trust_score(vendor)
-
-    if new_score is not None:
-        trust_profile.trust_score = new_score
-    else:
-        trust_profile.trust_score = None  # No score if no valid assessments
-
-    trust_profile.save()
+    """Recalculates every trust component for the vendor and stores the new total."""
+    return refresh_trust_components(vendor)
@@ -0,0 +1,178 @@
+# services/uploads.py
+"""Resumable chunked evidence uploads.
+
+Flow: ``start_upload`` reserves the final storage name (from the target's
+``upload_to``) and creates an empty file there; ``write_chunk`` streams each
+chunk into that file at the server-side offset; ``finalize_upload`` checks
+size and SHA-256, then moves the file into the evidence blob store
+(``services.evidence_store``) by rename, or drops it if that content is
+already stored, so the bytes are never copied.
+
+Chunks are written in place, which needs a storage with local paths
+(``FileSystemStorage``).
+"""
+
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+
+from assessments.constants import UploadStatus, evidence_upload_path
+from assessments.models import Answer, Assessment, Certification, EvidenceUpload, Question
+from assessments.snapshots import snapshot_for_assessment
+from common.errors import BusinessRuleError, UploadOffsetMismatch
+from services.evidence_store import adopt_stored_file, attach_blob, hash_path
+from trust.utils import cert_artifact_path
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+def _max_upload_size():
+    return getattr(settings, "EVIDENCE_UPLOAD_MAX_SIZE", 2 * 1024**3)
+
+
+def _max_chunk_size():
+    return getattr(settings, "EVIDENCE_UPLOAD_MAX_CHUNK_SIZE", 16 * 1024**2)
+
+
+def _local_path(name):
+    try:
+        return default_storage.path(name)
+    except NotImplementedError:
+        raise BusinessRuleError("Chunked uploads need a storage backend with local paths.")
+
+
+# ===========================
+# ✅ Start
+# ===========================
+def start_upload(organization, user, filename, size, sha256="", assessment_id=None, question_id=None, certification_id=None):
+    """Creates an ``EvidenceUpload`` and its empty destination file."""
+    if size <= 0 or size > _max_upload_size():
+        raise BusinessRuleError("File size is missing or above the upload limit.")
+    if sha256 and len(sha256) != 64:
+        raise BusinessRuleError("sha256 must be a 64-character hex digest.")
+
+    upload = EvidenceUpload(
+        organization=organization,
+        created_by=user,
+        filename=os.path.basename(filename),
+        size=size,
+        sha256=sha256.lower(),
+    )
+
+    if certification_id:
+        certification = Certification.objects.filter(id=certification_id, vendor__organization=organization).first()
+        if certification is None:
+            raise BusinessRuleError("Certification not found.")
+        upload.certification = certification
+        name = cert_artifact_path(certification, upload.filename)
+    elif assessment_id and question_id:
+        assessment = Assessment.objects.filter(id=assessment_id, organization=organization).first()
+        question = Question.objects.filter(id=question_id).first()
+        # Same rule as answers: the question must be in the version the assessment is pinned to
+        if assessment is None or question is None or question.id not in snapshot_for_assessment(assessment).question_ids:
+            raise BusinessRuleError("Question is not part of this assessment.")
+        upload.assessment, upload.question = assessment, question
+        name = evidence_upload_path(Answer(assessment=assessment, question=question), upload.filename)
+    else:
+        raise BusinessRuleError("Upload needs an answer (assessment + question) or a certification target.")
+
+    # Reserve the final name now; chunks are written straight into it
+    upload.storage_name = default_storage.save(name, ContentFile(b""))
+    upload.save()
+    return upload
+
+
+# ===========================
+# ✅ Chunks
+# ===========================
+def write_chunk(upload, offset, stream, length):
+    """Streams ``length`` bytes from ``stream`` into the upload at ``offset``.
+
+    Returns the new offset. The upload row is locked (``select_for_update``)
+    before any byte reaches the file and stays locked until the offset has
+    advanced, so a stale concurrent writer waits, then fails the offset
+    check instead of overwriting acknowledged bytes. The offset still moves
+    with a compare-and-swap update, for backends without row locks.
+    """
+    if length <= 0 or length > _max_chunk_size():
+        raise BusinessRuleError("Chunk size is missing or above the chunk limit.")
+
+    with transaction.atomic():
+        current = EvidenceUpload.objects.select_for_update().only("offset", "status", "size").get(pk=upload.pk)
+        if current.status != UploadStatus.PENDING:
+            raise BusinessRuleError("Upload is no longer accepting chunks.")
+        if offset != current.offset:
+            raise UploadOffsetMismatch(current.offset)
+        if offset + length > current.size:
+            raise BusinessRuleError("Chunk runs past the declared file size.")
+
+        written = 0
+        with open(_local_path(upload.storage_name), "r+b") as fh:
+            fh.seek(offset)
+            while written < length:
+                block = stream.read(min(STREAM_BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                fh.write(block)
+                written += len(block)
+            # Drop anything a failed earlier attempt left past this chunk
+            fh.truncate(offset + written)
+
+        if written != length:
+            raise BusinessRuleError(f"Chunk ended after {written} of {length} bytes; resume from offset {offset}.")
+
+        advanced = EvidenceUpload.objects.filter(pk=upload.pk, offset=offset, status=UploadStatus.PENDING).update(
+            offset=F("offset") + written
+        )
+    upload.refresh_from_db(fields=["offset", "status"])
+    if not advanced:
+        raise UploadOffsetMismatch(upload.offset)
+    return upload.offset
+
+
+# ===========================
+# ✅ Finalize / abort
+# ===========================
+def finalize_upload(upload):
+    """Verifies size/hash and links the stored content to its target. Returns the target."""
+    if upload.status != UploadStatus.PENDING:
+        raise BusinessRuleError("Upload was already finalized or aborted.")
+    if upload.offset != upload.size:
+        raise BusinessRuleError(f"Upload is incomplete ({upload.offset} of {upload.size} bytes).")
+
+    path = _local_path(upload.storage_name)
+    if os.path.getsize(path) != upload.size:
+        raise BusinessRuleError("Stored file size does not match the declared size.")
+    sha256 = hash_path(path)
+    if upload.sha256 and sha256 != upload.sha256:
+        raise BusinessRuleError("SHA-256 mismatch; the upload is corrupt.")
+
+    if upload.certification_id:
+        target = Certification.objects.get(pk=upload.certification_id)
+    else:
+        target = Answer.objects.filter(assessment_id=upload.assessment_id, question_id=upload.question_id).first()
+        if target is None:
+            raise BusinessRuleError("Save a response for this question before attaching evidence.")
+
+    with transaction.atomic():
+        blob = adopt_stored_file(upload.storage_name, sha256)
+        attach_blob(target, blob)
+
+        upload.sha256 = sha256
+        upload.storage_name = blob.storage_name
+        upload.status = UploadStatus.FINALIZED
+        upload.save(update_fields=["sha256", "storage_name", "status", "updated_at"])
+    return target
+
+
+def abort_upload(upload):
+    """Stops an unfinished upload and deletes its partial file."""
+    if upload.status != UploadStatus.PENDING:
+        raise BusinessRuleError("Only unfinished uploads can be aborted.")
+    default_storage.delete(upload.storage_name)
+    upload.status = UploadStatus.ABORTED
+    upload.save(update_fields=["status", "updated_at"])
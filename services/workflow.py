@@ -1,9 +1,22 @@
 # services/workflow.py
 
+from dataclasses import dataclass, field
+
 from django.contrib.contenttypes.models import ContentType
-from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.utils import timezone
+
+from assessments.models import Assessment
+from common.errors import TransitionConflict
+from trust.queue import schedule_trust_refresh
+from trust.registry import components_reading
+from workflow.graph import get_workflow_graph
+from workflow.models import State, Workflow, WorkflowLog, WorkflowObject
 
-from workflow.models import State, Transition, Workflow, WorkflowLog, WorkflowObject
+ASSESSMENT_WORKFLOW = "Assessment Workflow"
+BULK_BATCH_SIZE = 1000
+# Denormalized copy of the current state's name on workflow-enabled models
+STATE_MIRROR_FIELD = "workflow_state"
 
 
 def get_workflow_object(obj):
@@ -11,100 +24,329 @@ def get_workflow_object(obj):
     return WorkflowObject.objects.get_for_instance(obj)
 
 
-def get_or_create_workflow_object(obj, workflow):
-    """Ensures the object has an associated WorkflowObject.
-    If missing, creates one using the workflow's initial state.
-    Requires the workflow object to already exist.
+# ===========================
+# ✅ State mirror
+# ===========================
+def mirror_changes(model, state, include_status=True, now=None):
+    """Column values that copy ``state`` onto rows of ``model``, for ``.update()``.
+
+    ``workflow_state`` gets the state name (so lists filter and sort without
+    a generic-relation join) and, with ``include_status``, the legacy
+    ``status`` field its lowercased name. ``.update()`` skips ``auto_now``,
+    so ``updated_at`` is set explicitly. Fields the model lacks are skipped.
     """
-    content_type = ContentType.objects.get_for_model(obj.__class__)
-    initial_state = workflow.states.filter(is_initial=True).first()
+    fields = {f.name for f in model._meta.concrete_fields}
+    changes = {}
+    if STATE_MIRROR_FIELD in fields:
+        changes[STATE_MIRROR_FIELD] = state.name
+    if include_status and "status" in fields:
+        changes["status"] = state.name.lower()
+    if changes and "updated_at" in fields:
+        changes["updated_at"] = now or timezone.now()
+    return changes
+
+
+def mirror_workflow_state(obj, state, include_status=True):
+    """Writes ``mirror_changes`` for one object (a single UPDATE) and updates the instance."""
+    changes = mirror_changes(type(obj), state, include_status)
+    if changes:
+        type(obj).objects.filter(pk=obj.pk).update(**changes)
+        for name, value in changes.items():
+            setattr(obj, name, value)
+        if "status" in changes:
+            schedule_status_trust_refresh(type(obj), [obj.pk])
+
+
+def schedule_status_trust_refresh(model, object_ids):
+    """Queues the trust refresh that ``post_save`` would have sent for a ``status`` change.
+
+    The mirror writes ``status`` with ``.update()``, which fires no signals,
+    yet the "assessment" trust component counts completed assessments. Runs
+    on commit (nothing is queued for a rolled-back transition), with one
+    query for the affected vendors and one debounced refresh per vendor.
+    """
+    if model is not Assessment or not object_ids:
+        return
+    object_ids = list(object_ids)
+
+    def refresh():
+        vendor_ids = set(
+            Assessment.objects.filter(pk__in=object_ids).values_list("vendor_offering__vendor_id", flat=True)
+        )
+        components = components_reading(Assessment)
+        for vendor_id in vendor_ids:
+            schedule_trust_refresh(vendor_id, components)
+
+    transaction.on_commit(refresh)
+
+
+def refresh_state_mirror(state_id, name):
+    """Rewrites the mirrored name of every object currently in ``state_id`` (after a rename)."""
+    in_state = WorkflowObject.objects.filter(current_state_id=state_id)
+    for content_type_id in in_state.values_list("content_type_id", flat=True).distinct():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is not None and STATE_MIRROR_FIELD in {f.name for f in model._meta.concrete_fields}:
+            object_ids = in_state.filter(content_type_id=content_type_id).values("object_id")
+            model.objects.filter(pk__in=object_ids).update(**{STATE_MIRROR_FIELD: name})
 
+
+# ===========================
+# ✅ Attach
+# ===========================
+def _attach(obj, workflow):
+    """The one attach path: idempotent, and safe under concurrency thanks to
+    the unique ``(content_type, object_id)`` constraint (``get_or_create``
+    re-reads the winner's row on conflict)."""
+    initial_state = get_workflow_graph(workflow.pk).initial_state
     if not initial_state:
-        raise ValueError(f"Workflow '{workflow.name}' has no initial state defined.")
+        raise State.DoesNotExist(f"No initial state for workflow '{workflow.name}'.")
 
     wf_obj, created = WorkflowObject.objects.get_or_create(
-        content_type=content_type,
+        content_type=ContentType.objects.get_for_model(obj.__class__),
         object_id=obj.pk,
         defaults={
             "workflow": workflow,
-            "current_state": initial_state,
+            "current_state_id": initial_state.id,
         },
     )
+    if created:
+        mirror_workflow_state(obj, initial_state, include_status=False)
     return wf_obj
 
 
-def ensure_workflow_for_object(obj, workflow_name="Assessment Workflow"):
+def get_or_create_workflow_object(obj, workflow):
+    """Ensures the object has an associated WorkflowObject in ``workflow``.
+    If missing, creates one using the workflow's initial state.
+    """
+    return _attach(obj, workflow)
+
+
+def ensure_workflow_for_object(obj, workflow_name=ASSESSMENT_WORKFLOW):
     """Ensure the given object has an associated WorkflowObject.
     If missing, attach it using the workflow's initial state.
     """
-    content_type = ContentType.objects.get_for_model(obj.__class__)
-
     # Use first() instead of get() to avoid MultipleObjectsReturned
     workflow = Workflow.objects.filter(name=workflow_name).first()
     if not workflow:
         raise Workflow.DoesNotExist(f"Workflow '{workflow_name}' does not exist.")
+    return _attach(obj, workflow)
+
 
-    initial_state = workflow.states.filter(is_initial=True).first()
+def attach_missing_workflows(queryset, workflow_name=ASSESSMENT_WORKFLOW):
+    """Attaches every object in ``queryset`` that has no WorkflowObject yet,
+    at the workflow's initial state, with one ``bulk_create`` per batch.
+    Returns the number attached.
+    """
+    workflow = Workflow.objects.filter(name=workflow_name).first()
+    if not workflow:
+        raise Workflow.DoesNotExist(f"Workflow '{workflow_name}' does not exist.")
+    initial_state = get_workflow_graph(workflow.pk).initial_state
     if not initial_state:
         raise State.DoesNotExist(f"No initial state for workflow '{workflow_name}'.")
 
-    wf_obj, created = WorkflowObject.objects.get_or_create(
-        content_type=content_type,
-        object_id=obj.pk,
-        defaults={
-            "workflow": workflow,
-            "current_state": initial_state,
-        },
-    )
+    content_type = ContentType.objects.get_for_model(queryset.model)
+    attached = WorkflowObject.objects.filter(content_type=content_type).values("object_id")
+    missing = list(queryset.exclude(pk__in=attached).values_list("pk", flat=True))
+    with transaction.atomic():
+        # Rows attached concurrently already hold the key; skip them
+        WorkflowObject.objects.bulk_create(
+            [
+                WorkflowObject(content_type=content_type, object_id=pk, workflow=workflow, current_state_id=initial_state.id)
+                for pk in missing
+            ],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        changes = mirror_changes(queryset.model, initial_state, include_status=False)
+        if changes and missing:
+            attached_now = WorkflowObject.objects.filter(
+                content_type=content_type, object_id__in=missing, current_state_id=initial_state.id
+            ).values("object_id")
+            queryset.model.objects.filter(pk__in=attached_now).update(**changes)
+    return len(missing)
 
-    return wf_obj
 
+# ===========================
+# ✅ Transitions
+# ===========================
+def workflow_state_names(workflow_name=ASSESSMENT_WORKFLOW, include_initial=False):
+    """Names of the workflow's states (by default without the initial one: bulk action
+    targets); empty if the workflow isn't configured."""
+    workflow_id = Workflow.objects.filter(name=workflow_name).values_list("pk", flat=True).first()
+    if workflow_id is None:
+        return []
+    states = get_workflow_graph(workflow_id).states.values()
+    return [state.name for state in states if include_initial or not state.is_initial]
 
-def get_available_transitions(user, obj):
-    """Returns a list of valid transitions from the object's current state,
-    optionally filtered by the user's role.
+
+def prefetch_workflow(instances, user=None):
+    """Annotates a page of instances (any mix of models) with their workflow, prefetch-style.
+
+    Sets ``workflow_object``, ``workflow_current_state`` (a ``CompiledState``)
+    and ``workflow_transitions`` (what ``user`` may do next; role checks skipped
+    without a user) on every instance, ``None``/``[]`` when unattached. One
+    query for the whole page; transitions come from the compiled graphs.
+    Returns ``instances`` so it can wrap a page in place.
     """
-    wf_obj = get_workflow_object(obj)
-    transitions = Transition.objects.filter(
-        workflow=wf_obj.workflow,
-        from_state=wf_obj.current_state,
-    )
+    resolved = WorkflowObject.objects.get_for_instances(instances)
+    role = getattr(user, "role", "") if user is not None else None
+    for obj in instances:
+        wf_obj = resolved.get(obj)
+        obj.workflow_object = wf_obj
+        obj.workflow_current_state = None
+        obj.workflow_transitions = []
+        if wf_obj is not None and wf_obj.current_state_id is not None:
+            graph = get_workflow_graph(wf_obj.workflow_id)
+            obj.workflow_current_state = graph.states.get(wf_obj.current_state_id)
+            obj.workflow_transitions = graph.available_transitions(wf_obj.current_state_id, role)
+    return instances
 
-    return [
-        t
-        for t in transitions
-        if not t.role_required or getattr(user, "role", "") == t.role_required
-    ]
 
+def get_available_transitions(user, obj, wf_obj=None):
+    """Returns the transitions valid from the object's current state,
+    filtered by the user's role. Answered from the compiled workflow graph,
+    so the only query is the WorkflowObject lookup (skipped if ``wf_obj`` is given).
+    """
+    wf_obj = wf_obj or get_workflow_object(obj)
+    graph = get_workflow_graph(wf_obj.workflow_id)
+    return graph.available_transitions(wf_obj.current_state_id, getattr(user, "role", ""))
 
-def apply_transition(user, obj, transition: Transition, comment=""):
-    """Applies the given transition to the object:
+
+def apply_transition(user, obj, transition, comment="", wf_obj=None):
+    """Applies the given transition (a ``Transition`` or a compiled one) to the object:
     - Moves it to the next state.
-    - Updates the WorkflowObject and optionally the model's 'status' field.
+    - Updates the WorkflowObject and the state mirror on the object's row.
     - Creates a WorkflowLog entry.
+    Returns the new ``CompiledState``.
+
+    The state change is a compare-and-swap: the UPDATE only matches while the
+    row is still in the transition's source state, so when reviewers race,
+    exactly one wins and the others get ``TransitionConflict`` with nothing
+    written. The mirror and the log entry commit in the same atomic block.
+    This needs no row lock and behaves the same on every backend.
     """
-    content_type = ContentType.objects.get_for_model(obj.__class__)
-    wf_obj = WorkflowObject.objects.get(content_type=content_type, object_id=obj.pk)
-
-    if wf_obj.current_state != transition.from_state:
-        raise PermissionDenied("Transition doesn't match current state.")
-
-    # Apply transition
-    wf_obj.current_state = transition.to_state
-    wf_obj.save()
-
-    # Optionally update the object's status field
-    if hasattr(obj, "status"):
-        obj.status = transition.to_state.name.lower()
-        obj.save()
-
-    # Log the transition
-    WorkflowLog.objects.create(
-        workflow_object=wf_obj,
-        from_state=transition.from_state,
-        to_state=transition.to_state,
-        user=user,
-        comment=comment,
-    )
+    wf_obj = wf_obj or get_workflow_object(obj)
+
+    if wf_obj.current_state_id != transition.from_state_id:
+        raise TransitionConflict("Transition doesn't match current state.")
+    to_state = get_workflow_graph(wf_obj.workflow_id).states[transition.to_state_id]
+
+    with transaction.atomic():
+        moved = WorkflowObject.objects.filter(pk=wf_obj.pk, current_state_id=transition.from_state_id).update(
+            current_state_id=to_state.id
+        )
+        if not moved:
+            raise TransitionConflict("This item was moved by someone else; reload and try again.")
+
+        # Mirror the state (and legacy status) onto the object's row
+        mirror_workflow_state(obj, to_state)
+
+        # Log the transition
+        WorkflowLog.objects.create(
+            workflow_object=wf_obj,
+            from_state_id=transition.from_state_id,
+            to_state_id=to_state.id,
+            user=user,
+            comment=comment,
+        )
+
+    wf_obj.current_state_id = to_state.id
+    return to_state
+
+
+@dataclass
+class TransitionOutcome:
+    object_id: int
+    ok: bool
+    from_state: str = None
+    to_state: str = None
+    error: str = ""
+
+
+@dataclass
+class BulkTransitionReport:
+    outcomes: list = field(default_factory=list)
+
+    @property
+    def succeeded(self):
+        return [o for o in self.outcomes if o.ok]
+
+    @property
+    def failed(self):
+        return [o for o in self.outcomes if not o.ok]
+
+
+def bulk_transition(user, queryset, to_state_name, comment=""):
+    """Moves every object in ``queryset`` into the state named ``to_state_name``.
+
+    Each object is checked against its compiled workflow graph (current
+    state and the user's role); the ones that may move are updated with one
+    UPDATE per target state (plus one for their state mirror) and
+    logged with a single ``bulk_create``, all in one transaction; the
+    affected vendors' trust scores are queued for refresh on commit. Objects
+    that cannot move are reported and left untouched. The workflow rows are
+    locked (``select_for_update``) from the check to the commit, so a
+    concurrent transition cannot slip in between.
+    Returns a ``BulkTransitionReport`` with one outcome per object.
+    """
+    model = queryset.model
+    content_type = ContentType.objects.get_for_model(model)
+    role = getattr(user, "role", "")
+    report = BulkTransitionReport()
+
+    with transaction.atomic():
+        object_ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+        # Lock the rows (in pk order, so concurrent batches cannot deadlock) until commit
+        attached = {
+            object_id: (pk, workflow_id, state_id)
+            for pk, object_id, workflow_id, state_id in WorkflowObject.objects.select_for_update()
+            .filter(content_type=content_type, object_id__in=object_ids)
+            .order_by("pk")
+            .values_list("pk", "object_id", "workflow_id", "current_state_id")
+        }
+
+        moves = {}  # target CompiledState -> [(workflow object pk, object pk, from state id)]
+        for object_id in object_ids:
+            if object_id not in attached:
+                report.outcomes.append(TransitionOutcome(object_id, False, error="No workflow attached."))
+                continue
+            wf_obj_id, workflow_id, state_id = attached[object_id]
+            graph = get_workflow_graph(workflow_id)
+            current = graph.states.get(state_id)
+            current_name = current.name if current else None
+            transition = graph.find_transition(state_id, to_state_name, role)
+            if transition is None:
+                report.outcomes.append(
+                    TransitionOutcome(
+                        object_id, False, current_name, error=f"No transition from '{current_name}' to '{to_state_name}'."
+                    )
+                )
+                continue
+            moves.setdefault(transition.to_state, []).append((wf_obj_id, object_id, state_id))
+            report.outcomes.append(TransitionOutcome(object_id, True, current_name, transition.to_state.name))
+
+        now = timezone.now()
+        logs = []
+        status_changed = []
+        for to_state, rows in moves.items():
+            # Also keyed on the expected state, for backends without row locks (SQLite)
+            moved = WorkflowObject.objects.filter(
+                pk__in=[wf_obj_id for wf_obj_id, _, _ in rows],
+                current_state__in=[from_id for _, _, from_id in rows],
+            ).update(current_state_id=to_state.id)
+            if moved != len(rows):
+                raise TransitionConflict("Some items were moved by someone else; reload and try again.")
+            changes = mirror_changes(model, to_state, now=now)
+            if changes:
+                model.objects.filter(pk__in=[object_id for _, object_id, _ in rows]).update(**changes)
+                if "status" in changes:
+                    status_changed += [object_id for _, object_id, _ in rows]
+            logs += [
+                WorkflowLog(workflow_object_id=wf_obj_id, from_state_id=from_id, to_state_id=to_state.id, user=user, comment=comment)
+                for wf_obj_id, _, from_id in rows
+            ]
+        WorkflowLog.objects.bulk_create(logs, batch_size=BULK_BATCH_SIZE)
+        # One debounced trust refresh per affected vendor, not per object
+        schedule_status_trust_refresh(model, status_changed)
 
-    return wf_obj.current_state
+    return report
@@ -1,2 +1,19 @@
+from django.contrib import admin
 
-# Register your models here.
+from .models import TrustRecomputeRequest, VendorTrustProfile
+
+
+@admin.register(VendorTrustProfile)
+class VendorTrustProfileAdmin(admin.ModelAdmin):
+    list_display = ("vendor", "trust_score", "has_cyber_insurance", "has_data_breach", "scored_at")
+    list_filter = ("has_cyber_insurance", "has_data_breach")
+    search_fields = ("vendor__name",)
+    readonly_fields = ("trust_score", "scored_at")
+
+
+@admin.register(TrustRecomputeRequest)
+class TrustRecomputeRequestAdmin(admin.ModelAdmin):
+    list_display = ("vendor", "requested_at", "due_at", "attempts")
+    list_filter = ("attempts",)
+    search_fields = ("vendor__name",)
+    readonly_fields = ("components", "requested_at", "due_at", "attempts", "last_error")
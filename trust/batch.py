@@ -0,0 +1,170 @@
+# trust/batch.py
+"""Set-based trust scoring for many vendors at once.
+
+Mirrors the component functions in ``trust.engine`` but loads every input
+with a handful of aggregate queries and scores whole columns in one pass.
+"""
+
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q
+from django.utils import timezone
+
+from assessments.models import Assessment, Certification
+from trust.engine import COMPLETED_STATUS, DEFAULT_WEIGHTS, valid_certification_q
+from trust.incremental import apply_component_scores
+from trust.models import VendorTrustProfile
+from vendors.models import Vendor
+
+UPDATE_BATCH_SIZE = 1000
+
+
+@dataclass
+class ScoringInputs:
+    """Column-oriented scoring inputs; index ``i`` belongs to ``vendor_ids[i]``."""
+
+    vendor_ids: list = field(default_factory=list)
+    has_profile: list = field(default_factory=list)
+    has_cyber_insurance: list = field(default_factory=list)
+    has_data_breach: list = field(default_factory=list)
+    has_description: list = field(default_factory=list)
+    has_website: list = field(default_factory=list)
+    has_valid_certification: list = field(default_factory=list)
+    completed_assessments: list = field(default_factory=list)
+    total_assessments: list = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.vendor_ids)
+
+
+def _vendor_queryset(organization=None, vendor_ids=None):
+    vendors = Vendor.objects.all()
+    if organization is not None:
+        vendors = vendors.filter(organization=organization)
+    if vendor_ids is not None:
+        vendors = vendors.filter(id__in=list(vendor_ids))
+    return vendors
+
+
+def load_scoring_inputs(organization=None, vendor_ids=None):
+    """Loads all scoring inputs for the selected vendors in three queries."""
+    vendors = _vendor_queryset(organization, vendor_ids)
+
+    rows = (
+        vendors.annotate(
+            has_description=ExpressionWrapper(~Q(description=""), output_field=BooleanField()),
+            has_website=ExpressionWrapper(~Q(website=""), output_field=BooleanField()),
+        )
+        .values_list(
+            "id",
+            "trust_profile__id",
+            "trust_profile__has_cyber_insurance",
+            "trust_profile__has_data_breach",
+            "has_description",
+            "has_website",
+        )
+        .order_by("id")
+    )
+
+    # Offerings only matter through their assessments, so one grouped count covers both
+    counts = {
+        row["vendor_offering__vendor_id"]: (row["completed"], row["total"])
+        for row in Assessment.objects.filter(vendor_offering__vendor__in=vendors)
+        .values("vendor_offering__vendor_id")
+        .annotate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(status=COMPLETED_STATUS)),
+        )
+        .order_by()
+    }
+
+    certified = set(
+        Certification.objects.filter(vendor__in=vendors)
+        .filter(valid_certification_q())
+        .values_list("vendor_id", flat=True)
+        .distinct()
+    )
+
+    inputs = ScoringInputs()
+    for vendor_id, profile_id, insured, breached, described, has_site in rows:
+        completed, total = counts.get(vendor_id, (0, 0))
+        inputs.vendor_ids.append(vendor_id)
+        inputs.has_profile.append(profile_id is not None)
+        inputs.has_cyber_insurance.append(bool(insured))
+        inputs.has_data_breach.append(bool(breached))
+        inputs.has_description.append(bool(described))
+        inputs.has_website.append(bool(has_site))
+        inputs.has_valid_certification.append(vendor_id in certified)
+        inputs.completed_assessments.append(completed)
+        inputs.total_assessments.append(total)
+    return inputs
+
+
+def score_columns(inputs, weights=None):
+    """Computes every component as a column; returns ``{component: [int, ...]}`` plus ``total``.
+
+    ``weights`` overrides entries of ``DEFAULT_WEIGHTS`` (used by the what-if simulator).
+    """
+    w = {**DEFAULT_WEIGHTS, **(weights or {})}
+    security = [w["cyber_insurance"] if p and insured else 0 for p, insured in zip(inputs.has_profile, inputs.has_cyber_insurance, strict=True)]
+    assessment = [
+        int(w["assessment_completion"] * (done / total)) if total else 0
+        for done, total in zip(inputs.completed_assessments, inputs.total_assessments, strict=True)
+    ]
+    certification = [w["valid_certification"] if certified else 0 for certified in inputs.has_valid_certification]
+    breach_history = [
+        (w["data_breach"] if breached else w["clean_breach_history"]) if p else 0
+        for p, breached in zip(inputs.has_profile, inputs.has_data_breach, strict=True)
+    ]
+    transparency = [
+        w["full_transparency"] if d and site else w["partial_transparency"]
+        for d, site in zip(inputs.has_description, inputs.has_website, strict=True)
+    ]
+
+    columns = {
+        "security": security,
+        "assessment": assessment,
+        "certification": certification,
+        "breach_history": breach_history,
+        "transparency": transparency,
+    }
+    columns["total"] = [sum(parts) for parts in zip(*columns.values(), strict=True)]
+    return columns
+
+
+def ensure_trust_profiles(vendors):
+    """Creates missing trust profiles for the given vendor queryset in one insert."""
+    missing = vendors.filter(trust_profile__isnull=True).values_list("id", flat=True).order_by()
+    VendorTrustProfile.objects.bulk_create(
+        [VendorTrustProfile(vendor_id=vendor_id) for vendor_id in missing],
+        ignore_conflicts=True,
+    )
+
+
+def recompute_trust_scores(organization=None, vendor_ids=None):
+    """Recomputes and stores trust scores for an org or a list of vendor ids.
+
+    Returns a ``{vendor_id: score}`` mapping for the vendors that were scored.
+    """
+    vendors = _vendor_queryset(organization, vendor_ids)
+
+    with transaction.atomic():
+        ensure_trust_profiles(vendors)
+        inputs = load_scoring_inputs(organization, vendor_ids)
+        columns = score_columns(inputs)
+        columns.pop("total")
+
+        # Only moved components are rewritten; history gets a point per changed vendor
+        scores, _ = apply_component_scores(
+            {vendor_id: {component: values[i] for component, values in columns.items()} for i, vendor_id in enumerate(inputs.vendor_ids)}
+        )
+
+        now = timezone.now()
+        profiles = list(VendorTrustProfile.objects.filter(vendor_id__in=scores).only("id", "vendor_id"))
+        for profile in profiles:
+            profile.trust_score = scores[profile.vendor_id]
+            profile.scored_at = now
+        VendorTrustProfile.objects.bulk_update(profiles, ["trust_score", "scored_at"], batch_size=UPDATE_BATCH_SIZE)
+
+    return scores
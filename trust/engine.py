@@ -1,69 +1,111 @@
 # trust/engine.py
 
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from assessments.models import Assessment
+from trust.registry import get_components, register_component
+
+# Assessment status counted as "completed" by the assessment component
+COMPLETED_STATUS = "completed"
+
+# Points awarded by the scoring components; the what-if simulator
+# (trust.simulator) evaluates alternative sets keyed the same way
+DEFAULT_WEIGHTS = {
+    "cyber_insurance": 150,
+    "assessment_completion": 200,  # scaled by the share of completed assessments
+    "valid_certification": 100,
+    "clean_breach_history": 100,
+    "data_breach": -100,
+    "full_transparency": 100,
+    "partial_transparency": 50,
+}
+
+# Badge bands (see common_tags.trust_badge_class)
+HIGH_TRUST_THRESHOLD = 800
+MEDIUM_TRUST_THRESHOLD = 500
+TRUST_BANDS = ("low", "medium", "high")
+
+
+def trust_band(score):
+    """Badge band for a trust score: ``high`` (>= 800), ``medium`` (>= 500) or ``low``."""
+    if score >= HIGH_TRUST_THRESHOLD:
+        return "high"
+    if score >= MEDIUM_TRUST_THRESHOLD:
+        return "medium"
+    return "low"
+
+
+def valid_certification_q(prefix=""):
+    """Filter for certifications that count towards the certification component."""
+    today = timezone.localdate()
+    return Q(**{f"{prefix}is_valid": True, f"{prefix}is_archived": False}) & (
+        Q(**{f"{prefix}expiry_date__isnull": True}) | Q(**{f"{prefix}expiry_date__gte": today})
+    )
 
-def calculate_vendor_trust_score(vendor):
-    """Assigns a trust score to vendor"""
-
-    offerings = vendor.offerings.filter(archived=False)
-    scores = []
-
-    for offering in offerings:
-        if (
-            hasattr(offering, "assessment")
-            and offering.assessment
-            and offering.assessment.calculated_score
-        ):
-            scores.append(
-                offering.assessment.calculated_score
-            )  # Or however you compute it
 
-    if not scores:
-        return None  # No score if nothing to assess
-
-    return sum(scores) // len(scores)  # Avg trust score or weighted
+def calculate_vendor_trust_score(vendor):
+    """Assigns a trust score to vendor (sum of all registered scoring components)."""
+    return sum(component.score(vendor) for component in get_components().values())
 
 
 # ───────────────────────────────────────────
 # 🔒 Scoring Component Functions (Each Returns Int)
+# Registered in order; names match trust.models.TrustComponent
 # ───────────────────────────────────────────
 
 
+@register_component("security", reads=["trust_profile.has_cyber_insurance"])
 def _security_score(vendor):
     trust = getattr(vendor, "trust_profile", None)
     if not trust:
         return 0
-    return 150 if trust.has_cyber_insurance else 0
+    return DEFAULT_WEIGHTS["cyber_insurance"] if trust.has_cyber_insurance else 0
 
 
+@register_component("assessment", reads=["offerings.assessments.status"])
 def _assessment_score(vendor):
     """Calculates assessment completion score for a vendor
     by aggregating over all their offerings' assessments.
     """
-    offerings = vendor.offerings.all()
-    if not offerings.exists():
-        return 0
-
-    completed, total = 0, 0
-    for offering in offerings:
-        assessments = offering.assessments.all()
-        completed += assessments.filter(status="completed").count()
-        total += assessments.count()
+    counts = Assessment.objects.filter(vendor_offering__vendor=vendor).aggregate(
+        total=Count("id"),
+        completed=Count("id", filter=Q(status=COMPLETED_STATUS)),
+    )
+    completed, total = counts["completed"], counts["total"]
 
-    return int(200 * (completed / total)) if total else 0
+    return int(DEFAULT_WEIGHTS["assessment_completion"] * (completed / total)) if total else 0
 
 
+@register_component(
+    "certification",
+    reads=["certifications.is_valid", "certifications.is_archived", "certifications.expiry_date"],
+    date_sensitive=True,
+)
 def _certification_score(vendor):
-    # Placeholder — you can later inspect attached certifications
-    return 100
+    """100 if the vendor holds at least one valid, unexpired certification.
 
+    This replaced a flat 100 placeholder that every vendor received, so
+    vendors without such a certification lose 100 points. Stored totals only
+    pick that up when they are refreshed; run ``manage.py recompute_trust
+    --all`` once after upgrading to rescore everyone at the same time.
+    """
+    certified = vendor.certifications.filter(valid_certification_q()).exists()
+    return DEFAULT_WEIGHTS["valid_certification"] if certified else 0
 
+
+@register_component("breach_history", reads=["trust_profile.has_data_breach"])
 def _breach_history_score(vendor):
     trust = getattr(vendor, "trust_profile", None)
     if not trust:
         return 0
-    return -100 if trust.has_data_breach else 100
+    return DEFAULT_WEIGHTS["data_breach"] if trust.has_data_breach else DEFAULT_WEIGHTS["clean_breach_history"]
 
 
+@register_component("transparency", reads=["description", "website"])
 def _transparency_score(vendor):
     # Placeholder for whether vendor has filled all required data
-    return 100 if vendor.description and vendor.website else 50
+    if vendor.description and vendor.website:
+        return DEFAULT_WEIGHTS["full_transparency"]
+    return DEFAULT_WEIGHTS["partial_transparency"]
+
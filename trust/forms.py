@@ -0,0 +1,17 @@
+# trust/forms.py
+
+from django import forms
+
+from .models import VendorTrustProfile
+
+
+class VendorTrustProfileForm(forms.ModelForm):
+    """Edit the trust attributes captured alongside a vendor."""
+
+    class Meta:
+        model = VendorTrustProfile
+        fields = ["has_cyber_insurance", "has_data_breach", "last_breach_date", "notes"]
+        widgets = {
+            "last_breach_date": forms.DateInput(attrs={"type": "date"}),
+            "notes": forms.Textarea(attrs={"rows": 3}),
+        }
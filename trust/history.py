@@ -0,0 +1,220 @@
+# trust/history.py
+"""Trust score history: compact daily points plus precomputed trend rollups.
+
+``TrustScoreHistory`` keeps one point per vendor per day. Weekly and
+monthly vendor rollups are refreshed as points are written; org-wide
+rollups are built by the ``rollup_trust_history`` command so a multi-year
+dashboard trend reads a bounded number of rows.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Max, Min
+from django.utils import timezone
+
+from trust.models import (
+    OrganizationTrustRollup,
+    RollupGranularity,
+    TrustComponent,
+    TrustScoreHistory,
+    TrustScoreRollup,
+    VendorTrustProfile,
+)
+
+# Trend spans (in days) served from daily, then weekly points; longer spans use monthly
+DAILY_TREND_MAX_DAYS = 92
+WEEKLY_TREND_MAX_DAYS = 731
+# Longest span a trend endpoint accepts (larger ``days`` are clamped)
+TREND_MAX_DAYS = 3650
+
+
+# ===========================
+# ✅ Helpers
+# ===========================
+def component_mask(components):
+    """Packs component names into the history bitmask."""
+    order = TrustComponent.values
+    mask = 0
+    for name in components:
+        mask |= 1 << order.index(name)
+    return mask
+
+
+def mask_components(mask):
+    """Unpacks a history bitmask into component names."""
+    return [name for i, name in enumerate(TrustComponent.values) if mask & (1 << i)]
+
+
+def period_start(day, granularity):
+    """First day of the week (Monday) or month containing ``day``."""
+    if granularity == RollupGranularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == RollupGranularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def pick_granularity(start, end):
+    """Chooses the coarsest bucket that still gives a readable chart for the span."""
+    span = (end - start).days
+    if span <= DAILY_TREND_MAX_DAYS:
+        return RollupGranularity.DAY
+    if span <= WEEKLY_TREND_MAX_DAYS:
+        return RollupGranularity.WEEK
+    return RollupGranularity.MONTH
+
+
+# ===========================
+# ✅ Writes
+# ===========================
+def record_score_changes(changes, day=None):
+    """Appends history points for ``(vendor_id, score, mask)`` tuples and refreshes vendor rollups.
+
+    Several changes on the same day collapse into one point; their masks are OR-ed.
+    """
+    day = day or timezone.localdate()
+    latest = {}
+    for vendor_id, score, mask in changes:
+        latest[vendor_id] = (score, mask | latest.get(vendor_id, (0, 0))[1])
+    if not latest:
+        return
+
+    rollup_periods = [(g, period_start(day, g)) for g in (RollupGranularity.WEEK, RollupGranularity.MONTH)]
+    window_start = min(start for _, start in rollup_periods)
+
+    points = defaultdict(dict)
+    for vendor_id, point_day, score, mask in TrustScoreHistory.objects.filter(
+        vendor_id__in=list(latest), day__gte=window_start, day__lte=day
+    ).values_list("vendor_id", "day", "score", "components"):
+        points[vendor_id][point_day] = (score, mask)
+
+    history = []
+    for vendor_id, (score, mask) in latest.items():
+        mask |= points[vendor_id].get(day, (None, 0))[1]
+        points[vendor_id][day] = (score, mask)
+        history.append(TrustScoreHistory(vendor_id=vendor_id, day=day, score=score, components=mask))
+    TrustScoreHistory.objects.bulk_create(
+        history,
+        update_conflicts=True,
+        unique_fields=["vendor", "day"],
+        update_fields=["score", "components"],
+    )
+
+    rollups = []
+    for vendor_id in latest:
+        series = sorted(points[vendor_id].items())
+        for granularity, start in rollup_periods:
+            scores = [score for point_day, (score, _) in series if point_day >= start]
+            rollups.append(
+                TrustScoreRollup(
+                    vendor_id=vendor_id,
+                    granularity=granularity,
+                    period_start=start,
+                    score_min=min(scores),
+                    score_max=max(scores),
+                    score_last=scores[-1],
+                )
+            )
+    TrustScoreRollup.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=["vendor", "granularity", "period_start"],
+        update_fields=["score_min", "score_max", "score_last"],
+    )
+
+
+def rollup_organization_scores(organization=None, day=None):
+    """Snapshots org-wide score stats for ``day`` and refreshes that week's and month's rollups."""
+    day = day or timezone.localdate()
+
+    profiles = VendorTrustProfile.objects.filter(trust_score__isnull=False)
+    daily = OrganizationTrustRollup.objects.filter(granularity=RollupGranularity.DAY)
+    if organization is not None:
+        profiles = profiles.filter(vendor__organization=organization)
+        daily = daily.filter(organization=organization)
+
+    snapshot = (
+        profiles.values("vendor__organization_id")
+        .annotate(count=Count("id"), avg=Avg("trust_score"), low=Min("trust_score"), high=Max("trust_score"))
+        .order_by()
+    )
+    _save_org_rollups(
+        (row["vendor__organization_id"], RollupGranularity.DAY, day, row["count"], row["avg"], row["low"], row["high"])
+        for row in snapshot
+    )
+
+    for granularity in (RollupGranularity.WEEK, RollupGranularity.MONTH):
+        start = period_start(day, granularity)
+        summary = (
+            daily.filter(period_start__gte=start, period_start__lte=day)
+            .values("organization_id")
+            .annotate(count=Max("vendor_count"), avg=Avg("score_avg"), low=Min("score_min"), high=Max("score_max"))
+            .order_by()
+        )
+        _save_org_rollups(
+            (row["organization_id"], granularity, start, row["count"], row["avg"], row["low"], row["high"])
+            for row in summary
+        )
+
+
+def _save_org_rollups(rows):
+    OrganizationTrustRollup.objects.bulk_create(
+        [
+            OrganizationTrustRollup(
+                organization_id=org_id,
+                granularity=granularity,
+                period_start=start,
+                vendor_count=count,
+                score_avg=avg or 0.0,
+                score_min=low or 0,
+                score_max=high or 0,
+            )
+            for org_id, granularity, start, count, avg, low, high in rows
+        ],
+        update_conflicts=True,
+        unique_fields=["organization", "granularity", "period_start"],
+        update_fields=["vendor_count", "score_avg", "score_min", "score_max"],
+    )
+
+
+# ===========================
+# ✅ Trend queries
+# ===========================
+def vendor_score_trend(vendor_id, start, end=None, granularity=None):
+    """Downsampled trust score series for one vendor (vendor detail sparkline)."""
+    end = end or timezone.localdate()
+    granularity = granularity or pick_granularity(start, end)
+
+    if granularity == RollupGranularity.DAY:
+        rows = TrustScoreHistory.objects.filter(vendor_id=vendor_id, day__range=(start, end)).order_by("day")
+        return [{"period": row.day.isoformat(), "score": row.score} for row in rows]
+
+    rows = TrustScoreRollup.objects.filter(
+        vendor_id=vendor_id,
+        granularity=granularity,
+        period_start__range=(period_start(start, granularity), end),
+    ).order_by("period_start")
+    return [{"period": row.period_start.isoformat(), "score": row.score_last, "min": row.score_min, "max": row.score_max} for row in rows]
+
+
+def organization_score_trend(organization, start, end=None, granularity=None):
+    """Downsampled org-wide trust score series (dashboard trend chart)."""
+    end = end or timezone.localdate()
+    granularity = granularity or pick_granularity(start, end)
+
+    rows = OrganizationTrustRollup.objects.filter(
+        organization=organization,
+        granularity=granularity,
+        period_start__range=(period_start(start, granularity), end),
+    ).order_by("period_start")
+    return [
+        {
+            "period": row.period_start.isoformat(),
+            "average": round(row.score_avg, 1),
+            "min": row.score_min,
+            "max": row.score_max,
+            "vendors": row.vendor_count,
+        }
+        for row in rows
+    ]
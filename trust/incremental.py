@@ -0,0 +1,109 @@
+# trust/incremental.py
+"""Incremental trust scoring: refresh only the components touched by a change.
+
+Component scores live in ``TrustComponentScore``; the vendor's total is the
+sum of those rows, so a single-component refresh never re-walks offerings.
+Each row also stores the input version it was computed from, and components
+whose inputs have not moved are not re-evaluated at all.
+"""
+
+from collections import defaultdict
+
+from django.utils import timezone
+
+from trust.history import component_mask, record_score_changes
+from trust.models import TrustComponentScore, VendorTrustProfile
+from trust.registry import get_components, input_version
+from vendors.models import Vendor
+
+
+def load_component_scores(vendor_ids):
+    """Stored rows as ``{vendor_id: {component: (score, input_version)}}``."""
+    stored = defaultdict(dict)
+    rows = TrustComponentScore.objects.filter(vendor_id__in=list(vendor_ids)).values_list("vendor_id", "component", "score", "input_version")
+    for vendor_id, component, score, version in rows:
+        stored[vendor_id][component] = (score, version)
+    return stored
+
+
+def save_component_scores(rows):
+    """Upserts ``(vendor_id, component, score, input_version)`` rows in a single statement."""
+    TrustComponentScore.objects.bulk_create(
+        [
+            TrustComponentScore(vendor_id=vendor_id, component=component, score=score, input_version=version)
+            for vendor_id, component, score, version in rows
+        ],
+        update_conflicts=True,
+        unique_fields=["vendor", "component"],
+        update_fields=["score", "input_version", "updated_at"],
+    )
+
+
+def apply_component_scores(new_scores, versions=None, stored=None):
+    """Persists ``{vendor_id: {component: score}}`` and records history for vendors whose total moved.
+
+    ``versions`` optionally maps ``{vendor_id: {component: input_version}}``.
+    Unversioned scores (batch path) keep the stored stamp when the score is
+    unchanged and clear it otherwise, so the next incremental refresh
+    re-evaluates them. Rows whose score and version are unchanged are not
+    rewritten. Returns ``(totals, changed)`` where ``totals`` maps every vendor
+    to its summed score and ``changed`` lists the vendor ids whose total moved.
+    """
+    versions = versions or {}
+    stored = stored if stored is not None else load_component_scores(new_scores)
+
+    rows, totals, changes = [], {}, []
+    for vendor_id, scores in new_scores.items():
+        previous = stored[vendor_id]
+        vendor_versions = versions.get(vendor_id, {})
+        moved = []
+        for name, score in scores.items():
+            old_score, old_version = previous.get(name, (None, None))
+            version = vendor_versions.get(name, old_version if old_score == score else "")
+            if old_score != score:
+                moved.append(name)
+            if old_score != score or old_version != version:
+                rows.append((vendor_id, name, score, version))
+
+        previous_scores = {name: score for name, (score, _) in previous.items()}
+        total = sum({**previous_scores, **scores}.values())
+        totals[vendor_id] = total
+        if total != sum(previous_scores.values()) or not previous:
+            changes.append((vendor_id, total, component_mask(moved)))
+
+    save_component_scores(rows)
+    record_score_changes(changes)
+    return totals, [vendor_id for vendor_id, _, _ in changes]
+
+
+def refresh_trust_components(vendor, components=None):
+    """Re-evaluates the named components (all when ``None``) whose inputs changed.
+
+    Returns the vendor's total score.
+    """
+    registry = get_components()
+    names = list(components) if components is not None else list(registry)
+
+    stored = load_component_scores([vendor.pk])
+    current = stored[vendor.pk]
+    versions = {name: input_version(vendor, registry[name]) for name in names}
+    stale = [name for name in names if current.get(name, (None, None))[1] != versions[name]]
+    if not stale:
+        return sum(score for score, _ in current.values())
+
+    totals, changed = apply_component_scores(
+        {vendor.pk: {name: registry[name].score(vendor) for name in stale}},
+        versions={vendor.pk: versions},
+        stored=stored,
+    )
+    if changed:
+        VendorTrustProfile.objects.filter(vendor_id=vendor.pk).update(trust_score=totals[vendor.pk], scored_at=timezone.now())
+    return totals[vendor.pk]
+
+
+def refresh_trust_components_for(vendor_id, components=None):
+    """Same as ``refresh_trust_components`` when only the vendor id is at hand."""
+    vendor = Vendor.objects.select_related("trust_profile").filter(pk=vendor_id).first()
+    if vendor is None:
+        return None
+    return refresh_trust_components(vendor, components)
@@ -0,0 +1,42 @@
+# trust/management/commands/process_trust_queue.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from trust.queue import drain_recompute_queue, queue_stats
+
+
+class Command(BaseCommand):
+    help = "Work the debounced trust score recompute queue (run continuously, or with --once from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain what is due now and exit")
+        parser.add_argument("--chunk", type=int, help="Vendors per transaction (default TRUST_RECOMPUTE_CHUNK_SIZE)")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds to sleep between polls")
+        parser.add_argument("--stats", action="store_true", help="Print queue depth and lag and exit")
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.write_stats()
+            return
+
+        while True:
+            started = time.perf_counter()
+            refreshed, failed = drain_recompute_queue(limit=options.get("chunk"))
+            if refreshed or failed:
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"Refreshed {refreshed} vendors ({failed} failed) in {elapsed:.2f}s.")
+            if options["once"]:
+                self.write_stats()
+                return
+            time.sleep(options["interval"])
+
+    def write_stats(self):
+        stats = queue_stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Queue depth {stats['depth']} ({stats['due']} due, {stats['failing']} failing), "
+                f"lag {stats['lag_seconds']:.1f}s."
+            )
+        )
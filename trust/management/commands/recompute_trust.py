@@ -0,0 +1,69 @@
+# trust/management/commands/recompute_trust.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Organization
+from services.services_trust import recompute_all_trust_scores, recompute_org_trust_scores
+from trust.parallel import DEFAULT_CHUNK_SIZE, DEFAULT_RETRIES
+
+
+class Command(BaseCommand):
+    help = "Batch-recompute vendor trust scores for an organization, specific vendors, or (--all) every organization."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", type=int, help="Organization id to rescore")
+        parser.add_argument(
+            "--vendor",
+            type=int,
+            action="append",
+            dest="vendor_ids",
+            help="Vendor id to rescore (repeatable)",
+        )
+        parser.add_argument("--all", action="store_true", help="Rescore every organization (nightly full refresh)")
+        parser.add_argument("--workers", type=int, help="Worker processes for --all (default: CPU count)")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Vendors per chunk for --all")
+        parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries per failed chunk for --all")
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            self.handle_all(options)
+            return
+
+        org_id = options.get("org")
+        vendor_ids = options.get("vendor_ids")
+        if org_id is None and not vendor_ids:
+            raise CommandError("Provide --org <id> and/or --vendor <id>.")
+
+        organization = None
+        if org_id is not None:
+            try:
+                organization = Organization.objects.get(pk=org_id)
+            except Organization.DoesNotExist:
+                raise CommandError(f"Organization {org_id} does not exist.")
+
+        started = time.perf_counter()
+        count = recompute_org_trust_scores(organization=organization, vendor_ids=vendor_ids)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(f"Rescored {count} vendors in {elapsed:.2f}s."))
+
+    def handle_all(self, options):
+        summary = recompute_all_trust_scores(
+            workers=options.get("workers"),
+            chunk_size=options["chunk_size"],
+            retries=options["retries"],
+        )
+        self.stdout.write(
+            f"Rescored {summary.vendors} vendors across {summary.organizations} organizations "
+            f"in {summary.chunks} chunks ({summary.retried_chunks} retried) in {summary.elapsed:.2f}s."
+        )
+        for result in summary.failed:
+            self.stderr.write(
+                f"Chunk for organization {result.organization_id} ({len(result.vendor_ids)} vendors, "
+                f"first id {result.vendor_ids[0]}) failed after {result.attempts} attempts: {result.error}"
+            )
+        if summary.failed:
+            raise CommandError(f"{len(summary.failed)} of {summary.chunks} chunks failed.")
+        self.stdout.write(self.style.SUCCESS("Full trust refresh complete."))
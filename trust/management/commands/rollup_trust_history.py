@@ -0,0 +1,27 @@
+# trust/management/commands/rollup_trust_history.py
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Organization
+from trust.history import rollup_organization_scores
+
+
+class Command(BaseCommand):
+    help = "Snapshot org-wide trust score stats into daily/weekly/monthly rollups (run nightly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", type=int, help="Only roll up this organization id")
+        parser.add_argument("--day", type=date.fromisoformat, help="Snapshot date (YYYY-MM-DD), defaults to today")
+
+    def handle(self, *args, **options):
+        organization = None
+        if options.get("org") is not None:
+            try:
+                organization = Organization.objects.get(pk=options["org"])
+            except Organization.DoesNotExist:
+                raise CommandError(f"Organization {options['org']} does not exist.")
+
+        rollup_organization_scores(organization=organization, day=options.get("day"))
+        self.stdout.write(self.style.SUCCESS("Trust score rollups updated."))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('vendors', '0009_vendorcontact_vendordocument_vendordomain_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorTrustProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('has_cyber_insurance', models.BooleanField(default=False)),
+                ('has_data_breach', models.BooleanField(default=False)),
+                ('last_breach_date', models.DateField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('trust_score', models.IntegerField(blank=True, help_text='Sum of trust scoring components', null=True)),
+                ('scored_at', models.DateTimeField(blank=True, null=True)),
+                ('vendor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='trust_profile', to='vendors.vendor')),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trust', '0001_initial'),
+        ('vendors', '0009_vendorcontact_vendordocument_vendordomain_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrustComponentScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('component', models.CharField(choices=[('security', 'Security'), ('assessment', 'Assessment completion'), ('certification', 'Certification'), ('breach_history', 'Breach history'), ('transparency', 'Transparency')], max_length=20)),
+                ('score', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('vendor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trust_components', to='vendors.vendor')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('vendor', 'component'), name='uniq_trust_component_per_vendor')],
+            },
+        ),
+    ]
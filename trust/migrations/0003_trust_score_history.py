@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_authevent_emailverificationtoken_and_more'),
+        ('trust', '0002_trustcomponentscore'),
+        ('vendors', '0009_vendorcontact_vendordocument_vendordomain_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationTrustRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('day', 'Daily'), ('week', 'Weekly'), ('month', 'Monthly')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('vendor_count', models.PositiveIntegerField(default=0)),
+                ('score_avg', models.FloatField(default=0.0)),
+                ('score_min', models.SmallIntegerField(default=0)),
+                ('score_max', models.SmallIntegerField(default=0)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trust_rollups', to='accounts.organization')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('organization', 'granularity', 'period_start'), name='uniq_trust_rollup_org_period')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TrustScoreHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('score', models.SmallIntegerField()),
+                ('components', models.PositiveSmallIntegerField(default=0)),
+                ('vendor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trust_history', to='vendors.vendor')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('vendor', 'day'), name='uniq_trust_history_vendor_day')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TrustScoreRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('day', 'Daily'), ('week', 'Weekly'), ('month', 'Monthly')], max_length=5)),
+                ('period_start', models.DateField()),
+                ('score_min', models.SmallIntegerField()),
+                ('score_max', models.SmallIntegerField()),
+                ('score_last', models.SmallIntegerField()),
+                ('vendor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trust_rollups', to='vendors.vendor')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('vendor', 'granularity', 'period_start'), name='uniq_trust_rollup_vendor_period')],
+            },
+        ),
+    ]
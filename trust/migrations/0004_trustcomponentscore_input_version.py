@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trust', '0003_trust_score_history'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trustcomponentscore',
+            name='input_version',
+            field=models.CharField(blank=True, help_text='Stamp of the inputs this score was computed from', max_length=40),
+        ),
+    ]
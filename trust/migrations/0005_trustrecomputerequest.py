@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trust', '0004_trustcomponentscore_input_version'),
+        ('vendors', '0009_vendorcontact_vendordocument_vendordomain_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrustRecomputeRequest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('components', models.PositiveSmallIntegerField(default=0, help_text='Bitmask of components to refresh (same bits as TrustScoreHistory)')),
+                ('requested_at', models.DateTimeField(help_text='First request since the vendor was last refreshed')),
+                ('due_at', models.DateTimeField(db_index=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('vendor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='trust_recompute_request', to='vendors.vendor')),
+            ],
+        ),
+    ]
@@ -1,2 +1,166 @@
+# trust/models.py
 
-# Create your models here.
+from django.db import models
+
+from vendors.models import Vendor
+
+
+class TrustComponent(models.TextChoices):
+    """Scoring components that add up to a vendor's trust score."""
+
+    SECURITY = "security", "Security"
+    ASSESSMENT = "assessment", "Assessment completion"
+    CERTIFICATION = "certification", "Certification"
+    BREACH_HISTORY = "breach_history", "Breach history"
+    TRANSPARENCY = "transparency", "Transparency"
+
+
+class VendorTrustProfile(models.Model):
+    """Trust attributes and the last computed trust score for a vendor."""
+
+    vendor = models.OneToOneField(
+        Vendor, on_delete=models.CASCADE, related_name="trust_profile"
+    )
+    has_cyber_insurance = models.BooleanField(default=False)
+    has_data_breach = models.BooleanField(default=False)
+    last_breach_date = models.DateField(null=True, blank=True)
+    notes = models.TextField(blank=True)
+
+    trust_score = models.IntegerField(
+        null=True, blank=True, help_text="Sum of trust scoring components"
+    )
+    scored_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.vendor.name} trust profile ({self.trust_score})"
+
+
+class TrustComponentScore(models.Model):
+    """Persisted score for one trust component of one vendor."""
+
+    vendor = models.ForeignKey(
+        Vendor, on_delete=models.CASCADE, related_name="trust_components"
+    )
+    component = models.CharField(max_length=20, choices=TrustComponent.choices)
+    score = models.IntegerField(default=0)
+    input_version = models.CharField(
+        max_length=40, blank=True, help_text="Stamp of the inputs this score was computed from"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["vendor", "component"],
+                name="uniq_trust_component_per_vendor",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.vendor_id}:{self.component}={self.score}"
+
+
+class RollupGranularity(models.TextChoices):
+    """Bucket sizes for precomputed trust score trends."""
+
+    DAY = "day", "Daily"
+    WEEK = "week", "Weekly"
+    MONTH = "month", "Monthly"
+
+
+class TrustScoreHistory(models.Model):
+    """Append-only daily trust score point (one row per vendor per day).
+
+    ``components`` is a bitmask of the components that moved that day,
+    bit ``i`` matching ``TrustComponent.values[i]``.
+    """
+
+    vendor = models.ForeignKey(
+        Vendor, on_delete=models.CASCADE, related_name="trust_history"
+    )
+    day = models.DateField()
+    score = models.SmallIntegerField()
+    components = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["vendor", "day"],
+                name="uniq_trust_history_vendor_day",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.vendor_id} {self.day}: {self.score}"
+
+
+class TrustScoreRollup(models.Model):
+    """Per-vendor weekly/monthly summary of ``TrustScoreHistory`` points."""
+
+    vendor = models.ForeignKey(
+        Vendor, on_delete=models.CASCADE, related_name="trust_rollups"
+    )
+    granularity = models.CharField(max_length=5, choices=RollupGranularity.choices)
+    period_start = models.DateField()
+    score_min = models.SmallIntegerField()
+    score_max = models.SmallIntegerField()
+    score_last = models.SmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["vendor", "granularity", "period_start"],
+                name="uniq_trust_rollup_vendor_period",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.vendor_id} {self.granularity} {self.period_start}: {self.score_last}"
+
+
+class OrganizationTrustRollup(models.Model):
+    """Org-wide trust score distribution per day/week/month (dashboard trend)."""
+
+    organization = models.ForeignKey(
+        "accounts.Organization", on_delete=models.CASCADE, related_name="trust_rollups"
+    )
+    granularity = models.CharField(max_length=5, choices=RollupGranularity.choices)
+    period_start = models.DateField()
+    vendor_count = models.PositiveIntegerField(default=0)
+    score_avg = models.FloatField(default=0.0)
+    score_min = models.SmallIntegerField(default=0)
+    score_max = models.SmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["organization", "granularity", "period_start"],
+                name="uniq_trust_rollup_org_period",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.organization_id} {self.granularity} {self.period_start}: {self.score_avg:.1f}"
+
+
+class TrustRecomputeRequest(models.Model):
+    """Pending trust refresh for a vendor (one row per vendor, see ``trust.queue``).
+
+    Repeated requests coalesce into the same row: ``components`` accumulates
+    the dirty component bitmask and ``due_at`` is pushed back by the debounce
+    window, never past ``requested_at`` plus the maximum delay.
+    """
+
+    vendor = models.OneToOneField(
+        Vendor, on_delete=models.CASCADE, related_name="trust_recompute_request"
+    )
+    components = models.PositiveSmallIntegerField(
+        default=0, help_text="Bitmask of components to refresh (same bits as TrustScoreHistory)"
+    )
+    requested_at = models.DateTimeField(help_text="First request since the vendor was last refreshed")
+    due_at = models.DateTimeField(db_index=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.vendor_id} due {self.due_at:%Y-%m-%d %H:%M:%S}"
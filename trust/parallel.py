@@ -0,0 +1,129 @@
+# trust/parallel.py
+"""Multi-process full trust refresh across organizations.
+
+Vendor ids are split into per-organization chunks. The chunks are fanned
+out to a process pool, and each worker opens its own DB connection and
+rescores its chunk with ``recompute_trust_scores`` (one transaction per
+chunk). Transient DB errors are retried inside the worker; chunks that
+still fail are reported in the summary and the rest of the run carries on.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from itertools import groupby, islice
+
+import django
+from django.db import InterfaceError, OperationalError, connection, connections
+
+from trust.batch import recompute_trust_scores
+from vendors.models import Vendor
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 1.0
+
+# Errors worth retrying: dropped connections, deadlocks, serialization failures
+RETRYABLE_ERRORS = (OperationalError, InterfaceError)
+
+
+@dataclass
+class ChunkResult:
+    organization_id: int
+    vendor_ids: list
+    scored: int = 0
+    attempts: int = 0
+    error: str = ""
+
+
+@dataclass
+class RecomputeSummary:
+    organizations: int = 0
+    chunks: int = 0
+    vendors: int = 0
+    retried_chunks: int = 0
+    failed: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def add(self, result):
+        self.vendors += result.scored
+        if result.attempts > 1:
+            self.retried_chunks += 1
+        if result.error:
+            self.failed.append(result)
+
+
+def plan_chunks(organizations=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """``[(organization_id, [vendor_id, ...]), ...]`` with at most ``chunk_size`` ids per chunk, in one query."""
+    vendors = Vendor.objects.all()
+    if organizations is not None:
+        vendors = vendors.filter(organization__in=organizations)
+    rows = vendors.order_by("organization_id", "id").values_list("organization_id", "id")
+
+    chunks = []
+    for org_id, group in groupby(rows.iterator(chunk_size=2000), key=lambda row: row[0]):
+        ids = (vendor_id for _, vendor_id in group)
+        while batch := list(islice(ids, chunk_size)):
+            chunks.append((org_id, batch))
+    return chunks
+
+
+def _drop_broken_connection():
+    # Django reconnects lazily on the next query
+    if connection.connection is not None and not connection.in_atomic_block and not connection.is_usable():
+        connection.close()
+
+
+def score_chunk(organization_id, vendor_ids, retries=DEFAULT_RETRIES):
+    """Rescores one chunk, retrying transient DB errors. Never raises; failures land in ``error``."""
+    result = ChunkResult(organization_id=organization_id, vendor_ids=vendor_ids)
+    while True:
+        result.attempts += 1
+        try:
+            result.scored = len(recompute_trust_scores(vendor_ids=vendor_ids))
+            result.error = ""
+            return result
+        except RETRYABLE_ERRORS as exc:
+            result.error = repr(exc)
+            if result.attempts > retries:
+                return result
+            _drop_broken_connection()
+            time.sleep(RETRY_BACKOFF_SECONDS * result.attempts)
+        except Exception as exc:
+            result.error = repr(exc)
+            return result
+
+
+def _init_worker():
+    # Spawned workers start without Django; forked ones just need a fresh connection
+    django.setup()
+    connections.close_all()
+
+
+def recompute_all_organizations(organizations=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, retries=DEFAULT_RETRIES):
+    """Full trust refresh of every (or the given) organization.
+
+    ``workers`` bounds concurrency (defaults to the CPU count); ``workers=1``
+    scores the chunks in-process. Returns a ``RecomputeSummary``.
+    """
+    started = time.perf_counter()
+    chunks = plan_chunks(organizations, chunk_size)
+    summary = RecomputeSummary(organizations=len({org_id for org_id, _ in chunks}), chunks=len(chunks))
+
+    if workers == 1 or len(chunks) <= 1:
+        for org_id, vendor_ids in chunks:
+            summary.add(score_chunk(org_id, vendor_ids, retries))
+    else:
+        # Children must not inherit the parent's open connection
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = {pool.submit(score_chunk, org_id, vendor_ids, retries): (org_id, vendor_ids) for org_id, vendor_ids in chunks}
+            for future in as_completed(futures):
+                try:
+                    summary.add(future.result())
+                except Exception as exc:  # worker process died
+                    org_id, vendor_ids = futures[future]
+                    summary.add(ChunkResult(organization_id=org_id, vendor_ids=vendor_ids, attempts=1, error=repr(exc)))
+
+    summary.elapsed = time.perf_counter() - started
+    return summary
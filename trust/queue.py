@@ -0,0 +1,178 @@
+# trust/queue.py
+"""Debounced, coalescing DB-backed queue for trust score refreshes.
+
+Model signals call ``schedule_trust_refresh`` instead of scoring inline.
+Each vendor has at most one ``TrustRecomputeRequest`` row: a burst of
+saves ORs its dirty components into that row and pushes ``due_at`` back,
+so the worker (``manage.py process_trust_queue``) rescores the vendor once
+the burst has settled. ``TRUST_RECOMPUTE_EAGER`` restores inline scoring.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateTimeField, ExpressionWrapper, F, Min, Q, Value
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from trust.history import component_mask, mask_components
+from trust.incremental import refresh_trust_components, refresh_trust_components_for
+from trust.models import TrustRecomputeRequest
+from trust.registry import get_components
+from vendors.models import Vendor
+
+logger = logging.getLogger(__name__)
+
+# Failed refreshes back off exponentially up to this many seconds
+MAX_RETRY_BACKOFF_SECONDS = 3600
+# A claimed request is hidden from other workers this long while it is scored
+CLAIM_LEASE = timedelta(minutes=10)
+
+
+def _debounce():
+    return timedelta(seconds=getattr(settings, "TRUST_RECOMPUTE_DEBOUNCE_SECONDS", 5))
+
+
+def _max_delay():
+    return timedelta(seconds=getattr(settings, "TRUST_RECOMPUTE_MAX_DELAY_SECONDS", 60))
+
+
+# ===========================
+# ✅ Producers
+# ===========================
+def schedule_trust_refresh(vendor, components=None):
+    """Queues (or, in eager mode, runs) a refresh of ``components`` for a vendor or vendor id."""
+    if vendor is None:
+        return
+    if getattr(settings, "TRUST_RECOMPUTE_EAGER", False):
+        if isinstance(vendor, Vendor):
+            refresh_trust_components(vendor, components)
+        else:
+            refresh_trust_components_for(vendor, components)
+        return
+    enqueue_recompute(getattr(vendor, "pk", vendor), components)
+
+
+def enqueue_recompute(vendor_id, components=None, now=None):
+    """Marks ``components`` (all when ``None``) dirty for ``vendor_id``, coalescing with any pending request."""
+    now = now or timezone.now()
+    mask = component_mask(components if components is not None else get_components())
+    due_at = now + _debounce()
+
+    # Slide the debounce window, but never past requested_at + max delay
+    updated = TrustRecomputeRequest.objects.filter(vendor_id=vendor_id).update(
+        components=F("components").bitor(mask),
+        due_at=Least(
+            Value(due_at, output_field=DateTimeField()),
+            ExpressionWrapper(F("requested_at") + _max_delay(), output_field=DateTimeField()),
+        ),
+    )
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            TrustRecomputeRequest.objects.create(vendor_id=vendor_id, components=mask, requested_at=now, due_at=due_at)
+    except IntegrityError:
+        # A concurrent request inserted the row first; merge into it instead
+        enqueue_recompute(vendor_id, components, now)
+
+
+# ===========================
+# ✅ Worker
+# ===========================
+def _claim(limit, now):
+    """Claims up to ``limit`` due requests; returns ``[(pk, vendor_id, components, attempts)]``.
+
+    The rows are locked (``SKIP LOCKED`` where supported) only for this
+    short transaction: each is leased by pushing ``due_at`` past the claim
+    lease and its dirty mask moves into memory (``components`` resets to 0),
+    so other workers skip it while it is scored. Saves made meanwhile merge
+    new bits into the same row as usual. If the worker dies, the lease
+    expires and the row is claimed again with an empty mask, which
+    refreshes every component.
+    """
+    with transaction.atomic():
+        claimed = list(
+            TrustRecomputeRequest.objects.select_for_update(skip_locked=True)
+            .filter(due_at__lte=now)
+            .order_by("due_at")
+            .values_list("pk", "vendor_id", "components", "attempts")[:limit]
+        )
+        if claimed:
+            TrustRecomputeRequest.objects.filter(pk__in=[pk for pk, _, _, _ in claimed]).update(
+                components=0, requested_at=now, due_at=now + CLAIM_LEASE
+            )
+    return claimed
+
+
+def process_recompute_queue(limit=None, now=None):
+    """Refreshes up to ``limit`` due vendors.
+
+    Rows are claimed in a short transaction (``_claim``) and scored after it
+    has committed, so several workers can drain the queue side by side
+    without holding row locks while scoring. A vendor that fails is kept
+    with an exponential backoff and does not block the rest of the chunk.
+    Returns ``(refreshed, failed)`` counts.
+    """
+    limit = limit or getattr(settings, "TRUST_RECOMPUTE_CHUNK_SIZE", 200)
+    now = now or timezone.now()
+
+    claimed = _claim(limit, now)
+    if not claimed:
+        return 0, 0
+
+    vendors = Vendor.objects.select_related("trust_profile").in_bulk([vendor_id for _, vendor_id, _, _ in claimed])
+    done, failed = [], 0
+    for pk, vendor_id, mask, attempts in claimed:
+        vendor = vendors.get(vendor_id)
+        try:
+            if vendor is not None:
+                with transaction.atomic():
+                    refresh_trust_components(vendor, mask_components(mask) or None)
+            done.append(pk)
+        except Exception as exc:
+            failed += 1
+            logger.exception("Trust refresh failed for vendor %s", vendor_id)
+            backoff = min(_debounce().total_seconds() * 2 ** (attempts + 1), MAX_RETRY_BACKOFF_SECONDS)
+            TrustRecomputeRequest.objects.filter(pk=pk).update(
+                components=F("components").bitor(mask),
+                attempts=F("attempts") + 1,
+                last_error=repr(exc),
+                due_at=now + timedelta(seconds=backoff),
+            )
+
+    # A row that picked up new bits while we scored stays queued for them
+    TrustRecomputeRequest.objects.filter(pk__in=done, components=0).delete()
+    return len(done), failed
+
+
+def drain_recompute_queue(limit=None, now=None):
+    """Processes chunks until nothing is due. Returns total ``(refreshed, failed)``."""
+    refreshed = failed = 0
+    while True:
+        chunk_refreshed, chunk_failed = process_recompute_queue(limit=limit, now=now)
+        refreshed, failed = refreshed + chunk_refreshed, failed + chunk_failed
+        # Failed rows are pushed past ``now``, so an empty chunk means nothing is left
+        if not chunk_refreshed and not chunk_failed:
+            return refreshed, failed
+
+
+def queue_stats(now=None):
+    """Queue depth and lag in one query.
+
+    ``lag_seconds`` is the age of the oldest pending request, i.e. how
+    stale the most out-of-date trust score can currently be.
+    """
+    now = now or timezone.now()
+    stats = TrustRecomputeRequest.objects.aggregate(
+        depth=Count("pk"),
+        due=Count("pk", filter=Q(due_at__lte=now)),
+        failing=Count("pk", filter=Q(attempts__gt=0)),
+        oldest=Min("requested_at"),
+    )
+    oldest = stats.pop("oldest")
+    stats["lag_seconds"] = (now - oldest).total_seconds() if oldest else 0.0
+    return stats
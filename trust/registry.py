@@ -0,0 +1,147 @@
+# trust/registry.py
+"""Registry of trust scoring components.
+
+Each component declares the vendor-relative field paths it reads, e.g.
+``"trust_profile.has_cyber_insurance"`` or ``"certifications.expiry_date"``.
+Those paths drive two things:
+
+- ``input_version`` — a stamp of the declared inputs, stored next to the
+  component score so unchanged components are not re-evaluated (related
+  collections are stamped by an aggregate, see ``_collection_stamp``);
+- ``components_reading`` — which components a model change can affect.
+"""
+
+import hashlib
+from dataclasses import dataclass
+
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from vendors.models import Vendor
+
+
+@dataclass(frozen=True)
+class ScoringComponent:
+    name: str
+    score: object
+    reads: tuple
+    revision: int = 1
+    date_sensitive: bool = False
+
+    def models(self):
+        """Models whose rows feed this component (``Vendor`` only for its own fields)."""
+        found = set()
+        for path in self.reads:
+            parts = path.split(".")
+            model = Vendor
+            for part in parts[:-1]:
+                model = model._meta.get_field(part).related_model
+                found.add(model)
+            if len(parts) == 1:
+                found.add(Vendor)
+        return found
+
+
+_REGISTRY = {}
+
+
+def register_component(name, reads, revision=1, date_sensitive=False):
+    """Decorator registering ``fn(vendor) -> int`` as a trust scoring component.
+
+    ``name`` must also be a ``TrustComponent`` value (it keys the stored rows
+    and the history bitmask). Bump ``revision`` when the scoring rule itself changes so cached results expire.
+    Set ``date_sensitive`` when the result depends on today's date (e.g. expiry checks).
+    """
+
+    def decorator(fn):
+        _REGISTRY[name] = ScoringComponent(
+            name=name,
+            score=fn,
+            reads=tuple(reads),
+            revision=revision,
+            date_sensitive=date_sensitive,
+        )
+        return fn
+
+    return decorator
+
+
+def get_components():
+    """Registered components in registration order."""
+    return dict(_REGISTRY)
+
+
+def components_reading(model):
+    """Names of the components that read any field of ``model``."""
+    return [name for name, component in _REGISTRY.items() if model in component.models()]
+
+
+# ===========================
+# ✅ Input version stamps
+# ===========================
+def _split_path(path):
+    """Splits a path into ``(scalar_attrs, collection_lookup, field)``.
+
+    ``trust_profile.has_cyber_insurance`` → (["trust_profile", "has_cyber_insurance"], None, None)
+    ``offerings.assessments.status`` → ([], "offerings__assessments", "status")
+    """
+    model, parts = Vendor, path.split(".")
+    for part in parts[:-1]:
+        field = model._meta.get_field(part)
+        if field.one_to_many or field.many_to_many:
+            return [], "__".join(parts[:-1]), parts[-1]
+        model = field.related_model
+    return parts, None, None
+
+
+def _scalar_value(vendor, attrs):
+    value = vendor
+    for attr in attrs:
+        value = getattr(value, attr, None)
+        if value is None:
+            break
+    return value
+
+
+def _collection_stamp(vendor, lookup, fields):
+    """Aggregate stamp of a related collection: its size and latest ``updated_at``.
+
+    One aggregate row, however large the collection, so the stamp stays
+    cheaper than the component it guards. Any edit to a row moves it (bulk
+    ``.update()`` calls set ``updated_at`` explicitly), not only edits to the
+    declared ``fields``; that costs a spare re-evaluation, never a stale
+    score. Models without ``updated_at`` fall back to the ordered
+    ``(pk, *fields)`` rows.
+    """
+    model, back = Vendor, []
+    for part in lookup.split("__"):
+        field = model._meta.get_field(part)
+        back.append(field.field.name)
+        model = field.related_model
+
+    rows = model.objects.filter(**{"__".join(reversed(back)): vendor.pk})
+    if "updated_at" in {f.name for f in model._meta.concrete_fields}:
+        stamp = rows.aggregate(count=Count("pk"), latest=Max("updated_at"))
+        return stamp["count"], stamp["latest"] and stamp["latest"].isoformat()
+    return list(rows.order_by("pk").values_list("pk", *sorted(fields)))
+
+
+def input_version(vendor, component):
+    """Stable stamp of everything ``component`` reads for ``vendor``."""
+    parts = [f"rev={component.revision}"]
+    if component.date_sensitive:
+        parts.append(f"day={timezone.localdate().isoformat()}")
+
+    collections = {}
+    for path in component.reads:
+        attrs, lookup, field = _split_path(path)
+        if lookup is None:
+            parts.append(f"{path}={_scalar_value(vendor, attrs)!r}")
+        else:
+            collections.setdefault(lookup, set()).add(field)
+
+    # One query per related collection, however many of its fields are read
+    for lookup, fields in sorted(collections.items()):
+        parts.append(f"{lookup}={_collection_stamp(vendor, lookup, fields)!r}")
+
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
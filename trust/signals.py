@@ -0,0 +1,62 @@
+# trust/signals.py
+"""Keep persisted trust components in sync with the models they read.
+
+Which components a model feeds comes from the registry (``reads`` paths);
+the handlers here only know how to get from a changed row to its vendor.
+Refreshes go through the debounced queue (``trust.queue``), so a save
+never pays for scoring itself.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from assessments.models import Assessment, Certification
+from common.signals import deleted_directly
+from trust.models import VendorTrustProfile
+from trust.queue import schedule_trust_refresh
+from trust.registry import components_reading
+from vendors.models import Vendor, VendorOffering
+
+
+def _vendor_id_for_offering(offering_id):
+    return VendorOffering.objects.filter(pk=offering_id).values_list("vendor_id", flat=True).first()
+
+
+@receiver(post_save, sender=Vendor)
+def refresh_on_vendor_save(sender, instance, created, **kwargs):
+    # New vendors get every component; edits only move what reads vendor fields
+    components = None if created else components_reading(Vendor)
+    schedule_trust_refresh(instance, components)
+
+
+@receiver(post_save, sender=VendorTrustProfile)
+def refresh_on_trust_profile_save(sender, instance, **kwargs):
+    schedule_trust_refresh(instance.vendor, components_reading(VendorTrustProfile))
+
+
+@receiver(post_save, sender=Assessment)
+def refresh_on_assessment_save(sender, instance, created, **kwargs):
+    schedule_trust_refresh(_vendor_id_for_offering(instance.vendor_offering_id), components_reading(Assessment))
+
+
+@receiver(post_delete, sender=Assessment)
+def refresh_on_assessment_delete(sender, instance, origin=None, **kwargs):
+    if deleted_directly(origin, Assessment):
+        schedule_trust_refresh(_vendor_id_for_offering(instance.vendor_offering_id), components_reading(Assessment))
+
+
+@receiver(post_delete, sender=VendorOffering)
+def refresh_on_offering_delete(sender, instance, origin=None, **kwargs):
+    if deleted_directly(origin, VendorOffering):
+        schedule_trust_refresh(instance.vendor_id, components_reading(VendorOffering))
+
+
+@receiver(post_save, sender=Certification)
+def refresh_on_certification_save(sender, instance, **kwargs):
+    schedule_trust_refresh(instance.vendor_id, components_reading(Certification))
+
+
+@receiver(post_delete, sender=Certification)
+def refresh_on_certification_delete(sender, instance, origin=None, **kwargs):
+    if deleted_directly(origin, Certification):
+        schedule_trust_refresh(instance.vendor_id, components_reading(Certification))
@@ -0,0 +1,106 @@
+# trust/simulator.py
+"""What-if trust scoring across a whole portfolio.
+
+Scoring inputs are loaded once (``load_scoring_inputs``, three queries) and
+every candidate weight set is scored column-wise in memory, so comparing
+several candidates costs no extra queries. Results are summarised as score
+distributions, deltas against the current weights and badge band migrations.
+"""
+
+from collections import Counter
+from statistics import fmean, median
+
+from trust.batch import load_scoring_inputs, score_columns
+from trust.engine import DEFAULT_WEIGHTS, TRUST_BANDS, trust_band
+
+# Upper bound on candidates per simulation request
+MAX_WEIGHT_SETS = 10
+
+
+def clean_weight_set(weights):
+    """Validates a ``{weight: points}`` mapping against ``DEFAULT_WEIGHTS``.
+
+    Raises ``ValueError`` for unknown weight names or non-integer points.
+    """
+    if not isinstance(weights, dict):
+        raise ValueError("A weight set must be an object of weight names to points.")
+    unknown = set(weights) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown weights: {', '.join(sorted(unknown))}.")
+    cleaned = {}
+    for name, points in weights.items():
+        if isinstance(points, bool) or not isinstance(points, int):
+            raise ValueError(f"Weight '{name}' must be an integer.")
+        cleaned[name] = points
+    return cleaned
+
+
+def _percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def score_distribution(totals):
+    """Summary stats and band counts for a column of scores."""
+    bands = Counter(trust_band(score) for score in totals)
+    summary = {"count": len(totals), "bands": {band: bands.get(band, 0) for band in TRUST_BANDS}}
+    if not totals:
+        return summary
+
+    ordered = sorted(totals)
+    summary.update(
+        mean=round(fmean(ordered), 1),
+        median=median(ordered),
+        min=ordered[0],
+        max=ordered[-1],
+        p10=_percentile(ordered, 0.1),
+        p90=_percentile(ordered, 0.9),
+    )
+    return summary
+
+
+def compare_totals(baseline, totals):
+    """Distribution deltas and band migrations from ``baseline`` to ``totals`` (same vendor order)."""
+    deltas = [new - old for old, new in zip(baseline, totals, strict=True)]
+    migrations = Counter(
+        (trust_band(old), trust_band(new))
+        for old, new in zip(baseline, totals, strict=True)
+        if trust_band(old) != trust_band(new)
+    )
+    return {
+        "distribution": score_distribution(totals),
+        "delta": {
+            "mean": round(fmean(deltas), 1) if deltas else 0.0,
+            "min": min(deltas, default=0),
+            "max": max(deltas, default=0),
+            "vendors_changed": sum(1 for delta in deltas if delta),
+        },
+        "band_migrations": [
+            {"from": source, "to": target, "vendors": count}
+            for (source, target), count in sorted(migrations.items())
+        ],
+    }
+
+
+def simulate_weight_sets(weight_sets, organization=None, vendor_ids=None):
+    """Scores every vendor under each named weight set and compares against the current weights.
+
+    ``weight_sets`` maps a label to partial overrides of ``DEFAULT_WEIGHTS``.
+    """
+    if len(weight_sets) > MAX_WEIGHT_SETS:
+        raise ValueError(f"At most {MAX_WEIGHT_SETS} weight sets per simulation.")
+    weight_sets = {label: clean_weight_set(weights) for label, weights in weight_sets.items()}
+
+    inputs = load_scoring_inputs(organization, vendor_ids)
+    baseline = score_columns(inputs)["total"]
+
+    results = {}
+    for label, weights in weight_sets.items():
+        totals = score_columns(inputs, weights)["total"]
+        results[label] = {"weights": {**DEFAULT_WEIGHTS, **weights}, **compare_totals(baseline, totals)}
+
+    return {
+        "vendors": len(inputs),
+        "baseline": {"weights": dict(DEFAULT_WEIGHTS), "distribution": score_distribution(baseline)},
+        "weight_sets": results,
+    }
@@ -1,2 +1,313 @@
+# trust/tests.py
 
-# Create your tests here.
+from dataclasses import replace
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import CustomUser, Membership, Organization
+from assessments.models import Assessment, Certification, Questionnaire
+from trust.batch import recompute_trust_scores
+from trust.engine import calculate_vendor_trust_score
+from trust.history import mask_components, organization_score_trend, record_score_changes, rollup_organization_scores, vendor_score_trend
+from trust.incremental import refresh_trust_components
+from trust.models import RollupGranularity, TrustComponent, TrustComponentScore, TrustRecomputeRequest, TrustScoreHistory, TrustScoreRollup, VendorTrustProfile
+from trust.parallel import plan_chunks, recompute_all_organizations
+from trust.queue import enqueue_recompute, process_recompute_queue, queue_stats
+from trust.registry import components_reading, get_components, input_version
+from trust.simulator import simulate_weight_sets
+from vendors.models import Vendor, VendorOffering
+
+
+@override_settings(TRUST_RECOMPUTE_EAGER=True)
+class TrustTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(name="TrustOrg")
+        cls.questionnaire = Questionnaire.objects.create(name="Baseline")
+
+    @classmethod
+    def make_vendor(cls, name, insured=False, breached=False, completed=0, drafts=0, **fields):
+        vendor = Vendor.objects.create(organization=cls.org, name=name, **fields)
+        VendorTrustProfile.objects.create(vendor=vendor, has_cyber_insurance=insured, has_data_breach=breached)
+        if completed or drafts:
+            offering = VendorOffering.objects.create(vendor=vendor, name=f"{name} App")
+            for status in ["completed"] * completed + ["draft"] * drafts:
+                Assessment.objects.create(
+                    organization=cls.org,
+                    vendor_offering=offering,
+                    questionnaire=cls.questionnaire,
+                    status=status,
+                )
+        return vendor
+
+
+class BatchTrustScoringTests(TrustTestCase):
+    def test_batch_matches_per_vendor_engine(self):
+        vendors = [
+            self.make_vendor("Acme", insured=True, completed=1, drafts=1, description="d", website="https://acme.test"),
+            self.make_vendor("Globex", breached=True, drafts=2),
+            self.make_vendor("Initech", insured=True, breached=True, completed=3),
+        ]
+
+        scores = recompute_trust_scores(organization=self.org)
+
+        for vendor in vendors:
+            vendor.refresh_from_db()
+            expected = calculate_vendor_trust_score(vendor)
+            self.assertEqual(scores[vendor.id], expected)
+            self.assertEqual(vendor.trust_profile.trust_score, expected)
+
+    def test_missing_profiles_are_created(self):
+        vendor = Vendor.objects.create(organization=self.org, name="NoProfile")
+
+        recompute_trust_scores(vendor_ids=[vendor.id])
+
+        self.assertTrue(VendorTrustProfile.objects.filter(vendor=vendor, trust_score__isnull=False).exists())
+
+    def test_query_count_does_not_grow_with_vendors(self):
+        for i in range(3):
+            self.make_vendor(f"Small {i}", completed=1)
+        with self.assertNumQueries(9):
+            recompute_trust_scores(organization=self.org)
+
+        for i in range(12):
+            self.make_vendor(f"Large {i}", drafts=2)
+        with self.assertNumQueries(9):
+            recompute_trust_scores(organization=self.org)
+
+
+class IncrementalTrustScoringTests(TrustTestCase):
+    def component(self, vendor, name):
+        return TrustComponentScore.objects.get(vendor=vendor, component=name).score
+
+    def test_total_tracks_component_changes(self):
+        vendor = self.make_vendor("Hooli", drafts=1)
+        profile = vendor.trust_profile
+
+        Certification.objects.create(vendor=vendor, type="SOC2", is_valid=True)
+        assessment = Assessment.objects.get(vendor_offering__vendor=vendor)
+        assessment.status = "completed"
+        assessment.save()
+        profile.has_cyber_insurance = True
+        profile.save()
+
+        self.assertEqual(self.component(vendor, TrustComponent.CERTIFICATION), 100)
+        self.assertEqual(self.component(vendor, TrustComponent.ASSESSMENT), 200)
+        self.assertEqual(self.component(vendor, TrustComponent.SECURITY), 150)
+        profile.refresh_from_db()
+        vendor.refresh_from_db()
+        self.assertEqual(profile.trust_score, calculate_vendor_trust_score(vendor))
+
+    def test_vendor_edit_only_touches_transparency(self):
+        vendor = self.make_vendor("Pied Piper")
+        vendor.description = "Compression"
+        vendor.website = "https://piedpiper.test"
+
+        with self.assertNumQueries(7):
+            vendor.save()
+
+        self.assertEqual(self.component(vendor, TrustComponent.TRANSPARENCY), 100)
+
+
+class TrustHistoryTests(TrustTestCase):
+    def test_history_point_written_only_when_score_moves(self):
+        vendor = self.make_vendor("Umbrella")
+        point = TrustScoreHistory.objects.get(vendor=vendor)
+
+        vendor.name = "Umbrella Corp"
+        vendor.save()
+        self.assertEqual(TrustScoreHistory.objects.filter(vendor=vendor).count(), 1)
+
+        profile = vendor.trust_profile
+        profile.has_cyber_insurance = True
+        profile.save()
+
+        point.refresh_from_db()
+        self.assertEqual(point.score, VendorTrustProfile.objects.get(vendor=vendor).trust_score)
+        self.assertIn(TrustComponent.SECURITY, mask_components(point.components))
+
+    def test_rollups_summarise_points_per_period(self):
+        vendor = self.make_vendor("Soylent")
+        for day, score in [(date(2026, 3, 2), 300), (date(2026, 3, 4), 500), (date(2026, 3, 20), 400)]:
+            record_score_changes([(vendor.id, score, 0)], day=day)
+
+        week = TrustScoreRollup.objects.get(vendor=vendor, granularity=RollupGranularity.WEEK, period_start=date(2026, 3, 2))
+        month = TrustScoreRollup.objects.get(vendor=vendor, granularity=RollupGranularity.MONTH, period_start=date(2026, 3, 1))
+        self.assertEqual((week.score_min, week.score_max, week.score_last), (300, 500, 500))
+        self.assertEqual((month.score_min, month.score_max, month.score_last), (300, 500, 400))
+
+        series = vendor_score_trend(vendor.id, date(2024, 1, 1), end=date(2026, 6, 30))
+        self.assertEqual(series, [{"period": "2026-03-01", "score": 400, "min": 300, "max": 500}])
+
+    def test_organization_trend_reads_rollups(self):
+        self.make_vendor("Wonka", insured=True)
+        self.make_vendor("Tyrell")
+
+        rollup_organization_scores(organization=self.org, day=date(2026, 5, 6))
+        points = organization_score_trend(self.org, date(2026, 5, 1), end=date(2026, 5, 31))
+
+        self.assertEqual(len(points), 1)
+        self.assertEqual(points[0]["vendors"], 2)
+
+
+class ComponentRegistryTests(TrustTestCase):
+    def test_components_declare_the_models_they_read(self):
+        self.assertEqual(components_reading(Vendor), [TrustComponent.TRANSPARENCY])
+        self.assertEqual(components_reading(VendorTrustProfile), [TrustComponent.SECURITY, TrustComponent.BREACH_HISTORY])
+        self.assertEqual(components_reading(Assessment), [TrustComponent.ASSESSMENT])
+
+    def test_unchanged_inputs_skip_component_evaluation(self):
+        vendor = self.make_vendor("Cyberdyne")
+        component = get_components()[TrustComponent.CERTIFICATION]
+        spy = mock.Mock(wraps=component.score)
+
+        with mock.patch.dict("trust.registry._REGISTRY", {component.name: replace(component, score=spy)}):
+            refresh_trust_components(vendor)
+            spy.assert_not_called()
+
+            Certification.objects.create(vendor=vendor, type="SOC2", is_valid=True)
+            spy.assert_called_once()
+
+        self.assertEqual(TrustComponentScore.objects.get(vendor=vendor, component=component.name).score, 100)
+
+    def test_collection_inputs_are_stamped_with_one_aggregate(self):
+        vendor = self.make_vendor("Initrode", drafts=25)
+        component = get_components()[TrustComponent.ASSESSMENT]
+
+        with self.assertNumQueries(1):
+            before = input_version(vendor, component)
+
+        assessment = Assessment.objects.filter(vendor_offering__vendor=vendor).first()
+        assessment.status = "completed"
+        assessment.save()
+        self.assertNotEqual(input_version(vendor, component), before)
+
+
+@override_settings(TRUST_RECOMPUTE_EAGER=False, TRUST_RECOMPUTE_DEBOUNCE_SECONDS=5, TRUST_RECOMPUTE_MAX_DELAY_SECONDS=60)
+class RecomputeQueueTests(TrustTestCase):
+    def test_burst_of_saves_coalesces_into_one_refresh(self):
+        vendor = self.make_vendor("Vandelay")
+        profile = vendor.trust_profile
+        for insured in (True, False, True):
+            profile.has_cyber_insurance = insured
+            profile.save()
+        Certification.objects.create(vendor=vendor, type="ISO27001", is_valid=True)
+
+        self.assertEqual(TrustRecomputeRequest.objects.filter(vendor=vendor).count(), 1)
+        self.assertFalse(TrustComponentScore.objects.filter(vendor=vendor).exists())
+
+        self.assertEqual(process_recompute_queue(), (0, 0))  # still inside the debounce window
+        refreshed, failed = process_recompute_queue(now=timezone.now() + timedelta(seconds=10))
+
+        self.assertEqual((refreshed, failed), (1, 0))
+        self.assertFalse(TrustRecomputeRequest.objects.exists())
+        vendor.refresh_from_db()
+        self.assertEqual(vendor.trust_profile.trust_score, calculate_vendor_trust_score(vendor))
+
+    def test_debounce_window_slides_up_to_max_delay(self):
+        vendor = Vendor.objects.create(organization=self.org, name="Kramerica")
+        start = TrustRecomputeRequest.objects.get(vendor=vendor).requested_at
+
+        enqueue_recompute(vendor.id, [TrustComponent.SECURITY], now=start + timedelta(seconds=3))
+        self.assertEqual(TrustRecomputeRequest.objects.get(vendor=vendor).due_at, start + timedelta(seconds=8))
+
+        enqueue_recompute(vendor.id, [TrustComponent.SECURITY], now=start + timedelta(seconds=58))
+        self.assertEqual(TrustRecomputeRequest.objects.get(vendor=vendor).due_at, start + timedelta(seconds=60))
+
+    def test_rows_are_leased_while_scoring_and_keep_new_changes(self):
+        vendor = Vendor.objects.create(organization=self.org, name="Bania")
+        later = timezone.now() + timedelta(seconds=10)
+
+        def refresh(*args):
+            row = TrustRecomputeRequest.objects.get(vendor=vendor)
+            # Claimed and committed before scoring: the mask moved to the worker, the row is leased
+            self.assertEqual(row.components, 0)
+            self.assertGreater(row.due_at, later)
+            enqueue_recompute(vendor.id, [TrustComponent.SECURITY], now=later)
+
+        with mock.patch("trust.queue.refresh_trust_components", side_effect=refresh) as scored:
+            self.assertEqual(process_recompute_queue(now=later), (1, 0))
+        scored.assert_called_once()
+
+        row = TrustRecomputeRequest.objects.get(vendor=vendor)
+        self.assertEqual(mask_components(row.components), [TrustComponent.SECURITY])
+
+    def test_stats_report_depth_and_lag(self):
+        vendor = Vendor.objects.create(organization=self.org, name="Pendant")
+        requested_at = TrustRecomputeRequest.objects.get(vendor=vendor).requested_at
+
+        stats = queue_stats(now=requested_at + timedelta(seconds=30))
+
+        self.assertEqual((stats["depth"], stats["due"], stats["failing"]), (1, 1, 0))
+        self.assertEqual(stats["lag_seconds"], 30.0)
+
+
+class TrustTrendViewTests(TrustTestCase):
+    def test_huge_day_spans_are_clamped(self):
+        user = CustomUser.objects.create_user(email="trend@trust.test")
+        Membership.objects.create(user=user, organization=self.org, role="member")
+        vendor = self.make_vendor("Longview")
+        self.client.force_login(user)
+
+        for url in (reverse("dashboard:trust_trend"), reverse("vendors:vendor_trust_trend", args=[vendor.pk])):
+            response = self.client.get(url, {"days": 10**9})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("points", response.json())
+
+
+class TrustSimulatorTests(TrustTestCase):
+    def test_weight_sets_report_deltas_and_band_migrations(self):
+        self.make_vendor("Insured", insured=True)
+        self.make_vendor("Uninsured")
+
+        with self.assertNumQueries(3):
+            result = simulate_weight_sets(
+                {"big_insurance": {"cyber_insurance": 400}, "harsh_breach": {"data_breach": -300}},
+                organization=self.org,
+            )
+
+        self.assertEqual(result["vendors"], 2)
+        self.assertEqual(result["baseline"]["distribution"]["bands"], {"low": 2, "medium": 0, "high": 0})
+        insurance = result["weight_sets"]["big_insurance"]
+        self.assertEqual(insurance["delta"]["vendors_changed"], 1)
+        self.assertEqual(insurance["delta"]["max"], 250)
+        self.assertEqual(insurance["band_migrations"], [{"from": "low", "to": "medium", "vendors": 1}])
+        self.assertEqual(result["weight_sets"]["harsh_breach"]["band_migrations"], [])
+
+    def test_unknown_weights_are_rejected(self):
+        with self.assertRaises(ValueError):
+            simulate_weight_sets({"typo": {"cyber_insurence": 10}}, organization=self.org)
+
+
+class ParallelRecomputeTests(TrustTestCase):
+    def test_chunks_stay_within_one_organization(self):
+        other = Organization.objects.create(name="OtherOrg")
+        ours = [self.make_vendor(f"Ours {i}").id for i in range(5)]
+        theirs = Vendor.objects.create(organization=other, name="Theirs").id
+
+        chunks = plan_chunks(chunk_size=2)
+
+        self.assertEqual(chunks, [(self.org.id, ours[:2]), (self.org.id, ours[2:4]), (self.org.id, ours[4:]), (other.id, [theirs])])
+
+    def test_transient_failures_are_retried_per_chunk(self):
+        for i in range(3):
+            self.make_vendor(f"Chunked {i}")
+        calls = []
+
+        def flaky(vendor_ids):
+            calls.append(vendor_ids)
+            if len(calls) == 1:
+                raise OperationalError("connection reset")
+            return recompute_trust_scores(vendor_ids=vendor_ids)
+
+        with mock.patch("trust.parallel.recompute_trust_scores", side_effect=flaky), mock.patch("trust.parallel.RETRY_BACKOFF_SECONDS", 0):
+            summary = recompute_all_organizations(workers=1, chunk_size=2)
+
+        self.assertEqual((summary.organizations, summary.chunks, summary.vendors), (1, 2, 3))
+        self.assertEqual(summary.retried_chunks, 1)
+        self.assertEqual(summary.failed, [])
@@ -13,6 +13,7 @@ urlpatterns = [
     path("<int:pk>/", views.vendor_detail, name="vendor_detail"),
     path("<int:pk>/edit/", views.vendor_update, name="vendor_update"),
     path("<int:pk>/archive/", views.vendor_archive, name="vendor_archive"),
+    path("<int:pk>/trend/", views.vendor_trust_trend, name="vendor_trust_trend"),
     # ───────────── Vendor Offering Views ─────────────
     path("offerings/", views.offering_list, name="offering_list"),
     path(
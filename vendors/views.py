@@ -1,11 +1,16 @@
 # vendors/views.py
 
+from datetime import timedelta
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_protect
 
 from common.models import DataType
+from services.permissions import get_user_org
 from services.services_vendors import (
     archive_vendor,
     archive_vendor_offering,
@@ -14,6 +19,9 @@ from services.services_vendors import (
     update_vendor_offering,
     update_vendor_with_trust,
 )
+from trust.forms import VendorTrustProfileForm
+from trust.history import TREND_MAX_DAYS, vendor_score_trend
+from trust.models import VendorTrustProfile
 from vendors.forms import VendorForm, VendorOfferingForm
 from vendors.models import Vendor, VendorOffering
 
@@ -52,6 +60,19 @@ def vendor_detail(request, pk):
     )
 
 
+@login_required
+def vendor_trust_trend(request, pk):
+    """JSON trust score series for the vendor detail sparkline."""
+    vendor = get_object_or_404(Vendor, pk=pk, organization=get_user_org(request.user))
+    try:
+        days = int(request.GET.get("days", 365))
+    except ValueError:
+        return JsonResponse({"error": "days must be an integer."}, status=400)
+
+    start = timezone.localdate() - timedelta(days=min(max(days, 1), TREND_MAX_DAYS))
+    return JsonResponse({"points": vendor_score_trend(vendor.pk, start)})
+
+
 @login_required
 def vendor_create(request):
     """Create a new vendor with trust profile."""
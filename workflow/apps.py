@@ -7,4 +7,4 @@ class WorkflowConfig(AppConfig):
     name = "workflow"
 
     def ready(self):
-        pass
+        import workflow.graph_signals  # noqa
@@ -0,0 +1,159 @@
+# workflow/graph.py
+"""Compiled, in-process workflow graphs.
+
+A workflow compiles into an immutable ``CompiledWorkflow``: its states and,
+per state, the outgoing transitions with their role requirement. Checking
+or listing transitions then costs no queries; only the object's current
+state still has to be read.
+
+Definitions rarely change, so each process keeps its compiled copy until
+the workflow's version moves. The version is a token in the Django cache,
+replaced whenever a Workflow, State or Transition is saved or deleted
+(``workflow.graph_signals``); the saving process also drops its own copy at
+once, other processes recompile on their next lookup. That only reaches
+other processes through a shared ``CACHES`` backend (Redis, Memcached); with
+the default per-process LocMemCache they still pick up an edit once their
+copy is ``WORKFLOW_GRAPH_TIMEOUT`` seconds old.
+"""
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+
+from workflow.models import State, Transition, Workflow
+
+_compiled = {}
+_lock = threading.Lock()
+
+
+def _graph_timeout():
+    return getattr(settings, "WORKFLOW_GRAPH_TIMEOUT", 300)
+
+
+def _version_key(workflow_id):
+    return f"workflow-graph-version:{workflow_id}"
+
+
+@dataclass(frozen=True)
+class CompiledState:
+    id: int
+    name: str
+    is_initial: bool
+    is_final: bool
+
+
+@dataclass(frozen=True)
+class CompiledTransition:
+    id: int
+    name: str
+    from_state: CompiledState
+    to_state: CompiledState
+    role_required: str
+
+    # Same attribute names as the model's FK columns, so either can be applied
+    @property
+    def from_state_id(self):
+        return self.from_state.id
+
+    @property
+    def to_state_id(self):
+        return self.to_state.id
+
+    def allows(self, role):
+        return not self.role_required or role == self.role_required
+
+
+@dataclass(frozen=True)
+class CompiledWorkflow:
+    workflow_id: int
+    name: str
+    version: str
+    states: dict  # id -> CompiledState
+    outgoing: dict = field(default_factory=dict)  # from_state id -> tuple of CompiledTransition
+    compiled_at: float = 0.0  # time.monotonic() of compilation, for the local TTL
+
+    @property
+    def initial_state(self):
+        return next((s for s in self.states.values() if s.is_initial), None)
+
+    def available_transitions(self, state_id, role=None):
+        """Transitions out of ``state_id`` the given role may take (role checks skipped when ``role`` is ``None``)."""
+        transitions = self.outgoing.get(state_id, ())
+        if role is None:
+            return list(transitions)
+        return [t for t in transitions if t.allows(role)]
+
+    def find_transition(self, state_id, to_state_name, role=None):
+        """First available transition from ``state_id`` into the state named ``to_state_name`` (case-insensitive)."""
+        target = to_state_name.lower()
+        return next((t for t in self.available_transitions(state_id, role) if t.to_state.name.lower() == target), None)
+
+
+# ===========================
+# ✅ Compile
+# ===========================
+def compile_workflow(workflow_id, version=None):
+    """Reads one workflow definition (three queries) into a ``CompiledWorkflow``."""
+    name = Workflow.objects.filter(pk=workflow_id).values_list("name", flat=True).first()
+    if name is None:
+        raise Workflow.DoesNotExist(f"Workflow {workflow_id} does not exist.")
+
+    states = {
+        pk: CompiledState(pk, state_name, is_initial, is_final)
+        for pk, state_name, is_initial, is_final in State.objects.filter(workflow_id=workflow_id)
+        .order_by("pk")
+        .values_list("pk", "name", "is_initial", "is_final")
+    }
+    outgoing = {}
+    rows = (
+        Transition.objects.filter(workflow_id=workflow_id)
+        .order_by("pk")
+        .values_list("pk", "name", "from_state_id", "to_state_id", "role_required")
+    )
+    for pk, transition_name, from_id, to_id, role_required in rows:
+        # Transitions pointing at another workflow's states are unusable; skip them
+        if from_id in states and to_id in states:
+            transition = CompiledTransition(pk, transition_name, states[from_id], states[to_id], role_required)
+            outgoing.setdefault(from_id, []).append(transition)
+
+    return CompiledWorkflow(
+        workflow_id=workflow_id,
+        name=name,
+        version=version,
+        states=states,
+        outgoing={state_id: tuple(transitions) for state_id, transitions in outgoing.items()},
+        compiled_at=time.monotonic(),
+    )
+
+
+# ===========================
+# ✅ Lookup / invalidation
+# ===========================
+def get_workflow_graph(workflow_id):
+    """The compiled graph for ``workflow_id``, recompiled when its version moved or the local copy expired."""
+    version = cache.get(_version_key(workflow_id))
+    graph = _compiled.get(workflow_id)
+    if graph is not None and graph.version == version and time.monotonic() - graph.compiled_at < _graph_timeout():
+        return graph
+
+    graph = compile_workflow(workflow_id, version)
+    with _lock:
+        _compiled[workflow_id] = graph
+    return graph
+
+
+def invalidate_workflow_graph(workflow_id, local_only=False):
+    """Drops this process's copy; unless ``local_only``, also moves the shared version so every process recompiles."""
+    with _lock:
+        _compiled.pop(workflow_id, None)
+    if not local_only:
+        cache.set(_version_key(workflow_id), uuid.uuid4().hex, None)
+
+
+def clear_workflow_graphs():
+    with _lock:
+        _compiled.clear()
@@ -0,0 +1,47 @@
+# workflow/graph_signals.py
+"""Keep compiled workflow graphs and mirrored state names in step with definitions.
+
+The saving process drops its copy immediately; the shared version moves
+once the transaction commits, so other processes never recompile from a
+definition that could still roll back. Renaming a state rewrites the
+``workflow_state`` mirror of every object currently in it.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from services.workflow import refresh_state_mirror
+from workflow.graph import invalidate_workflow_graph
+from workflow.models import State, Transition, Workflow
+
+
+def _invalidate(workflow_id):
+    invalidate_workflow_graph(workflow_id, local_only=True)
+    transaction.on_commit(lambda: invalidate_workflow_graph(workflow_id))
+
+
+@receiver(post_save, sender=Workflow)
+@receiver(post_delete, sender=Workflow)
+def invalidate_on_workflow_change(sender, instance, **kwargs):
+    _invalidate(instance.pk)
+
+
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+@receiver(post_save, sender=Transition)
+@receiver(post_delete, sender=Transition)
+def invalidate_on_definition_change(sender, instance, **kwargs):
+    _invalidate(instance.workflow_id)
+
+
+@receiver(pre_save, sender=State)
+def remember_previous_name(sender, instance, **kwargs):
+    if instance.pk:
+        instance._previous_name = State.objects.filter(pk=instance.pk).values_list("name", flat=True).first()
+
+
+@receiver(post_save, sender=State)
+def refresh_mirror_on_rename(sender, instance, created, **kwargs):
+    if not created and getattr(instance, "_previous_name", instance.name) != instance.name:
+        refresh_state_mirror(instance.pk, instance.name)
@@ -0,0 +1,25 @@
+# workflow/management/commands/attach_workflows.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from assessments.models import Assessment
+from services.workflow import ASSESSMENT_WORKFLOW, attach_missing_workflows
+from workflow.models import State, Workflow
+
+
+class Command(BaseCommand):
+    help = "Attach every assessment that has no workflow object to the workflow's initial state."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workflow", default=ASSESSMENT_WORKFLOW, help="Workflow name")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            count = attach_missing_workflows(Assessment.objects.all(), options["workflow"])
+        except (Workflow.DoesNotExist, State.DoesNotExist) as e:
+            raise CommandError(str(e)) from e
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Attached {count} assessments in {elapsed:.2f}s."))
@@ -0,0 +1,39 @@
+# Merge duplicate WorkflowObjects (the same target attached more than once)
+# before 0003 makes (content_type, object_id) unique.
+
+from django.db import migrations
+from django.db.models import Count, Max
+
+
+def dedupe(apps, schema_editor):
+    WorkflowObject = apps.get_model("workflow", "WorkflowObject")
+    WorkflowLog = apps.get_model("workflow", "WorkflowLog")
+
+    duplicated = (
+        WorkflowObject.objects.values("content_type_id", "object_id")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+    )
+    for key in duplicated.iterator():
+        rows = list(
+            WorkflowObject.objects.filter(content_type_id=key["content_type_id"], object_id=key["object_id"])
+            .annotate(last_logged=Max("logs__timestamp"))
+            .order_by("id")
+        )
+        # Keep the one transitioned most recently (its state is the live one), else the oldest
+        logged = [row for row in rows if row.last_logged is not None]
+        keep = max(logged, key=lambda row: row.last_logged) if logged else rows[0]
+        others = [row.pk for row in rows if row.pk != keep.pk]
+        WorkflowLog.objects.filter(workflow_object_id__in=others).update(workflow_object_id=keep.pk)
+        WorkflowObject.objects.filter(pk__in=others).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workflow', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Separate from the dedupe so PostgreSQL has no pending trigger events when the table is altered
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('workflow', '0002_dedupe_workflow_objects'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='workflowobject',
+            constraint=models.UniqueConstraint(fields=('content_type', 'object_id'), name='workflow_object_unique_target'),
+        ),
+    ]
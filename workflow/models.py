@@ -56,6 +56,32 @@ class WorkflowObjectManager(models.Manager):
         content_type = ContentType.objects.get_for_model(instance.__class__)
         return self.get(content_type=content_type, object_id=instance.pk)
 
+    def get_for_instances(self, instances):
+        """``{instance: WorkflowObject}`` for a list of instances of one or more models,
+        in one query (current state and workflow joined); unattached instances are left out.
+        """
+        instances = [obj for obj in instances if obj.pk is not None]
+        if not instances:
+            return {}
+        content_types = ContentType.objects.get_for_models(*{type(obj) for obj in instances})
+        ids_by_type = {}
+        for obj in instances:
+            ids_by_type.setdefault(content_types[type(obj)].pk, set()).add(obj.pk)
+
+        lookup = models.Q()
+        for content_type_id, object_ids in ids_by_type.items():
+            lookup |= models.Q(content_type_id=content_type_id, object_id__in=object_ids)
+        found = {
+            (wf_obj.content_type_id, wf_obj.object_id): wf_obj
+            for wf_obj in self.filter(lookup).select_related("current_state", "workflow")
+        }
+        result = {}
+        for obj in instances:
+            wf_obj = found.get((content_types[type(obj)].pk, obj.pk))
+            if wf_obj is not None:
+                result[obj] = wf_obj
+        return result
+
 
 # A generic link from a workflow to any model instance (e.g., Assessment)
 class WorkflowObject(models.Model):
@@ -69,6 +95,12 @@ class WorkflowObject(models.Model):
         State, on_delete=models.SET_NULL, null=True, blank=True
     )
 
+    class Meta:
+        constraints = [
+            # One workflow object per target; also the index behind every lookup
+            models.UniqueConstraint(fields=["content_type", "object_id"], name="workflow_object_unique_target"),
+        ]
+
     def __str__(self):
         return f"{self.content_object} - {self.current_state.name if self.current_state else 'No State'}"
 
@@ -1,2 +1,348 @@
+# workflow/tests.py
 
-# Create your tests here.
+import threading
+from unittest import mock
+from unittest import skipIf
+
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import CustomUser, Membership, Organization
+from assessments.models import Assessment, Questionnaire
+from common.errors import TransitionConflict
+from services.assessments import assessment_list_queryset, submit_assessment_for_review
+from services.workflow import (
+    apply_transition,
+    bulk_transition,
+    ensure_workflow_for_object,
+    get_available_transitions,
+    get_or_create_workflow_object,
+    prefetch_workflow,
+)
+from trust.engine import COMPLETED_STATUS
+from trust.history import component_mask
+from trust.models import TrustRecomputeRequest
+from trust.queue import schedule_trust_refresh
+from trust.registry import components_reading
+from vendors.models import Vendor, VendorOffering
+from workflow.graph import clear_workflow_graphs, get_workflow_graph
+from workflow.models import State, Transition, Workflow, WorkflowLog, WorkflowObject
+from workflow.views import SubmitAssessmentForReviewView
+
+
+class WorkflowTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.workflow = Workflow.objects.create(name="Assessment Workflow")
+        cls.draft = State.objects.create(workflow=cls.workflow, name="Draft", is_initial=True)
+        cls.review = State.objects.create(workflow=cls.workflow, name="Review")
+        cls.approved = State.objects.create(workflow=cls.workflow, name="Approved", is_final=True)
+        Transition.objects.create(workflow=cls.workflow, name="Submit", from_state=cls.draft, to_state=cls.review)
+        Transition.objects.create(
+            workflow=cls.workflow, name="Approve", from_state=cls.review, to_state=cls.approved, role_required="approver"
+        )
+        cls.user = CustomUser.objects.create_user(email="flow@graph.test", password="Password123!")
+        cls.org = Organization.objects.create(name="GraphOrg")
+        cls.offering = VendorOffering.objects.create(vendor=Vendor.objects.create(organization=cls.org, name="Flow"), name="ERP")
+        cls.questionnaire = Questionnaire.objects.create(name="Flow")
+        cls.assessment = cls.make_assessment(cls.draft)
+
+    @classmethod
+    def make_assessment(cls, state=None):
+        assessment = Assessment.objects.create(
+            organization=cls.org, vendor_offering=cls.offering, questionnaire=cls.questionnaire
+        )
+        if state is not None:
+            WorkflowObject.objects.create(
+                content_type=ContentType.objects.get_for_model(Assessment),
+                object_id=assessment.pk,
+                workflow=cls.workflow,
+                current_state=state,
+            )
+        return assessment
+
+    def setUp(self):
+        clear_workflow_graphs()
+        cache.clear()
+
+
+class WorkflowGraphTests(WorkflowTestCase):
+    def test_transition_checks_only_read_the_current_state(self):
+        get_workflow_graph(self.workflow.pk)  # compiled once per process
+
+        with self.assertNumQueries(1):
+            transitions = get_available_transitions(self.user, self.assessment)
+            names = [(t.name, t.to_state.name) for t in transitions]
+        self.assertEqual(names, [("Submit", "Review")])
+
+        graph = get_workflow_graph(self.workflow.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(graph.initial_state.id, self.draft.pk)
+            self.assertEqual(graph.available_transitions(self.review.pk, role=""), [])
+            self.assertEqual(graph.find_transition(self.review.pk, "approved", role="approver").name, "Approve")
+
+        ok, message = submit_assessment_for_review(self.user, self.assessment.pk)
+        self.assertTrue(ok, message)
+        log = WorkflowLog.objects.get()
+        self.assertEqual((log.from_state, log.to_state), (self.draft, self.review))
+        self.assertEqual(WorkflowObject.objects.get_for_instance(self.assessment).current_state, self.review)
+
+    def test_saving_the_definition_recompiles_the_graph(self):
+        before = get_workflow_graph(self.workflow.pk)
+        self.assertIs(get_workflow_graph(self.workflow.pk), before)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Transition.objects.create(workflow=self.workflow, name="Withdraw", from_state=self.review, to_state=self.draft)
+        after = get_workflow_graph(self.workflow.pk)
+        self.assertIsNot(after, before)
+        self.assertEqual([t.name for t in after.available_transitions(self.review.pk)], ["Approve", "Withdraw"])
+
+        # Writes that skip signals are not seen until the version moves
+        State.objects.filter(pk=self.approved.pk).update(name="Done")
+        self.assertEqual(get_workflow_graph(self.workflow.pk).states[self.approved.pk].name, "Approved")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.workflow.save()
+        self.assertEqual(get_workflow_graph(self.workflow.pk).states[self.approved.pk].name, "Done")
+
+    @override_settings(WORKFLOW_GRAPH_TIMEOUT=60)
+    def test_local_copy_expires_without_a_shared_cache(self):
+        before = get_workflow_graph(self.workflow.pk)
+        # An edit made by another process, whose version token this one never sees
+        State.objects.filter(pk=self.review.pk).update(name="Triage")
+
+        with mock.patch("workflow.graph.time.monotonic", return_value=before.compiled_at + 59):
+            self.assertIs(get_workflow_graph(self.workflow.pk), before)
+        with mock.patch("workflow.graph.time.monotonic", return_value=before.compiled_at + 60):
+            self.assertEqual(get_workflow_graph(self.workflow.pk).states[self.review.pk].name, "Triage")
+
+
+class BulkTransitionTests(WorkflowTestCase):
+    def test_valid_objects_move_together_and_the_rest_are_reported(self):
+        drafts = [self.assessment, self.make_assessment(self.draft), self.make_assessment(self.draft)]
+        in_review = self.make_assessment(self.review)
+        detached = self.make_assessment()
+        get_workflow_graph(self.workflow.pk)
+        queryset = Assessment.objects.filter(organization=self.org)
+
+        # savepoint pair, ids, workflow objects, one UPDATE per table for the single target state, one log INSERT
+        with self.assertNumQueries(7):
+            report = bulk_transition(self.user, queryset, "Review", comment="Quarter end")
+
+        self.assertEqual({o.object_id for o in report.succeeded}, {a.pk for a in drafts})
+        failures = {o.object_id: o.error for o in report.failed}
+        self.assertEqual(failures[in_review.pk], "No transition from 'Review' to 'Review'.")
+        self.assertEqual(failures[detached.pk], "No workflow attached.")
+
+        moved = Assessment.objects.filter(pk__in=[a.pk for a in drafts])
+        self.assertEqual(set(moved.values_list("status", flat=True)), {"review"})
+        self.assertTrue(all(a.updated_at > self.assessment.updated_at for a in moved))
+        logs = WorkflowLog.objects.filter(comment="Quarter end")
+        self.assertEqual(logs.count(), 3)
+        self.assertEqual({(log.from_state_id, log.to_state_id) for log in logs}, {(self.draft.pk, self.review.pk)})
+
+    @override_settings(TRUST_RECOMPUTE_EAGER=False)
+    def test_each_affected_vendor_gets_one_trust_refresh(self):
+        other = Vendor.objects.create(organization=self.org, name="Other")
+        for _ in range(2):
+            self.make_assessment(self.draft)
+        other_assessment = Assessment.objects.create(
+            organization=self.org,
+            vendor_offering=VendorOffering.objects.create(vendor=other, name="CRM"),
+            questionnaire=self.questionnaire,
+        )
+        ensure_workflow_for_object(other_assessment)
+        idle = Vendor.objects.create(organization=self.org, name="Idle")
+        TrustRecomputeRequest.objects.all().delete()
+
+        with mock.patch("services.workflow.schedule_trust_refresh", wraps=schedule_trust_refresh) as schedule:
+            with self.captureOnCommitCallbacks(execute=True):
+                report = bulk_transition(self.user, Assessment.objects.filter(organization=self.org), "Review")
+
+        self.assertEqual(len(report.succeeded), 4)
+        self.assertEqual(sorted(call.args[0] for call in schedule.call_args_list), sorted([self.offering.vendor_id, other.pk]))
+        mask = component_mask(components_reading(Assessment))
+        self.assertEqual(
+            set(TrustRecomputeRequest.objects.values_list("vendor_id", "components")),
+            {(self.offering.vendor_id, mask), (other.pk, mask)},
+        )
+        self.assertFalse(TrustRecomputeRequest.objects.filter(vendor=idle).exists())
+
+    def test_list_page_action_is_scoped_to_the_organization(self):
+        Membership.objects.create(user=self.user, organization=self.org, role="member")
+        foreign = Assessment.objects.create(
+            organization=Organization.objects.create(name="Else"),
+            vendor_offering=self.offering,
+            questionnaire=self.questionnaire,
+        )
+        self.client.force_login(self.user)
+
+        response = self.client.post(
+            reverse("assessments:bulk_transition"),
+            {"assessment_ids": [self.assessment.pk, foreign.pk], "to_state": "Review"},
+        )
+
+        self.assertRedirects(response, reverse("assessments:list"), fetch_redirect_response=False)
+        self.assertEqual(WorkflowObject.objects.get_for_instance(self.assessment).current_state, self.review)
+        self.assertFalse(WorkflowLog.objects.filter(workflow_object__object_id=foreign.pk).exists())
+
+
+class WorkflowAttachTests(WorkflowTestCase):
+    def test_attach_is_idempotent_and_the_target_key_unique(self):
+        assessment = self.make_assessment()
+
+        first = ensure_workflow_for_object(assessment)
+        self.assertEqual(ensure_workflow_for_object(assessment).pk, first.pk)
+        self.assertEqual(Assessment.objects.get(pk=assessment.pk).workflow_state, "Draft")
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            WorkflowObject.objects.create(
+                content_type=first.content_type, object_id=assessment.pk, workflow=self.workflow, current_state=self.review
+            )
+
+    def test_state_mirror_follows_transitions_and_renames(self):
+        ok, message = submit_assessment_for_review(self.user, self.assessment.pk)
+        self.assertTrue(ok, message)
+        self.assertEqual(Assessment.objects.get(pk=self.assessment.pk).workflow_state, "Review")
+
+        self.review.name = "In Review"
+        self.review.save()
+        self.assertEqual(Assessment.objects.get(pk=self.assessment.pk).workflow_state, "In Review")
+
+        in_review = assessment_list_queryset(self.org, {"workflow_state": "In Review"})
+        self.assertEqual([a.pk for a in in_review], [self.assessment.pk])
+        self.assertNotIn("workflow_workflowobject", str(in_review.query))
+
+    @override_settings(TRUST_RECOMPUTE_EAGER=False)
+    def test_completing_an_assessment_queues_a_trust_refresh(self):
+        completed = State.objects.create(workflow=self.workflow, name="Completed", is_final=True)
+        complete = Transition.objects.create(workflow=self.workflow, name="Complete", from_state=self.draft, to_state=completed)
+        TrustRecomputeRequest.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_transition(self.user, self.assessment, complete)
+
+        self.assertEqual(Assessment.objects.get(pk=self.assessment.pk).status, COMPLETED_STATUS)
+        request = TrustRecomputeRequest.objects.get(vendor=self.offering.vendor)
+        self.assertEqual(request.components, component_mask(components_reading(Assessment)))
+
+
+class WorkflowBatchResolutionTests(WorkflowTestCase):
+    def test_a_page_of_mixed_models_resolves_in_one_query(self):
+        reviewing = [self.make_assessment(self.review) for _ in range(3)]
+        detached = self.make_assessment()
+        vendor = self.offering.vendor
+        WorkflowObject.objects.create(
+            content_type=ContentType.objects.get_for_model(Vendor), object_id=vendor.pk, workflow=self.workflow, current_state=self.draft
+        )
+        page = [self.assessment, *reviewing, detached, vendor]
+        get_workflow_graph(self.workflow.pk)
+        ContentType.objects.get_for_models(Assessment, Vendor)
+
+        with self.assertNumQueries(1):
+            prefetch_workflow(page, self.user)
+            rows = [(obj.workflow_current_state and obj.workflow_current_state.name, obj.workflow_transitions) for obj in page]
+
+        self.assertEqual(rows[0][0], "Draft")
+        self.assertEqual([t.name for t in rows[0][1]], ["Submit"])
+        self.assertEqual({state for state, _ in rows[1:4]}, {"Review"})
+        self.assertEqual(rows[1][1], [])  # "Approve" needs the approver role
+        self.assertEqual(rows[4], (None, []))
+        self.assertEqual(rows[5][0], "Draft")  # a vendor on the same page
+
+        resolved = WorkflowObject.objects.get_for_instances(page)
+        self.assertEqual(resolved[vendor].object_id, vendor.pk)
+        self.assertNotIn(detached, resolved)
+
+
+class TransitionConflictViewTests(WorkflowTestCase):
+    def test_submit_view_answers_a_lost_race_with_409(self):
+        Workflow.objects.filter(pk=self.workflow.pk).update(name="Assessment Lifecycle")
+
+        def read_then_lose_race(obj, workflow):
+            wf_obj = get_or_create_workflow_object(obj, workflow)
+            WorkflowObject.objects.filter(pk=wf_obj.pk).update(current_state=self.approved)  # another reviewer
+            return wf_obj
+
+        request = RequestFactory().post("/")
+        request.user = self.user
+        with mock.patch("workflow.views.get_or_create_workflow_object", side_effect=read_then_lose_race):
+            response = SubmitAssessmentForReviewView.as_view()(request, pk=self.assessment.pk)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertIn(b"reload and try again", response.content)
+        self.assertFalse(WorkflowLog.objects.exists())
+
+    def test_bulk_view_reports_a_conflict_instead_of_failing(self):
+        Membership.objects.create(user=self.user, organization=self.org, role="member")
+        self.client.force_login(self.user)
+        conflict = TransitionConflict("Some items were moved by someone else; reload and try again.")
+
+        with mock.patch("assessments.views.bulk_transition", side_effect=conflict):
+            response = self.client.post(
+                reverse("assessments:bulk_transition"), {"assessment_ids": [self.assessment.pk], "to_state": "Review"}
+            )
+
+        self.assertRedirects(response, reverse("assessments:list"), fetch_redirect_response=False)
+        self.assertEqual([str(m) for m in get_messages(response.wsgi_request)], [str(conflict)])
+
+@skipIf(connection.vendor == "sqlite" and connection.is_in_memory_db(), "needs a database shared between threads")
+class ConcurrentTransitionTests(TransactionTestCase):
+    WORKERS = 12
+    ROUNDS = 5
+
+    def setUp(self):
+        clear_workflow_graphs()
+        cache.clear()
+        self.workflow = Workflow.objects.create(name="Assessment Workflow")
+        draft = State.objects.create(workflow=self.workflow, name="Draft", is_initial=True)
+        review = State.objects.create(workflow=self.workflow, name="Review")
+        self.transition = Transition.objects.create(workflow=self.workflow, name="Submit", from_state=draft, to_state=review)
+        org = Organization.objects.create(name="RaceOrg")
+        self.offering = VendorOffering.objects.create(vendor=Vendor.objects.create(organization=org, name="Race"), name="Race")
+        self.org, self.questionnaire = org, Questionnaire.objects.create(name="Race")
+        self.reviewers = [
+            CustomUser.objects.create_user(email=f"reviewer{i}@race.test", password="Password123!") for i in range(self.WORKERS)
+        ]
+
+    def _race(self, assessment):
+        """Every worker reads the Draft state, waits for the others, then tries the same transition."""
+        barrier = threading.Barrier(self.WORKERS)
+        outcomes = []
+
+        def worker(user):
+            try:
+                wf_obj = WorkflowObject.objects.get_for_instance(assessment)
+                barrier.wait(timeout=10)
+                try:
+                    apply_transition(user, Assessment.objects.get(pk=assessment.pk), self.transition, wf_obj=wf_obj)
+                    outcomes.append("moved")
+                except TransitionConflict:
+                    outcomes.append("conflict")
+            except Exception as e:  # surfaced through the assertion below
+                outcomes.append(repr(e))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(user,)) for user in self.reviewers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_parallel_reviewers_never_duplicate_a_transition(self):
+        for _ in range(self.ROUNDS):
+            assessment = Assessment.objects.create(
+                organization=self.org, vendor_offering=self.offering, questionnaire=self.questionnaire
+            )
+            ensure_workflow_for_object(assessment)
+
+            outcomes = self._race(assessment)
+
+            self.assertEqual(sorted(outcomes), ["conflict"] * (self.WORKERS - 1) + ["moved"])
+            self.assertEqual(WorkflowLog.objects.filter(workflow_object__object_id=assessment.pk).count(), 1)
+            self.assertEqual(Assessment.objects.get(pk=assessment.pk).workflow_state, "Review")
@@ -2,41 +2,25 @@
 
 from django.core.exceptions import PermissionDenied
 
-from .models import Transition, WorkflowLog, WorkflowObject
+from services.workflow import apply_transition, get_workflow_object
+
+from .graph import get_workflow_graph
+from .models import WorkflowObject
 
 
 # Transitions the object to a new state if a valid transition exists.
 def perform_transition(content_object, user, to_state_name, comment=""):
     try:
-        wo = WorkflowObject.objects.get(
-            content_type__model=content_object._meta.model_name,
-            object_id=content_object.id,
-        )
-
-        available_transitions = Transition.objects.filter(
-            workflow=wo.workflow,
-            from_state=wo.current_state,
-            to_state__name=to_state_name,
-        )
-
-        if not available_transitions.exists():
-            raise PermissionDenied(
-                f"No transition from {wo.current_state} to {to_state_name}"
-            )
-
-        transition = available_transitions.first()
+        wo = get_workflow_object(content_object)
+    except WorkflowObject.DoesNotExist:
+        raise ValueError("WorkflowObject not found for this content")
 
-        WorkflowLog.objects.create(
-            workflow_object=wo,
-            from_state=wo.current_state,
-            to_state=transition.to_state,
-            user=user,
-            comment=comment,
+    transition = get_workflow_graph(wo.workflow_id).find_transition(wo.current_state_id, to_state_name)
+    if transition is None:
+        raise PermissionDenied(
+            f"No transition from {wo.current_state} to {to_state_name}"
         )
 
-        wo.current_state = transition.to_state
-        wo.save()
-
-        return True
-    except WorkflowObject.DoesNotExist:
-        raise ValueError("WorkflowObject not found for this content")
+    # Compare-and-swap state change, mirror and log in one atomic block
+    apply_transition(user, content_object, transition, comment=comment, wf_obj=wo)
+    return True
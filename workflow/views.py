@@ -1,16 +1,18 @@
 # workflow/views.py
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpResponseForbidden
+from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect
 from django.views import View
 
 from assessments.models import Assessment
+from common.errors import TransitionConflict
 from services.workflow import (
     apply_transition,
     get_or_create_workflow_object,
 )
-from workflow.models import Transition, Workflow
+from workflow.graph import get_workflow_graph
+from workflow.models import Workflow
 
 
 class SubmitAssessmentForReviewView(LoginRequiredMixin, View):
@@ -22,19 +24,16 @@ class SubmitAssessmentForReviewView(LoginRequiredMixin, View):
         # STEP 2: Ensure WorkflowObject exists
         wf_obj = get_or_create_workflow_object(assessment, workflow)
 
-        # STEP 3: Get valid transitions from current state
-        transitions = Transition.objects.filter(
-            workflow=workflow,
-            from_state=wf_obj.current_state,
-        )
-        # STEP 4: Find transition to 'Review' state
-        transition = next(
-            (t for t in transitions if t.to_state.name.lower() == "review"), None
-        )
+        # STEP 3: Find the transition to 'Review' in the compiled graph (no queries)
+        transition = get_workflow_graph(workflow.pk).find_transition(wf_obj.current_state_id, "review")
         if not transition:
             return HttpResponseForbidden("No valid transition found.")
 
-        # STEP 5: Apply the transition and update logs/state
-        apply_transition(request.user, assessment, transition)
+        # STEP 4: Apply the transition and update logs/state
+        try:
+            apply_transition(request.user, assessment, transition, wf_obj=wf_obj)
+        except TransitionConflict as exc:
+            # Another reviewer moved it between our read and the update
+            return HttpResponse(str(exc), status=409)
 
         return redirect("assessments:assessment_detail", pk=pk)